@@ -1,19 +1,36 @@
+import asyncio
 import os
 import json
 import re
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+from app.agents.llm_stub import StubModel, llm_backend
+from app.tracing import span
+
 # Load Gemini API key from .env
 load_dotenv()
 GENAI_API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=GENAI_API_KEY)
-# Use the latest recommended Gemini model for agentic AI
-llm_model = genai.GenerativeModel("gemini-2.0-flash")
+if llm_backend() == "stub":
+    # Offline: every agent passes with the same score, so flows reach tokenization
+    llm_model = StubModel(lambda prompt: {"score": 0.85, "notes": "Stub LLM backend."})
+else:
+    genai.configure(api_key=GENAI_API_KEY)
+    # Use the latest recommended Gemini model for agentic AI
+    llm_model = genai.GenerativeModel("gemini-2.0-flash")
 
 def call_llm(prompt):
-    response = llm_model.generate_content(prompt)
-    content = response.text.strip()
+    with span('llm', 'verify'):
+        response = llm_model.generate_content(prompt)
+    return parse_llm_score(response.text)
+
+async def call_llm_async(prompt):
+    with span('llm', 'verify'):
+        response = await llm_model.generate_content_async(prompt)
+    return parse_llm_score(response.text)
+
+def parse_llm_score(content):
+    content = content.strip()
     # Remove code block formatting if present
     cleaned = re.sub(r"^``````$", "", content, flags=re.MULTILINE).strip()
     try:
@@ -25,9 +42,21 @@ def call_llm(prompt):
             return json.loads(match.group(0))
         return {"score": 0.5, "notes": "LLM output parsing failed."}
 
-class BasicInfoAgent:
+class LLMAgent:
+    """An agent is a prompt over the asset; assess() asks the model to score it."""
+
+    def prompt(self, asset):
+        raise NotImplementedError
+
     def assess(self, asset):
-        prompt = f"""
+        return call_llm(self.prompt(asset))
+
+    async def assess_async(self, asset):
+        return await call_llm_async(self.prompt(asset))
+
+class BasicInfoAgent(LLMAgent):
+    def prompt(self, asset):
+        return f"""
 You are an AI agent checking if all basic asset information is present and complete.
 Asset fields:
 - Type: {asset.get('asset_type')}
@@ -37,11 +66,10 @@ Asset fields:
 Score 1.0 if all fields are present and detailed, 0.5 if some are missing, 0.0 if mostly missing. Explain.
 Respond as JSON: {{"score": float, "notes": "..."}}
 """
-        return call_llm(prompt)
 
-class ValueAgent:
-    def assess(self, asset):
-        prompt = f"""
+class ValueAgent(LLMAgent):
+    def prompt(self, asset):
+        return f"""
 You are an AI agent evaluating if the asset's estimated value is plausible for its type and location.
 Asset fields:
 - Type: {asset.get('asset_type')}
@@ -51,22 +79,20 @@ Asset fields:
 Score 1.0 if value is plausible, 0.4 if too low, 0.6 if too high, 0.5 if unknown. Explain.
 Respond as JSON: {{"score": float, "notes": "..."}}
 """
-        return call_llm(prompt)
 
-class JurisdictionAgent:
-    def assess(self, asset):
-        prompt = f"""
+class JurisdictionAgent(LLMAgent):
+    def prompt(self, asset):
+        return f"""
 You are an AI agent verifying the jurisdiction/location of the asset.
 Asset fields:
 - Location: {asset.get('location')}
 Score 0.9 if location is specific and recognized (especially any Indian city/state/UT), 0.5 if vague or missing. Explain.
 Respond as JSON: {{"score": float, "notes": "..."}}
 """
-        return call_llm(prompt)
 
-class AssetSpecificAgent:
-    def assess(self, asset):
-        prompt = f"""
+class AssetSpecificAgent(LLMAgent):
+    def prompt(self, asset):
+        return f"""
 You are an AI agent checking if the asset description contains type-specific details and keywords.
 Asset fields:
 - Type: {asset.get('asset_type')}
@@ -74,7 +100,6 @@ Asset fields:
 Score 1.0 if many relevant details/keywords, 0.5 if some, 0.0 if none. Explain.
 Respond as JSON: {{"score": float, "notes": "..."}}
 """
-        return call_llm(prompt)
 
 class CoordinatorAgent:
     def __init__(self):
@@ -86,10 +111,23 @@ class CoordinatorAgent:
         ]
 
     def verify(self, asset):
+        results = []
+        for key, agent in self.agents:
+            with span('agent', key):
+                results.append(agent.assess(asset))
+        return self._aggregate(results)
+
+    async def verify_async(self, asset):
+        """verify() with the agents' model calls in flight concurrently."""
+        async def assess(key, agent):
+            with span('agent', key):
+                return await agent.assess_async(asset)
+        return self._aggregate(await asyncio.gather(*(assess(key, agent) for key, agent in self.agents)))
+
+    def _aggregate(self, agent_results):
         results = {}
         explanations = []
-        for key, agent in self.agents:
-            agent_result = agent.assess(asset)
+        for (key, _), agent_result in zip(self.agents, agent_results):
             results[key] = agent_result.get("score", 0.5)
             explanations.append(f"{key}: {agent_result.get('notes', '')}")
         avg_score = sum(results.values()) / len(results)
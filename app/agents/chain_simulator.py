@@ -0,0 +1,182 @@
+"""
+In-process simulation of the RWA test network.
+
+Transactions (mints, transfers) are submitted to a FIFO mempool and get a
+hash back at once. A producer packs up to `block_size` of them into a block
+every `block_time` seconds; each included transaction gets a receipt with
+its block number, position and confirmation latency. With block_time=0
+blocks are only produced by calling mine(), which keeps tests and
+benchmarks deterministic. Only the newest `block_history` blocks and
+`receipt_history` receipts are kept; older transactions are unknown.
+`on_block`, if set, is called with each new block after its receipts
+exist (the app confirms its pending history rows there).
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from app.agents.merkle import MerkleTree
+
+PERCENTILES = (50, 95, 99)
+
+
+def _percentile(values: List[float], p: int) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+class ChainSimulator:
+    def __init__(self, block_time: float = 2.0, block_size: int = 500, network: str = 'RWA-TestNet',
+                 latency_window: int = 10000, block_history: int = 10000, receipt_history: int = 100000):
+        self.block_time = block_time
+        self.block_size = block_size
+        self.network = network
+        self.mempool: Deque[Dict] = deque()
+        self.blocks: Deque[Dict] = deque(maxlen=block_history)
+        # Insertion order is confirmation order, so the oldest receipt goes first
+        self.receipts: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.receipt_history = receipt_history
+        self._pending = set()
+        self._height = 0
+        self._confirmed = 0
+        self.on_block: Optional[Callable[[Dict], None]] = None
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self._nonce = 0
+        self._started_at = time.time()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- submission ----------------------------------------------------
+
+    def submit(self, kind: str, payload: Dict) -> str:
+        """Queues a transaction and returns its hash."""
+        with self._cond:
+            self._nonce += 1
+            body = json.dumps({'kind': kind, 'nonce': self._nonce, 'payload': payload},
+                              sort_keys=True, separators=(',', ':'), default=str)
+            tx_hash = f"0x{hashlib.sha256(body.encode()).hexdigest()}"
+            self.mempool.append({'hash': tx_hash, 'kind': kind, 'submitted_at': time.time()})
+            self._pending.add(tx_hash)
+            return tx_hash
+
+    # --- block production ----------------------------------------------
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    def mine(self) -> Optional[Dict]:
+        """Produces one block from the head of the mempool; None when it is empty."""
+        block = self._pack()
+        if block is not None and self.on_block is not None:
+            self.on_block(block)
+        return block
+
+    def _pack(self) -> Optional[Dict]:
+        with self._cond:
+            if not self.mempool:
+                return None
+            count = min(self.block_size, len(self.mempool))
+            txs = [self.mempool.popleft() for _ in range(count)]
+            now = time.time()
+            tree = MerkleTree([bytes.fromhex(tx['hash'][2:]) for tx in txs])
+            parent_hash = self.blocks[-1]['hash'] if self.blocks else f"0x{'0' * 64}"
+            number = self.height + 1
+            block_hash = hashlib.sha256(f"{parent_hash}{tree.root.hex()}{number}{now}".encode()).hexdigest()
+            block = {
+                'number': number,
+                'hash': f"0x{block_hash}",
+                'parent_hash': parent_hash,
+                'transactions_root': f"0x{tree.root.hex()}",
+                'timestamp': now,
+                'tx_count': count,
+            }
+            self.blocks.append(block)
+            self._height = number
+            self._confirmed += count
+            for index, tx in enumerate(txs):
+                self._pending.discard(tx['hash'])
+                latency = now - tx['submitted_at']
+                self.latencies.append(latency)
+                self.receipts[tx['hash']] = {
+                    'transaction_hash': tx['hash'],
+                    'kind': tx['kind'],
+                    'block_number': number,
+                    'block_hash': block['hash'],
+                    'transaction_index': index,
+                    'status': 'confirmed',
+                    'network': self.network,
+                    'confirmation_latency': round(latency, 6),
+                }
+            while len(self.receipts) > self.receipt_history:
+                self.receipts.popitem(last=False)
+            self._cond.notify_all()
+            return block
+
+    def _produce(self):
+        while not self._stop.wait(self.block_time):
+            self.mine()
+
+    def start(self):
+        """Starts the block producer (no-op when block_time is 0 or it is already running)."""
+        if self.block_time > 0 and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._produce, name='chain-simulator', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    # --- receipts ------------------------------------------------------
+
+    def is_pending(self, tx_hash: str) -> bool:
+        """True while the transaction waits in the mempool."""
+        with self._cond:
+            return tx_hash in self._pending
+
+    def receipt(self, tx_hash: str) -> Optional[Dict]:
+        """The receipt with its current confirmation count, or None while pending (or unknown)."""
+        with self._cond:
+            receipt = self.receipts.get(tx_hash)
+            if receipt is None:
+                return None
+            return dict(receipt, confirmations=self.height - receipt['block_number'] + 1)
+
+    def wait_for_receipt(self, tx_hash: str, timeout: float, confirmations: int = 1) -> Optional[Dict]:
+        """Blocks until the transaction has `confirmations` blocks on top (inclusive) or `timeout` passes."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                receipt = self.receipt(tx_hash)
+                if receipt and receipt['confirmations'] >= confirmations:
+                    return receipt
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return receipt
+                self._cond.wait(remaining)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            latencies = list(self.latencies)
+            confirmed = self._confirmed
+            elapsed = time.time() - self._started_at
+            return {
+                'network': self.network,
+                'block_time': self.block_time,
+                'block_size': self.block_size,
+                'height': self.height,
+                'pending': len(self.mempool),
+                'confirmed': confirmed,
+                'avg_block_fill': round(confirmed / (self.height * self.block_size), 4) if self.height else 0.0,
+                'tx_per_sec': round(confirmed / elapsed, 2) if elapsed else 0.0,
+                'confirmation_latency': {f'p{p}': _percentile(latencies, p) for p in PERCENTILES},
+            }
@@ -0,0 +1,40 @@
+"""
+Offline stand-in for the Gemini model, selected with LLM_BACKEND=stub.
+
+generate_content() (and generate_content_async()) answers with canned JSON
+in the shape each caller parses, after an optional delay
+(LLM_STUB_LATENCY_MS) standing in for the model's response time. Load tests and CI then exercise the full request
+path without network access or an API key.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict
+
+
+def llm_backend() -> str:
+    return (os.getenv("LLM_BACKEND") or "gemini").lower()
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    def __init__(self, respond: Callable[[str], Dict], latency_ms: float = None):
+        self.respond = respond
+        if latency_ms is None:
+            latency_ms = float(os.getenv("LLM_STUB_LATENCY_MS") or 0)
+        self.latency = latency_ms / 1000
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return StubResponse(json.dumps(self.respond(prompt)))
+
+    async def generate_content_async(self, prompt: str) -> StubResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return StubResponse(json.dumps(self.respond(prompt)))
@@ -1,18 +1,28 @@
 import os
 import json
+import logging
 import re
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+from app.agents.llm_stub import StubModel, llm_backend
+from app.tracing import span
+
 # Load environment variables
 load_dotenv()
 GENAI_API_KEY = os.getenv("GEMINI_API_KEY")
+USER_INPUT_PATTERN = re.compile(r'"""(.*)"""', re.DOTALL)
+logger = logging.getLogger(__name__)
 
-# Configure Gemini
-genai.configure(api_key=GENAI_API_KEY)
+if llm_backend() == "stub":
+    # Offline: the local keyword/regex extraction, answered as if by the model
+    model = StubModel(lambda prompt: extract_asset_info_local(USER_INPUT_PATTERN.search(prompt).group(1)))
+else:
+    # Configure Gemini
+    genai.configure(api_key=GENAI_API_KEY)
 
-# Initialize Gemini model
-model = genai.GenerativeModel("gemini-2.0-flash")
+    # Initialize Gemini model
+    model = genai.GenerativeModel("gemini-2.0-flash")
 
 def fallback_asset_type(description: str) -> str:
     """
@@ -46,13 +56,42 @@ def clean_llm_output(content: str) -> str:
         content = content[json_start:]
     return content
 
-def extract_asset_info_with_llm(user_input: str) -> dict:
+VALUE_MULTIPLIERS = {
+    'cr': 1e7, 'crore': 1e7, 'crores': 1e7,
+    'lakh': 1e5, 'lakhs': 1e5, 'lac': 1e5,
+    'k': 1e3, 'thousand': 1e3,
+    'm': 1e6, 'mn': 1e6, 'million': 1e6,
+    'b': 1e9, 'bn': 1e9, 'billion': 1e9,
+}
+VALUE_PATTERN = re.compile(
+    r"(?:₹|rs\.?|inr|\$|usd)\s*([\d,]+(?:\.\d+)?)\s*(cr|crores?|lakhs?|lac|k|thousand|mn|m|million|bn|b|billion)?\b",
+    re.IGNORECASE
+)
+LOCATION_PATTERN = re.compile(r"\b(?:in|at|located in)\s+([A-Z][\w.-]*(?:[ ,]+[A-Z][\w.-]*)*)")
+
+
+def extract_asset_info_local(user_input: str) -> dict:
     """
-    Calls Gemini LLM to extract asset information from user input.
-    Accepts any city/town in India as valid. Falls back to keyword mapping if LLM fails or returns 'unknown'.
+    Local fast path with no LLM call: keyword asset type, first currency
+    amount (with Cr/lakh/k/million suffixes) and the first capitalised place
+    after "in"/"at". Used by the bulk loader; same shape as the LLM result.
     """
-    print("✅ Calling Gemini for asset info extraction...")
-    prompt = f"""
+    value = 0.0
+    match = VALUE_PATTERN.search(user_input)
+    if match:
+        value = float(match.group(1).replace(',', ''))
+        if match.group(2):
+            value *= VALUE_MULTIPLIERS[match.group(2).lower()]
+    location = LOCATION_PATTERN.search(user_input)
+    return {
+        "asset_type": fallback_asset_type(user_input),
+        "estimated_value": value,
+        "location": location.group(1).strip(" ,") if location else "unknown",
+        "description": user_input
+    }
+
+def _extraction_prompt(user_input: str) -> str:
+    return f"""
 You are an intelligent assistant that extracts structured information from asset descriptions.
 Extract and return the following fields in JSON:
 - asset_type: One of [real_estate, vehicle, artwork, equipment, commodity]
@@ -71,31 +110,55 @@ Return only valid JSON:
   "description": "..."
 }}
 """
+
+def _parse_extraction(content: str, user_input: str) -> dict:
+    content = content.strip()
+    # Lazy %-formatting: the raw response is only rendered when DEBUG is on
+    logger.debug("Gemini raw response: %r", content)
+    cleaned = clean_llm_output(content)
+    if not cleaned or not cleaned.startswith("{"):
+        raise ValueError("LLM did not return valid JSON.")
+    data = json.loads(cleaned)
+    asset_type = data.get("asset_type", "unknown")
+    if asset_type == "unknown":
+        asset_type = fallback_asset_type(data.get("description", user_input))
+    # Accept any location string as valid; do not penalize for unknown/small cities
+    location = data.get("location", "unknown")
+    return {
+        "asset_type": asset_type,
+        "estimated_value": float(data.get("estimated_value", 0)),
+        "location": location,
+        "description": data.get("description", user_input)
+    }
+
+def _extraction_failed(user_input: str, error: Exception) -> dict:
+    logger.warning("Error parsing Gemini response: %s", error)
+    return {
+        "asset_type": fallback_asset_type(user_input),
+        "estimated_value": 0,
+        "location": "unknown",
+        "description": user_input
+    }
+
+def extract_asset_info_with_llm(user_input: str) -> dict:
+    """
+    Calls Gemini LLM to extract asset information from user input.
+    Accepts any city/town in India as valid. Falls back to keyword mapping if LLM fails or returns 'unknown'.
+    """
+    logger.debug("Calling Gemini for asset info extraction")
+    try:
+        with span('llm', 'extract_asset_info'):
+            response = model.generate_content(_extraction_prompt(user_input))
+        return _parse_extraction(response.text, user_input)
+    except Exception as e:
+        return _extraction_failed(user_input, e)
+
+async def extract_asset_info_with_llm_async(user_input: str) -> dict:
+    """extract_asset_info_with_llm() that awaits the model instead of blocking a thread (app/asgi.py)."""
+    logger.debug("Calling Gemini for asset info extraction")
     try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        print("Gemini raw response:", repr(content))
-        cleaned = clean_llm_output(content)
-        if not cleaned or not cleaned.startswith("{"):
-            raise ValueError("LLM did not return valid JSON.")
-        data = json.loads(cleaned)
-        asset_type = data.get("asset_type", "unknown")
-        if asset_type == "unknown":
-            asset_type = fallback_asset_type(data.get("description", user_input))
-        # Accept any location string as valid; do not penalize for unknown/small cities
-        location = data.get("location", "unknown")
-        return {
-            "asset_type": asset_type,
-            "estimated_value": float(data.get("estimated_value", 0)),
-            "location": location,
-            "description": data.get("description", user_input)
-        }
+        with span('llm', 'extract_asset_info'):
+            response = await model.generate_content_async(_extraction_prompt(user_input))
+        return _parse_extraction(response.text, user_input)
     except Exception as e:
-        print("❌ Error parsing Gemini response:", e)
-        asset_type = fallback_asset_type(user_input)
-        return {
-            "asset_type": asset_type,
-            "estimated_value": 0,
-            "location": "unknown",
-            "description": user_input
-        }
+        return _extraction_failed(user_input, e)
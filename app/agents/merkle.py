@@ -0,0 +1,58 @@
+import hashlib
+import json
+from typing import Dict, List
+
+# Domain separation: a leaf can never be replayed as an inner node
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def leaf_hash(payload: Dict) -> bytes:
+    """sha256 over the canonical JSON of a token's leaf payload."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(LEAF_PREFIX + canonical.encode()).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Binary sha256 tree over leaf hashes, built level by level in one pass.
+    An unpaired node is carried up unchanged rather than duplicated.
+    """
+
+    def __init__(self, leaves: List[bytes]):
+        if not leaves:
+            raise ValueError("A Merkle tree needs at least one leaf")
+        self.levels = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> List[Dict]:
+        """Sibling hashes from leaf `index` up to the root."""
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append({'position': 'left' if sibling < index else 'right', 'hash': level[sibling].hex()})
+            index //= 2
+        return proof
+
+
+def verify_merkle_proof(leaf: str, proof: List[Dict], root: str) -> bool:
+    """Checks a hex leaf hash against a hex root (a leading '0x' is accepted on either)."""
+    current = bytes.fromhex(leaf[2:] if leaf.startswith('0x') else leaf)
+    for step in proof:
+        sibling = bytes.fromhex(step['hash'])
+        current = _node(sibling, current) if step['position'] == 'left' else _node(current, sibling)
+    return current.hex() == (root[2:] if root.startswith('0x') else root)
@@ -0,0 +1,296 @@
+"""
+Token ownership ledger.
+
+Ownership is held in memory as two dicts, token_id -> owner and owner -> set
+of token ids, so ownership checks and holdings lookups are O(1). Every change
+is appended to a JSON-lines log before it is applied. Once the log holds
+`snapshot_every` records and is larger than the last snapshot, the state is
+written to a new snapshot and the log starts over, so a restart loads the
+snapshot and replays a bounded tail.
+
+Processes sharing a ledger directory (gunicorn workers) serialize writes
+with an flock and catch up on each other's records before writing; reads
+catch up when the log has grown or been replaced.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: threads are serialized, processes are not
+    fcntl = None
+
+
+def _dumps(record: Dict) -> bytes:
+    return json.dumps(record, separators=(',', ':')).encode() + b'\n'
+
+
+class AppendOnlyLog:
+    """
+    `<name>.log` (JSON lines) and `<name>.snapshot.json` in `directory`, with
+    `<name>.lock` serializing writers across processes. compact() writes a
+    snapshot and swaps in an empty log file; other processes notice the new
+    inode and reload from the snapshot.
+    """
+
+    def __init__(self, directory: str, name: str, fsync: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, f'{name}.log')
+        self.snapshot_path = os.path.join(directory, f'{name}.snapshot.json')
+        self.fsync = fsync
+        self.offset = 0
+        self.snapshot_bytes = 0
+        self._file = None
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(os.path.join(directory, f'{name}.lock'), 'a')
+
+    @contextmanager
+    def locked(self):
+        with self._thread_lock:
+            if fcntl:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def open(self) -> Optional[Dict]:
+        """(Re)opens the current log from the start; returns the snapshot, if any."""
+        snapshot = None
+        self.snapshot_bytes = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                data = f.read()
+            snapshot = json.loads(data)
+            self.snapshot_bytes = len(data)
+        if self._file:
+            self._file.close()
+        self._file = open(self.log_path, 'a+b')
+        self.offset = 0
+        return snapshot
+
+    def rotated(self) -> bool:
+        try:
+            return os.stat(self.log_path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def changed(self) -> bool:
+        """Cheap check for readers: has anyone written since we last read?"""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return True
+        return stat.st_size != self.offset or stat.st_ino != os.fstat(self._file.fileno()).st_ino
+
+    def read_new(self) -> List[Dict]:
+        """Records appended since the last read. A torn last line (a crash mid-write) is left unread."""
+        self._file.seek(self.offset)
+        data = self._file.read()
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        return [json.loads(line) for line in data[:end].splitlines() if line]
+
+    def append(self, records: List[Dict]):
+        """Appends records in one write. Call under locked(), after read_new()."""
+        if os.fstat(self._file.fileno()).st_size > self.offset:
+            self._file.truncate(self.offset)  # drop a torn tail so it cannot swallow our first record
+        data = b''.join(_dumps(record) for record in records)
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.offset += len(data)
+
+    def compact(self, snapshot: Dict):
+        """Writes `snapshot` and starts an empty log. Call under locked()."""
+        for path, data in ((self.snapshot_path, json.dumps(snapshot, separators=(',', ':')).encode()),
+                           (self.log_path, b'')):
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        # A crash between the two replaces leaves records the snapshot already
+        # covers; replay skips them by sequence number
+        self.open()
+
+
+class LogBackedLedger:
+    """
+    In-memory state persisted through an AppendOnlyLog named `name` (or
+    memory-only without `directory`). Subclasses define the state through
+    _load(snapshot), _snapshot() and _apply(record); writes go through
+    _writing() and _commit(records).
+    """
+    name = 'ledger'
+
+    def __init__(self, directory: Optional[str] = None, snapshot_every: int = 10000, fsync: bool = False):
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self._snapshot_seq = 0
+        self._lock = threading.Lock()
+        self._load(None)
+        self.log = AppendOnlyLog(directory, self.name, fsync) if directory else None
+        if self.log:
+            with self.log.locked():
+                self._reload()
+
+    def _load(self, snapshot: Optional[Dict]):
+        raise NotImplementedError
+
+    def _snapshot(self) -> Dict:
+        raise NotImplementedError
+
+    def _apply(self, record: Dict):
+        raise NotImplementedError
+
+    # --- replay --------------------------------------------------------
+
+    def _reload(self):
+        snapshot = self.log.open()
+        self._load(snapshot)
+        self.seq = self._snapshot_seq = snapshot['seq'] if snapshot else 0
+        self._replay()
+
+    def _replay(self):
+        for record in self.log.read_new():
+            if record['seq'] > self.seq:
+                self._apply(record)
+                self.seq = record['seq']
+
+    def _catch_up(self):
+        if self.log.rotated():
+            self._reload()
+        else:
+            self._replay()
+
+    def refresh(self):
+        """Picks up records written by other processes."""
+        if self.log and self.log.changed():
+            with self.log.locked():
+                self._catch_up()
+
+    # --- writes --------------------------------------------------------
+
+    @contextmanager
+    def _writing(self):
+        if self.log is None:
+            with self._lock:
+                yield
+            return
+        with self.log.locked():
+            self._catch_up()
+            yield
+
+    def _commit(self, records: List[Dict]) -> List[Dict]:
+        now = round(time.time(), 3)
+        for seq, record in enumerate(records, self.seq + 1):
+            record.update(seq=seq, ts=now)
+        if self.log:
+            self.log.append(records)
+        for record in records:
+            self._apply(record)
+            self.seq = record['seq']
+        # Compact once the log is both `snapshot_every` records and at least as
+        # large as the last snapshot: a big state is not rewritten every few
+        # thousand records, and replay never reads more than twice the snapshot
+        if self.log and self.seq - self._snapshot_seq >= self.snapshot_every \
+                and self.log.offset >= self.log.snapshot_bytes:
+            self.log.compact(dict(self._snapshot(), seq=self.seq))
+            self._snapshot_seq = self.seq
+        return records
+
+
+class OwnershipLedger(LogBackedLedger):
+    """
+    token_id -> owner and owner -> {token_id} indexes. With `directory` set,
+    changes are persisted through an AppendOnlyLog; without it the ledger is
+    memory-only. Errors (unknown token, wrong owner) raise ValueError.
+    """
+    name = 'ownership'
+
+    def _load(self, snapshot: Optional[Dict]):
+        holdings = snapshot['holdings'] if snapshot else {}
+        self.holdings: Dict[str, Set[str]] = {sys.intern(owner): set(tokens) for owner, tokens in holdings.items()}
+        self.owners: Dict[str, str] = {token: owner for owner, tokens in self.holdings.items() for token in tokens}
+
+    def _snapshot(self) -> Dict:
+        return {'holdings': {owner: sorted(tokens) for owner, tokens in self.holdings.items()}}
+
+    def _apply(self, record: Dict):
+        token_id = record['token']
+        previous = self.owners.pop(token_id, None)
+        if previous is not None:
+            tokens = self.holdings[previous]
+            tokens.discard(token_id)
+            if not tokens:
+                del self.holdings[previous]
+        if record['op'] != 'burn':
+            owner = sys.intern(record['to'])
+            self.owners[token_id] = owner
+            self.holdings.setdefault(owner, set()).add(token_id)
+
+    def mint_many(self, tokens: Iterable[Tuple[str, str]]) -> List[Dict]:
+        """Records (token_id, owner) pairs as one append; fails as a whole if any token exists."""
+        tokens = list(tokens)
+        with self._writing():
+            existing = [token_id for token_id, _ in tokens if token_id in self.owners]
+            if existing or len({token_id for token_id, _ in tokens}) != len(tokens):
+                raise ValueError(f"Token already minted: {(existing or [None])[0]}")
+            return self._commit([{'op': 'mint', 'token': token_id, 'to': owner} for token_id, owner in tokens])
+
+    def mint(self, token_id: str, owner: str) -> Dict:
+        return self.mint_many([(token_id, owner)])[0]
+
+    def burn_many(self, token_ids: Iterable[str]) -> List[Dict]:
+        """
+        Removes tokens as one append, e.g. mints whose database write failed;
+        fails as a whole if any token does not exist.
+        """
+        token_ids = list(token_ids)
+        with self._writing():
+            missing = [token_id for token_id in token_ids if token_id not in self.owners]
+            if missing:
+                raise ValueError(f"Unknown token: {missing[0]}")
+            return self._commit([{'op': 'burn', 'token': token_id, 'from': self.owners[token_id]}
+                                 for token_id in token_ids])
+
+    def transfer(self, token_id: str, from_address: str, to_address: str) -> Dict:
+        with self._writing():
+            owner = self.owners.get(token_id)
+            if owner is None:
+                raise ValueError(f"Unknown token: {token_id}")
+            if owner != from_address:
+                raise ValueError(f"{from_address} does not own {token_id}")
+            if to_address == from_address:
+                raise ValueError("Sender and recipient are the same wallet")
+            return self._commit([{'op': 'transfer', 'token': token_id, 'from': from_address,
+                                  'to': to_address}])[0]
+
+    def bootstrap(self, tokens: Iterable[Tuple[str, str]]) -> int:
+        """Seeds an empty ledger (e.g. from tokens minted before it existed); returns the count."""
+        with self._writing():
+            if self.seq:
+                return 0
+            tokens = list(tokens)
+            if tokens:
+                self._commit([{'op': 'mint', 'token': token_id, 'to': owner} for token_id, owner in tokens])
+            return len(tokens)
+
+    # --- reads ---------------------------------------------------------
+
+    def owner_of(self, token_id: str) -> Optional[str]:
+        self.refresh()
+        return self.owners.get(token_id)
+
+    def tokens_of(self, wallet_address: str) -> List[str]:
+        self.refresh()
+        return sorted(self.holdings.get(wallet_address, ()))
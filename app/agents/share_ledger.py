@@ -0,0 +1,124 @@
+"""
+Share balances of fractionalized tokens.
+
+A token split into N shares has a balance map wallet -> shares; a second
+index wallet -> {token_id} answers "what does this wallet hold" without
+scanning every token. Transfers are submitted in batches that are checked
+as a whole and written as one log record, so a batch is applied entirely or
+not at all, including on replay. Persistence is the same append-only log and
+snapshot scheme as the ownership ledger.
+"""
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.agents.ownership_ledger import LogBackedLedger
+
+# (token_id, from_address, to_address, shares)
+Move = Tuple[str, str, str, int]
+
+
+class ShareLedger(LogBackedLedger):
+    """Per-token share balances and per-wallet positions. Invalid operations raise ValueError."""
+    name = 'shares'
+
+    def _load(self, snapshot: Optional[Dict]):
+        balances = snapshot['balances'] if snapshot else {}
+        self.total_shares: Dict[str, int] = dict(snapshot['total_shares']) if snapshot else {}
+        self.balances: Dict[str, Dict[str, int]] = {
+            token_id: {sys.intern(wallet): shares for wallet, shares in holders.items()}
+            for token_id, holders in balances.items()
+        }
+        self.positions: Dict[str, Set[str]] = defaultdict(set)
+        for token_id, holders in self.balances.items():
+            for wallet in holders:
+                self.positions[wallet].add(token_id)
+
+    def _snapshot(self) -> Dict:
+        return {'total_shares': self.total_shares, 'balances': self.balances}
+
+    def _credit(self, token_id: str, wallet: str, shares: int):
+        holders = self.balances[token_id]
+        balance = holders.get(wallet, 0) + shares
+        if balance:
+            holders[wallet] = balance
+            self.positions[wallet].add(token_id)
+        else:
+            del holders[wallet]
+            self.positions[wallet].discard(token_id)
+            if not self.positions[wallet]:
+                del self.positions[wallet]
+
+    def _apply(self, record: Dict):
+        if record['op'] == 'fractionalize':
+            token_id = record['token']
+            self.total_shares[token_id] = record['shares']
+            self.balances[token_id] = {}
+            self._credit(token_id, sys.intern(record['to']), record['shares'])
+        else:
+            for token_id, from_address, to_address, shares in record['moves']:
+                self._credit(token_id, from_address, -shares)
+                self._credit(token_id, sys.intern(to_address), shares)
+
+    # --- writes --------------------------------------------------------
+
+    def fractionalize(self, token_id: str, owner: str, total_shares: int) -> Dict:
+        """Splits a token into `total_shares` shares, all held by `owner`."""
+        if total_shares < 2:
+            raise ValueError("A fractional token needs at least 2 shares")
+        with self._writing():
+            if token_id in self.balances:
+                raise ValueError(f"Token already fractionalized: {token_id}")
+            return self._commit([{'op': 'fractionalize', 'token': token_id, 'to': owner,
+                                  'shares': total_shares}])[0]
+
+    def _check(self, moves: List[Move]):
+        # Net effect per (token, wallet) so a wallet may pass on shares it
+        # receives earlier in the same batch
+        deltas: Dict[Tuple[str, str], int] = defaultdict(int)
+        for token_id, from_address, to_address, shares in moves:
+            if token_id not in self.balances:
+                raise ValueError(f"Token is not fractionalized: {token_id}")
+            if not isinstance(shares, int) or isinstance(shares, bool) or shares <= 0:
+                raise ValueError(f"Share amounts must be positive integers: {shares!r}")
+            if from_address == to_address:
+                raise ValueError("Sender and recipient are the same wallet")
+            deltas[token_id, from_address] -= shares
+            deltas[token_id, to_address] += shares
+        for (token_id, wallet), delta in deltas.items():
+            if self.balances[token_id].get(wallet, 0) + delta < 0:
+                raise ValueError(f"{wallet} has insufficient shares of {token_id}")
+
+    def transfer_batch(self, moves: Iterable[Move]) -> Dict:
+        """Applies every move or none; returns the batch record."""
+        moves = [tuple(move) for move in moves]
+        if not moves:
+            raise ValueError("Empty transfer batch")
+        with self._writing():
+            self._check(moves)
+            return self._commit([{'op': 'transfer', 'moves': moves}])[0]
+
+    def transfer(self, token_id: str, from_address: str, to_address: str, shares: int) -> Dict:
+        return self.transfer_batch([(token_id, from_address, to_address, shares)])
+
+    # --- reads ---------------------------------------------------------
+
+    def is_fractional(self, token_id: str) -> bool:
+        self.refresh()
+        return token_id in self.balances
+
+    def balance_of(self, token_id: str, wallet_address: str) -> int:
+        self.refresh()
+        return self.balances.get(token_id, {}).get(wallet_address, 0)
+
+    def holders(self, token_id: str) -> Dict[str, int]:
+        self.refresh()
+        return dict(self.balances.get(token_id, {}))
+
+    def positions_of(self, wallet_address: str) -> List[Dict]:
+        """Every token the wallet holds shares of, with its balance and fraction of the total."""
+        self.refresh()
+        return [{'token_id': token_id, 'shares': self.balances[token_id][wallet_address],
+                 'total_shares': self.total_shares[token_id],
+                 'fraction': self.balances[token_id][wallet_address] / self.total_shares[token_id]}
+                for token_id in sorted(self.positions.get(wallet_address, ()))]
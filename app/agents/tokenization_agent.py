@@ -1,15 +1,55 @@
 import hashlib
 import json
-import time
+import os
 from datetime import datetime
-from typing import Dict
-import uuid
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.agents.chain_simulator import ChainSimulator
+from app.agents.merkle import MerkleTree, leaf_hash, verify_merkle_proof
+from app.agents.ownership_ledger import OwnershipLedger
+from app.agents.share_ledger import ShareLedger
+from app.models.id_allocator import IdAllocator
+from app.models.metadata_store import content_hash, hash_metadata
+
+
+# Contract and metadata pieces that only depend on the asset type are built
+# once per type and shared between tokens (read-only). Asset types come from
+# user input, so the caches are bounded.
+TYPE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _mock_bytecode(asset_type: str) -> str:
+    return f"0x{hashlib.sha256(f'bytecode_{asset_type}'.encode()).hexdigest()}"
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _type_metadata(asset_type: str, token_standard: str, network: str) -> Tuple:
+    title = asset_type.title()
+    return (f"RWA Token - {title}", f"https://via.placeholder.com/400x400.png?text={asset_type}", title,
+            {'trait_type': 'Token Standard', 'value': token_standard},
+            {'trait_type': 'Network', 'value': network})
 
 
 class TokenizationAgent:
-    def __init__(self):
+    def __init__(self, ledger: Optional[OwnershipLedger] = None, shares: Optional[ShareLedger] = None,
+                 chain: Optional[ChainSimulator] = None, confirm_timeout: float = 0.0,
+                 ids: Optional[IdAllocator] = None, metadata_base_url: str = '/metadata/'):
         self.token_standard = "RWA-721"
         self.network = "RWA-TestNet"
+        # Memory-only unless the app hands in persistent ledgers
+        self.ledger = ledger or OwnershipLedger()
+        self.shares = shares or ShareLedger()
+        # With a chain simulator, mints and transfers are submitted to it and
+        # wait up to confirm_timeout seconds for a receipt
+        self.chain = chain
+        self.confirm_timeout = confirm_timeout
+        # Leased sequence values for token ids and transaction hashes; random
+        # 128-bit values when running without a database
+        self.ids = ids
+        # tokenURI = metadata_base_url + token_id, served by /metadata/<token_id>
+        self.metadata_base_url = metadata_base_url
 
     def tokenize_asset(self, asset_data: Dict, verification_result: Dict) -> Dict:
         if verification_result.get('status') != 'verified':
@@ -21,8 +61,21 @@ class TokenizationAgent:
 
         try:
             token_metadata = self._generate_token_metadata(asset_data, verification_result)
-            contract_data = self._create_mock_contract(asset_data, token_metadata)
             token_id = self._generate_token_id(asset_data)
+            contract_data = self._create_mock_contract(asset_data, token_metadata, token_id)
+            if self.chain:
+                return self._on_chain({
+                    'success': True,
+                    'token_id': token_id,
+                    'contract_address': contract_data['address'],
+                    'metadata': token_metadata,
+                    'metadata_hash': hash_metadata(token_metadata),
+                    'token_uri': contract_data['functions']['tokenURI'],
+                    'network': self.network,
+                    'standard': self.token_standard,
+                    'created_at': datetime.utcnow().isoformat()
+                }, 'mint', {'token_id': token_id, 'contract_address': contract_data['address'],
+                            'asset_id': asset_data.get('id'), 'owner': asset_data.get('user_id')}, 'minted')
             transaction_hash = self._generate_transaction_hash(contract_data)
 
             return {
@@ -31,6 +84,8 @@ class TokenizationAgent:
                 'contract_address': contract_data['address'],
                 'transaction_hash': transaction_hash,
                 'metadata': token_metadata,
+                'metadata_hash': hash_metadata(token_metadata),
+                'token_uri': contract_data['functions']['tokenURI'],
                 'network': self.network,
                 'standard': self.token_standard,
                 'created_at': datetime.utcnow().isoformat(),
@@ -44,6 +99,121 @@ class TokenizationAgent:
                 'status': 'failed'
             }
 
+    def tokenize_batch(self, items: List[Tuple[Dict, Dict]]) -> Dict:
+        """
+        Mints many verified assets in one batch transaction.
+
+        `items` are (asset_data, verification_result) pairs. All tokens share
+        one contract; each token's leaf commits to its token id, asset, owner
+        and metadata, and the Merkle root of the leaves is the batch
+        transaction hash. Every token carries its inclusion proof so it can be
+        verified without the rest of the batch.
+        """
+        rejected = [{'asset_id': asset_data.get('id'), 'error': 'Asset must be verified before tokenization'}
+                    for asset_data, verification_result in items
+                    if verification_result.get('status') != 'verified']
+        verified = [(asset_data, verification_result) for asset_data, verification_result in items
+                    if verification_result.get('status') == 'verified']
+        if not verified:
+            return {'success': False, 'error': 'No verified assets in batch', 'status': 'failed',
+                    'tokens': [], 'rejected': rejected}
+
+        try:
+            contract_address = self._generate_contract_address({'asset_type': 'batch'})
+            created_at = datetime.utcnow().isoformat()
+            tokens = []
+            for (asset_data, verification_result), unique in zip(verified, self._unique(len(verified))):
+                token_id = self._generate_token_id(asset_data, unique)
+                metadata = self._generate_token_metadata(asset_data, verification_result)
+                token = {
+                    'asset_id': asset_data.get('id'),
+                    'token_id': token_id,
+                    'owner': asset_data.get('user_id'),
+                    'contract_address': contract_address,
+                    'metadata': metadata,
+                    'metadata_hash': hash_metadata(metadata),
+                    'token_uri': f"{self.metadata_base_url}{token_id}",
+                }
+                token['leaf'] = leaf_hash(self._leaf_payload(token))
+                tokens.append(token)
+
+            tree = MerkleTree([token['leaf'] for token in tokens])
+            transaction_hash = f"0x{tree.root.hex()}"
+            for index, token in enumerate(tokens):
+                token.update({
+                    'success': True,
+                    'transaction_hash': transaction_hash,
+                    'network': self.network,
+                    'standard': self.token_standard,
+                    'created_at': created_at,
+                    'status': 'minted',
+                    'merkle': {'root': transaction_hash, 'leaf': token['leaf'].hex(),
+                               'index': index, 'proof': tree.proof(index)},
+                })
+                del token['leaf']
+
+            batch = {
+                'success': True,
+                'transaction_hash': transaction_hash,
+                'merkle_root': transaction_hash,
+                'contract_address': contract_address,
+                'network': self.network,
+                'standard': self.token_standard,
+                'created_at': created_at,
+                'status': 'minted',
+                'tokens': tokens,
+                'rejected': rejected
+            }
+            if self.chain:
+                # Token proofs stay anchored to the Merkle root; the chain
+                # transaction that carries it gets its own hash
+                chain_tx_hash, receipt = self._submit('mint_batch', {'merkle_root': transaction_hash,
+                                                                     'count': len(tokens)})
+                batch.update(chain_tx_hash=chain_tx_hash, receipt=receipt,
+                             status='minted' if receipt else 'pending')
+                for token in tokens:
+                    token.update(chain_tx_hash=chain_tx_hash, status=batch['status'])
+            return batch
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Batch tokenization failed: {str(e)}',
+                'status': 'failed',
+                'tokens': [],
+                'rejected': rejected
+            }
+
+    def _submit(self, kind: str, payload: Dict) -> Tuple[str, Optional[Dict]]:
+        tx_hash = self.chain.submit(kind, payload)
+        receipt = self.chain.wait_for_receipt(tx_hash, self.confirm_timeout) if self.confirm_timeout > 0 \
+            else self.chain.receipt(tx_hash)
+        return tx_hash, receipt
+
+    def _on_chain(self, result: Dict, kind: str, payload: Dict, confirmed_status: str) -> Dict:
+        transaction_hash, receipt = self._submit(kind, payload)
+        result.update(transaction_hash=transaction_hash, receipt=receipt,
+                      status=confirmed_status if receipt else 'pending')
+        return result
+
+    @staticmethod
+    def _leaf_payload(token: Dict) -> Dict:
+        # Metadata is committed to by its content hash
+        return {key: token.get(key) for key in ('token_id', 'asset_id', 'owner', 'contract_address', 'metadata_hash')}
+
+    def verify_token_inclusion(self, token_result: Dict) -> bool:
+        """
+        Checks one batch-minted token on its own: its fields must hash to the
+        recorded leaf, and the leaf's proof must lead to the batch transaction
+        hash. Metadata, when present, must match the committed content hash.
+        """
+        merkle = token_result.get('merkle')
+        if not merkle or leaf_hash(self._leaf_payload(token_result)).hex() != merkle['leaf']:
+            return False
+        if 'metadata' in token_result and content_hash(token_result['metadata']) != token_result['metadata_hash']:
+            return False
+        return verify_merkle_proof(merkle['leaf'], merkle['proof'], token_result['transaction_hash'])
+
     def _generate_token_metadata(self, asset_data: Dict, verification_result: Dict) -> Dict:
         asset_type = asset_data.get('asset_type', 'Unknown')
         value = asset_data.get('estimated_value', 0)
@@ -51,31 +221,37 @@ class TokenizationAgent:
         location = asset_data.get('location', 'Unknown')
         status = verification_result.get('status', 'unknown')
         score = verification_result.get('overall_score', 0.0)
+        total_shares = int(asset_data.get('shares') or 1)
+        name, image, type_title, standard_trait, network_trait = _type_metadata(
+            asset_type, self.token_standard, self.network)
 
-        return {
-            'name': f"RWA Token - {asset_type.title()}",
+        metadata = {
+            'name': name,
             'description': description,
-            'image': f"https://via.placeholder.com/400x400.png?text={asset_type}",
+            'image': image,
             'external_url': f"https://rwa-marketplace.com/asset/{asset_data.get('id', 'unknown')}",
             'attributes': [
-                {'trait_type': 'Asset Type', 'value': asset_type.title()},
+                {'trait_type': 'Asset Type', 'value': type_title},
                 {'trait_type': 'Estimated Value', 'value': f"${value:,.2f}"},
                 {'trait_type': 'Location', 'value': location},
                 {'trait_type': 'Verification Status', 'value': status.title()},
                 {'trait_type': 'Verification Score', 'value': f"{score * 100:.1f}%"},
-                {'trait_type': 'Token Standard', 'value': self.token_standard},
-                {'trait_type': 'Network', 'value': self.network},
-                {'trait_type': 'Tokenization Date', 'value': datetime.utcnow().strftime('%Y-%m-%d')}
+                standard_trait,
+                network_trait,
+                {'trait_type': 'Tokenization Date', 'value': datetime.utcnow().date().isoformat()}
             ],
             'properties': {
                 'category': 'Real World Asset',
                 'subcategory': asset_type,
-                'fractional': False,
+                'fractional': total_shares > 1,
                 'transferable': True
             }
         }
+        if total_shares > 1:
+            metadata['properties']['total_shares'] = total_shares
+        return metadata
 
-    def _create_mock_contract(self, asset_data: Dict, metadata: Dict) -> Dict:
+    def _create_mock_contract(self, asset_data: Dict, metadata: Dict, token_id: str) -> Dict:
         contract_address = self._generate_contract_address(asset_data)
 
         return {
@@ -85,10 +261,10 @@ class TokenizationAgent:
             'constructor_args': {
                 'name': metadata['name'],
                 'symbol': 'RWA',
-                'baseURI': 'https://api.rwa-tokenization.com/metadata/'
+                'baseURI': self.metadata_base_url
             },
             'functions': {
-                'tokenURI': f'https://api.rwa-tokenization.com/metadata/{contract_address}',
+                'tokenURI': f'{self.metadata_base_url}{token_id}',
                 'ownerOf': asset_data.get('user_id', 'unknown'),
                 'approve': 'function approve(address to, uint256 tokenId)',
                 'transfer': 'function transfer(address to, uint256 tokenId)'
@@ -105,24 +281,34 @@ class TokenizationAgent:
             ]
         }
 
-    def _generate_token_id(self, asset_data: Dict) -> str:
-        base = f"{asset_data.get('id', str(uuid.uuid4()))}_{asset_data.get('asset_type', 'asset')}_{int(time.time())}"
+    def _unique(self, count: int = 1) -> List[int]:
+        if self.ids:
+            return self.ids.next_ids(count)
+        return [int.from_bytes(os.urandom(16), 'big') for _ in range(count)]
+
+    def _generate_token_id(self, asset_data: Dict, unique: Optional[int] = None) -> str:
+        unique = self._unique()[0] if unique is None else unique
+        if self.ids:
+            return f"RWA_{unique:016X}"  # leased values are unique as they are
+        base = f"{asset_data.get('id', 'asset')}_{asset_data.get('asset_type', 'asset')}_{unique}"
         token_hash = hashlib.sha256(base.encode()).hexdigest()
         return f"RWA_{token_hash[:16].upper()}"
 
     def _generate_contract_address(self, asset_data: Dict) -> str:
-        content = f"contract_{asset_data.get('asset_type', 'unknown')}_{uuid.uuid4()}"
+        content = f"contract_{asset_data.get('asset_type', 'unknown')}_{self._unique()[0]}"
         return f"0x{hashlib.sha256(content.encode()).hexdigest()[:40]}"
 
     def _generate_transaction_hash(self, contract_data: Dict) -> str:
-        content = f"tx_{contract_data['address']}_{int(time.time())}"
+        content = f"tx_{contract_data['address']}_{self._unique()[0]}"
         return f"0x{hashlib.sha256(content.encode()).hexdigest()}"
 
     def _generate_mock_bytecode(self, asset_data: Dict) -> str:
-        content = f"bytecode_{asset_data.get('asset_type', 'unknown')}"
-        return f"0x{hashlib.sha256(content.encode()).hexdigest()}"
+        return _mock_bytecode(asset_data.get('asset_type', 'unknown'))
 
-    def _get_mock_abi(self) -> list:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_mock_abi() -> list:
+        # Shared by every contract: treat as read-only
         return [
             {
                 "inputs": [
@@ -148,18 +334,91 @@ class TokenizationAgent:
         ]
 
     def verify_token_ownership(self, token_id: str, wallet_address: str) -> bool:
-        return True  # Always true in POC
+        return self.ledger.owner_of(token_id) == wallet_address
 
     def transfer_token(self, token_id: str, from_address: str, to_address: str) -> Dict:
+        if self.shares.is_fractional(token_id):
+            return {
+                'success': False,
+                'error': 'Token is fractionalized; transfer its shares instead',
+                'status': 'failed'
+            }
+        try:
+            record = self.ledger.transfer(token_id, from_address, to_address)
+        except ValueError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'status': 'failed'
+            }
+
+        result = {
+            'success': True,
+            'from_address': from_address,
+            'to_address': to_address,
+            'token_id': token_id,
+            'ledger_seq': record['seq'],
+            'timestamp': datetime.utcfromtimestamp(record['ts']).isoformat()
+        }
+        if self.chain:
+            return self._on_chain(result, 'transfer', {'token_id': token_id, 'from': from_address,
+                                                       'to': to_address, 'ledger_seq': record['seq']}, 'completed')
+
         transaction_hash = hashlib.sha256(
-            f"transfer_{token_id}_{from_address}_{to_address}_{int(time.time())}".encode()
+            f"transfer_{token_id}_{from_address}_{to_address}_{record['seq']}".encode()
         ).hexdigest()
+        result['transaction_hash'] = f"0x{transaction_hash}"
+        return result
 
+    def fractionalize_token(self, token_id: str, owner: str, total_shares: int) -> Dict:
+        if not self.verify_token_ownership(token_id, owner):
+            return {
+                'success': False,
+                'error': f'{owner} does not own {token_id}',
+                'status': 'failed'
+            }
+        try:
+            record = self.shares.fractionalize(token_id, owner, total_shares)
+        except ValueError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'status': 'failed'
+            }
         return {
             'success': True,
-            'transaction_hash': f"0x{transaction_hash}",
-            'from_address': from_address,
-            'to_address': to_address,
             'token_id': token_id,
-            'timestamp': datetime.utcnow().isoformat()
+            'owner': owner,
+            'total_shares': total_shares,
+            'ledger_seq': record['seq']
         }
+
+    def transfer_shares(self, moves: List[Tuple[str, str, str, int]]) -> Dict:
+        """Moves (token_id, from_address, to_address, shares) atomically: all succeed or none do."""
+        try:
+            record = self.shares.transfer_batch(moves)
+        except ValueError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'status': 'failed'
+            }
+
+        result = {
+            'success': True,
+            'transfers': [
+                {'token_id': token_id, 'from_address': from_address, 'to_address': to_address, 'shares': shares}
+                for token_id, from_address, to_address, shares in record['moves']
+            ],
+            'ledger_seq': record['seq'],
+            'timestamp': datetime.utcfromtimestamp(record['ts']).isoformat()
+        }
+        if self.chain:
+            return self._on_chain(result, 'share_transfer', {'moves': record['moves'],
+                                                             'ledger_seq': record['seq']}, 'completed')
+
+        transaction_hash = hashlib.sha256(
+            f"shares_{record['seq']}_{json.dumps(record['moves'])}".encode()
+        ).hexdigest()
+        result['transaction_hash'] = f"0x{transaction_hash}"
+        return result
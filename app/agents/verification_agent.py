@@ -3,34 +3,50 @@
 from typing import Dict, List
 from app.agents.agents_modular import CoordinatorAgent
 
+# Bump when agents, prompts or scoring change so stored snapshots can be told apart
+VERIFIER_VERSION = "modular-1.0"
+
 class VerificationAgent:
     def __init__(self):
+        self.version = VERIFIER_VERSION
         self.verification_threshold = 0.7
         self.coordinator = CoordinatorAgent()
 
     def verify_asset(self, asset_data: Dict) -> Dict:
         try:
-            verification_result = self.coordinator.verify(asset_data)
-            result = {
-                'overall_score': verification_result.get('overall_score', 0.0),
-                'status': verification_result.get('status', 'pending'),
-                'breakdown': verification_result.get('breakdown', {}),
-                'agent_notes': verification_result.get('agent_notes', []),
-                'recommendations': self._generate_recommendations(verification_result),
-                'next_steps': self._define_next_steps(verification_result.get('status', 'pending')),
-                'issues': []
-            }
+            return self._result(self.coordinator.verify(asset_data))
+        except Exception as e:
+            return self._error(e)
+
+    async def verify_asset_async(self, asset_data: Dict) -> Dict:
+        try:
+            return self._result(await self.coordinator.verify_async(asset_data))
         except Exception as e:
-            result = {
-                'overall_score': 0.0,
-                'status': 'error',
-                'breakdown': {},
-                'agent_notes': [],
-                'recommendations': [],
-                'next_steps': [],
-                'issues': [f"Verification error: {str(e)}"]
-            }
-        return result
+            return self._error(e)
+
+    def _result(self, verification_result: Dict) -> Dict:
+        return {
+            'overall_score': verification_result.get('overall_score', 0.0),
+            'status': verification_result.get('status', 'pending'),
+            'breakdown': verification_result.get('breakdown', {}),
+            'agent_notes': verification_result.get('agent_notes', []),
+            'recommendations': self._generate_recommendations(verification_result),
+            'next_steps': self._define_next_steps(verification_result.get('status', 'pending')),
+            'issues': [],
+            'verifier_version': self.version
+        }
+
+    def _error(self, e: Exception) -> Dict:
+        return {
+            'overall_score': 0.0,
+            'status': 'error',
+            'breakdown': {},
+            'agent_notes': [],
+            'recommendations': [],
+            'next_steps': [],
+            'issues': [f"Verification error: {str(e)}"],
+            'verifier_version': self.version
+        }
 
     def _generate_recommendations(self, verification_result: Dict) -> List[str]:
         recos = []
@@ -0,0 +1,229 @@
+"""
+ASGI serving mode: uvicorn app.asgi:app
+
+/api/intake and /api/verify/<id> are served by coroutines. Model calls are
+awaited (a verification's four agent calls run concurrently) and SQLite is
+reached through aiosqlite, so a request waiting on Gemini holds no thread:
+one process keeps hundreds of them in flight, where a sync worker holds one.
+Every other route is the Flask app, run on a thread pool (ASGI_WSGI_THREADS).
+
+Both modes share app.main: the same agents, the same write functions
+(through AsyncSession.run_sync) and the same metrics and request log.
+Async writes skip the group-commit writer; an in-process lock keeps them
+to SQLite's one writer at a time instead of spinning on busy_timeout.
+Native routes carry no Server-Timing header.
+
+GET /api/events is native too: an open stream is a coroutine waiting on
+the process's EventHub, so dashboards cost no thread while idle.
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from config import Config
+from app.main import app as flask_app, db, verification_agent, intake_response, event_hub
+from app.agents.llm_utils import extract_asset_info_with_llm_async
+from app.logging_config import open_log_context, close_log_context, log_context, log_request
+from app.metrics import HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS, INTAKES, VERIFICATIONS
+from app.models.database import Asset
+from app.models.engine import apply_sqlite_profile, sqlite_pragmas
+from app.models.events import EventStream, HEARTBEAT
+from app.models.operations import create_asset, record_verification
+
+logger = logging.getLogger(__name__)
+VERIFY_PATH = re.compile(r'/api/verify/(\d+)')
+
+
+def create_async_db(url, config):
+    """Async engine on the app's database file (aiosqlite), with the same SQLite profile."""
+    if url.get_backend_name() != 'sqlite':
+        raise NotImplementedError(f"async mode not available for {url.get_backend_name()}")
+    engine = create_async_engine(url.set(drivername='sqlite+aiosqlite'),
+                                 pool_size=config.ASYNC_DB_POOL_SIZE, max_overflow=config.ASYNC_DB_POOL_SIZE)
+    if config.SQLITE_PROFILE_ENABLED:
+        apply_sqlite_profile(engine.sync_engine, sqlite_pragmas(config))
+    return engine
+
+
+with flask_app.app_context():
+    async_engine = create_async_db(db.engine.url, Config)
+sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+write_lock = asyncio.Lock()
+wsgi = WSGIMiddleware(flask_app, workers=Config.ASGI_WSGI_THREADS)
+
+
+async def run_write(work):
+    """Async run_write(): the sync write unit runs on an AsyncSession, committed once."""
+    async with write_lock:
+        async with sessions() as session:
+            result = await session.run_sync(work)
+            await session.commit()
+            return result
+
+
+async def asset_intake(data):
+    if not data or 'user_input' not in data or 'wallet_address' not in data:
+        return 400, {'error': 'Missing required fields'}
+    try:
+        user_input = data['user_input']
+        wallet_address = data['wallet_address']
+        email = data.get('email')
+        log_context(wallet=wallet_address)
+        logger.info("[INTAKE] Received input from %s", wallet_address)
+        parsed_data = await extract_asset_info_with_llm_async(user_input)
+        asset_dict = await run_write(
+            lambda session: create_asset(session, wallet_address, email, parsed_data, user_input)
+        )
+        INTAKES.inc()
+        return 200, intake_response(asset_dict, parsed_data)
+    except Exception as e:
+        logger.error(f"[INTAKE ERROR] {e}")
+        return 500, {'error': 'Internal server error', 'details': str(e)}
+
+
+async def verify_asset(data, asset_id):
+    try:
+        async with sessions() as session:
+            asset = await session.get(Asset, asset_id)
+            if asset is None:
+                return 404, {'error': 'Asset not found'}
+            asset_data = asset.to_dict()
+        logger.info("[VERIFY] Verifying asset ID %s", asset_id)
+        verification_result = await verification_agent.verify_asset_async(asset_data)
+        asset_dict = await run_write(
+            lambda session: record_verification(session, asset_id, verification_result)
+        )
+        VERIFICATIONS.labels(verification_result['status']).inc()
+        return 200, {
+            'success': True,
+            'verification_result': verification_result,
+            'asset': asset_dict
+        }
+    except Exception as e:
+        logger.error(f"[VERIFY ERROR] {e}")
+        return 500, {'error': 'Verification failed', 'details': str(e)}
+
+
+async def asset_events(scope, receive, send):
+    """/api/events (see app.main) as a coroutine fed by the hub's poller thread."""
+    params = parse_qs(scope['query_string'].decode('latin1'))
+    headers = dict(scope['headers'])
+    last_id = headers.get(b'last-event-id', b'').decode('latin1') or params.get('last_event_id', [''])[0]
+    stream = EventStream(event_hub, params.get('wallet', [None])[0],
+                         int(last_id) if last_id.isdigit() else None, replay_max=Config.EVENTS_REPLAY_MAX)
+    loop = asyncio.get_running_loop()
+    inbox = asyncio.Queue()
+
+    async def wait_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    disconnected = asyncio.ensure_future(wait_disconnect())
+    try:
+        opening = await asyncio.to_thread(
+            stream.open, lambda rows: loop.call_soon_threadsafe(inbox.put_nowait, rows)
+        )
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+        await send({'type': 'http.response.body', 'body': ''.join(opening).encode(), 'more_body': True})
+        log_request('GET', '/api/events', scope['path'], 200, 0)
+        deadline = loop.time() + Config.EVENTS_STREAM_SECONDS
+        while not disconnected.done() and loop.time() < deadline:
+            getter = asyncio.ensure_future(inbox.get())
+            timeout = max(0.0, min(Config.EVENTS_HEARTBEAT_SECONDS, deadline - loop.time()))
+            done, _ = await asyncio.wait({getter, disconnected}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                chunk = ''.join(stream.render(getter.result()))
+            else:
+                getter.cancel()
+                chunk = '' if disconnected.done() else HEARTBEAT
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+        if not disconnected.done():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+        stream.close()
+
+
+def route(scope):
+    """(handler, route template, args) of a natively async route, or None."""
+    if scope['method'] != 'POST':
+        return None
+    if scope['path'] == '/api/intake':
+        return asset_intake, '/api/intake', ()
+    match = VERIFY_PATH.fullmatch(scope['path'])
+    if match:
+        return verify_asset, '/api/verify/<int:asset_id>', (int(match.group(1)),)
+    return None
+
+
+async def read_json(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+async def serve(scope, receive, send, handler, template, args):
+    start = time.perf_counter()
+    headers = dict(scope['headers'])
+    request_id = headers.get(b'x-request-id', b'').decode('latin1') or None
+    context = open_log_context(request_id, asset_id=args[0] if args else None)
+    if Config.METRICS_ENABLED:
+        HTTP_IN_PROGRESS.inc()
+    try:
+        status, payload = await handler(await read_json(receive), *args)
+        body = flask_app.json.dumps(payload, separators=(',', ':')).encode()
+        await send({'type': 'http.response.start', 'status': status, 'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'x-request-id', context['request_id'].encode()),
+        ]})
+        await send({'type': 'http.response.body', 'body': body})
+        if Config.METRICS_ENABLED:
+            HTTP_REQUESTS.labels(scope['method'], template, status).inc()
+            HTTP_LATENCY.labels(scope['method'], template).observe(time.perf_counter() - start)
+        log_request(scope['method'], template, scope['path'], status, (time.perf_counter() - start) * 1000)
+    finally:
+        if Config.METRICS_ENABLED:
+            HTTP_IN_PROGRESS.dec()
+        close_log_context()
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await async_engine.dispose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if (scope['type'] == 'http' and scope['method'] == 'GET' and scope['path'] == '/api/events'
+            and Config.EVENTS_STREAM_ENABLED):
+        return await asset_events(scope, receive, send)
+    native = route(scope) if scope['type'] == 'http' else None
+    if native is None:
+        return await wsgi(scope, receive, send)
+    await serve(scope, receive, send, *native)
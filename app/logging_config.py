@@ -0,0 +1,156 @@
+"""
+Non-blocking structured logging.
+
+Request threads only put records on an in-memory queue (QueueHandler); a
+QueueListener thread formats them and does the file and console I/O, so a
+slow disk never stalls a request. The file gets one JSON object per line
+(rotated by size), the console keeps the human-readable format.
+
+Records logged during a request carry its request id (X-Request-Id, or a new
+one), the wallet and asset id when the route has them, and the trace id.
+One "request" record per request adds method, route, status and duration;
+log_report.py aggregates those.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+from flask import g, request
+
+from app.tracing import current_trace
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Request context and extra= fields copied into the JSON record when present
+FIELDS = ('request_id', 'trace_id', 'wallet', 'asset_id', 'method', 'route', 'path', 'status', 'duration_ms')
+
+_context: ContextVar[Optional[Dict]] = ContextVar('log_context', default=None)
+request_logger = logging.getLogger('app.request')
+
+
+def log_context(**fields):
+    """Adds fields (wallet=..., asset_id=...) to every later record of the current request."""
+    context = _context.get()
+    if context is not None:
+        context.update(fields)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps the current request's context on the record before it is queued."""
+
+    def filter(self, record):
+        context = _context.get()
+        if context:
+            for name, value in context.items():
+                if not hasattr(record, name):
+                    setattr(record, name, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'pid': record.process,
+        }
+        for name in FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        exc = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exc:
+            entry['exc'] = exc
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Render the message and traceback on the calling thread (args may be
+        # mutable) but keep the extra fields for the JSON formatter
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(config) -> QueueListener:
+    """
+    Routes the root logger through a queue to a size-rotated JSON file
+    (LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT) and the console. A {pid}
+    in LOG_FILE gives each worker process its own file, which rotation
+    needs when several processes log. Returns the started listener.
+    """
+    path = config.LOG_FILE.format(pid=os.getpid())
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    file_handler = RotatingFileHandler(path, maxBytes=config.LOG_MAX_BYTES,
+                                       backupCount=config.LOG_BACKUP_COUNT, encoding='utf-8')
+    file_handler.setFormatter(JsonFormatter())
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(config.LOG_LEVEL)
+
+    listener = QueueListener(log_queue, file_handler, console, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def open_log_context(request_id: Optional[str] = None, **fields) -> Dict:
+    """Starts the log context of a request (Flask hook below, or app/asgi.py)."""
+    trace = current_trace()
+    context = {'request_id': request_id or os.urandom(8).hex(), 'trace_id': trace.id if trace else None, **fields}
+    _context.set(context)
+    return context
+
+
+def close_log_context():
+    _context.set(None)
+
+
+def log_request(method: str, route: Optional[str], path: str, status: int, duration_ms: float):
+    request_logger.info('%s %s %s', method, path, status, extra={
+        'method': method, 'route': route, 'path': path, 'status': status, 'duration_ms': round(duration_ms, 3),
+    })
+
+
+def init_request_logging(app):
+    """Opens a log context per request and logs one "request" record when it ends."""
+
+    @app.before_request
+    def _open_context():
+        args = request.view_args or {}
+        g.log_start = time.perf_counter()
+        open_log_context(request.headers.get('X-Request-Id'),
+                         wallet=args.get('wallet_address'), asset_id=args.get('asset_id'))
+
+    @app.after_request
+    def _log_request(response):
+        context = _context.get()
+        if context is None:
+            return response
+        response.headers['X-Request-Id'] = context['request_id']
+        log_request(request.method, request.url_rule.rule if request.url_rule else None, request.path,
+                    response.status_code, (time.perf_counter() - g.log_start) * 1000)
+        return response
+
+    @app.teardown_request
+    def _close_context(exc):
+        close_log_context()
@@ -1,47 +1,221 @@
 import os
 import sys
 import json
+import queue
+import time
 import logging
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, abort
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from app.models.database import db, User, Asset, Transaction
+from config import Config
+from app.models.database import db, User, Asset, Transaction, AssetEvent
+from app.models.engine import init_engines
+from app.models.migrations import upgrade as upgrade_schema
+from app.models.session import unit_of_work, GroupCommitWriter
+from app.models.archive import transaction_history
+from app.models.search import search_assets
+from app.models.analytics import analytics_store
+from app.models.user_cache import wallet_cache
+from app.models.id_allocator import IdAllocator
+from app.models.metadata_store import load_metadata, metadata_cache
+from app.models.events import EventHub, EventStream, HEARTBEAT, latest_event_id
+from app.tracing import init_tracing, span
+from app.logging_config import setup_logging, init_request_logging, log_context
+from app.metrics import init_metrics, metrics_response, INTAKES, VERIFICATIONS, MINTS
+from app.models.operations import (create_asset, record_verification, record_tokenization,
+                                   record_tokenization_batch, record_transfer, record_share_transfers,
+                                   confirm_chain_transactions)
 from app.agents.verification_agent import VerificationAgent
 from app.agents.tokenization_agent import TokenizationAgent
+from app.agents.ownership_ledger import OwnershipLedger
+from app.agents.share_ledger import ShareLedger
+from app.agents.chain_simulator import ChainSimulator
 from app.agents.llm_utils import extract_asset_info_with_llm
 
 app = Flask(__name__, template_folder='../templates', static_folder='../static')
 app.config['SECRET_KEY'] = 'your-secret-key-change-this'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///rwa_tokenization.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = Config.SQLALCHEMY_DATABASE_URI
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db.init_app(app)
 CORS(app)
 
 verification_agent = VerificationAgent()
-tokenization_agent = TokenizationAgent()
-
-os.makedirs('logs', exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
+tokenization_agent = TokenizationAgent(
+    ledger=OwnershipLedger(
+        Config.OWNERSHIP_LEDGER_DIR,
+        snapshot_every=Config.OWNERSHIP_SNAPSHOT_EVERY,
+        fsync=Config.OWNERSHIP_LEDGER_FSYNC
+    ),
+    shares=ShareLedger(
+        Config.OWNERSHIP_LEDGER_DIR,
+        snapshot_every=Config.OWNERSHIP_SNAPSHOT_EVERY,
+        fsync=Config.OWNERSHIP_LEDGER_FSYNC
+    ),
+    # Per process: receipts are only visible to the worker that submitted
+    chain=ChainSimulator(
+        block_time=Config.CHAIN_BLOCK_TIME,
+        block_size=Config.CHAIN_BLOCK_SIZE,
+        network=Config.NETWORK_NAME,
+        block_history=Config.CHAIN_BLOCK_HISTORY,
+        receipt_history=Config.CHAIN_RECEIPT_HISTORY
+    ) if Config.CHAIN_SIMULATOR_ENABLED else None,
+    confirm_timeout=Config.CHAIN_CONFIRM_TIMEOUT,
+    metadata_base_url=Config.METADATA_BASE_URL
 )
+
+# JSON lines to a rotated LOG_FILE, written off the request thread
+setup_logging(Config)
 logger = logging.getLogger(__name__)
 
 with app.app_context():
     db.create_all()
+    upgrade_schema(db.engine)
+    wallet_cache.maxsize = Config.WALLET_CACHE_SIZE
+    analytics_store.ttl = Config.ANALYTICS_TTL_SECONDS
+    metadata_cache.maxsize = Config.METADATA_CACHE_SIZE
+    # WAL/pragma profile on the write engine; reads use a separate read-only pool
+    read_session = init_engines(app, db, Config)
+    # Per-request breakdown (db, write, agent, llm, serialize, json); Server-Timing with TRACE_HEADERS
+    tracer = init_tracing(app, Config, {db.engine, read_session.get_bind()})
+    # Request id, wallet and asset id on every record; one "request" record per request
+    init_request_logging(app)
+    # Request, pool, commit and pipeline metrics, summed across workers at /metrics
+    if Config.METRICS_ENABLED:
+        init_metrics(app, {'write': db.engine, 'read': read_session.get_bind()})
+    group_commit_writer = GroupCommitWriter(
+        db.engine,
+        window_ms=Config.GROUP_COMMIT_WINDOW_MS,
+        max_batch=Config.GROUP_COMMIT_MAX_BATCH
+    ) if Config.GROUP_COMMIT_ENABLED else None
+    # One outbox poller per worker feeds every open /api/events stream
+    event_hub = EventHub(read_session.get_bind(), poll_ms=Config.EVENTS_POLL_MS)
+    # Token ids and transaction hashes from leased id blocks (one UPDATE per block)
+    tokenization_agent.ids = IdAllocator(db.engine, block_size=Config.ID_BLOCK_SIZE)
+    # Tokens minted before the ledger existed (no-op once it has records)
+    tokenization_agent.ledger.bootstrap(
+        db.session.query(Asset.token_id, User.wallet_address).join(User)
+        .filter(Asset.token_id.isnot(None)).order_by(Asset.id)
+    )
+    db.session.remove()
+
+def intake_response(asset_dict, parsed_data):
+    return {
+        'success': True,
+        'message': 'Asset submitted successfully.',
+        'asset': asset_dict,
+        'parsed_data': parsed_data,
+        'follow_up_questions': [
+            "Can you upload supporting documents?",
+            "What is the date of acquisition?",
+            "Is there a title deed or registration?"
+        ],
+        'next_steps': [
+            "Review asset",
+            "Proceed to verification"
+        ]
+    }
+
+def not_modified(tag):
+    """304 for a client that already holds `tag`, else None."""
+    if request.if_none_match.contains(tag):
+        response = app.response_class(status=304)
+        response.set_etag(tag)
+        return response
+    return None
+
+def run_write(work):
+    """Runs a write unit as one commit, through the group-commit writer when enabled."""
+    with span('write'):
+        if group_commit_writer is not None:
+            return group_commit_writer.run(work)
+        with unit_of_work(db.session) as session:
+            return work(session)
+
+def mint_and_record(tokens, work):
+    """
+    Mints (token_id, owner) pairs in the ownership ledger, then runs the write
+    unit that records them. If the write fails the tokens are burned again,
+    so the ledger never holds a token without a tokenized asset.
+    """
+    tokens = list(tokens)
+    tokenization_agent.ledger.mint_many(tokens)
+    try:
+        return run_write(work)
+    except Exception:
+        tokenization_agent.ledger.burn_many(token_id for token_id, _ in tokens)
+        raise
+
+def confirm_mined(block=None):
+    """Marks this worker's pending history rows 'completed' once their transactions are in a block."""
+    try:
+        with app.app_context():
+            run_write(lambda session: confirm_chain_transactions(session, tokenization_agent.chain.receipt))
+    except Exception as e:
+        # Still pending; the next block retries
+        logger.warning(f"[CHAIN] confirming pending transactions failed: {e}")
+
+def settle(result):
+    """
+    After a pending row is committed: if its block was mined in the meantime,
+    that block's confirm_mined() ran before the row existed, so confirm it now.
+    """
+    if result.get('status') == 'pending' and \
+            tokenization_agent.chain.receipt(result.get('chain_tx_hash') or result['transaction_hash']):
+        confirm_mined()
+
+if tokenization_agent.chain:
+    tokenization_agent.chain.on_block = confirm_mined
+    tokenization_agent.chain.start()
 
 @app.route('/')
 def home():
     return render_template('index.html')
 
+@app.route('/metadata/<string:token_id>')
+def token_metadata(token_id):
+    # tokenURI target. Metadata never changes once minted, so it is cached
+    # for good; the content hash is the ETag (If-None-Match -> 304)
+    try:
+        entry = load_metadata(read_session, token_id)
+        if entry is None:
+            return jsonify({'error': 'Token not found'}), 404
+        digest, body = entry
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(digest)
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response.make_conditional(request)
+    except Exception as e:
+        logger.error(f"[METADATA ERROR] {e}")
+        return jsonify({'error': 'Failed to load metadata', 'details': str(e)}), 500
+
+@app.route('/metrics')
+def metrics():
+    if not Config.METRICS_ENABLED:
+        abort(404)
+    return metrics_response()
+
+@app.route('/debug/traces')
+def list_traces():
+    # Kept traces of this worker, newest first: ?min_ms=N&limit=N
+    if tracer is None or not Config.TRACE_DEBUG_ENDPOINT:
+        abort(404)
+    return jsonify({'traces': tracer.buffer.list(
+        min_ms=request.args.get('min_ms', 0, type=float),
+        limit=min(request.args.get('limit', 50, type=int), 500)
+    )})
+
+@app.route('/debug/traces/<string:trace_id>')
+def get_trace(trace_id):
+    # Spans and, with TRACE_PROFILE, sampled stacks of one trace (X-Trace-Id)
+    if tracer is None or not Config.TRACE_DEBUG_ENDPOINT:
+        abort(404)
+    trace = tracer.buffer.get(trace_id) or abort(404)
+    return jsonify(trace.to_dict(detail=True))
+
 @app.route('/api/health')
 def health_check():
     return jsonify({
@@ -59,39 +233,14 @@ def asset_intake():
         user_input = data['user_input']
         wallet_address = data['wallet_address']
         email = data.get('email')
-        logger.info(f"[INTAKE] Received input from {wallet_address}")
+        log_context(wallet=wallet_address)
+        logger.info("[INTAKE] Received input from %s", wallet_address)
         parsed_data = extract_asset_info_with_llm(user_input)
-        user = User.query.filter_by(wallet_address=wallet_address).first()
-        if not user:
-            user = User(wallet_address=wallet_address, email=email)
-            db.session.add(user)
-            db.session.commit()
-        asset = Asset(
-            user_id=user.id,
-            asset_type=parsed_data.get('asset_type', 'unknown'),
-            description=parsed_data.get('description', user_input),
-            estimated_value=parsed_data.get('estimated_value', 0),
-            location=parsed_data.get('location', 'unknown'),
-            verification_status='requires_review',
-            requirements=json.dumps({})
+        asset_dict = run_write(
+            lambda session: create_asset(session, wallet_address, email, parsed_data, user_input)
         )
-        db.session.add(asset)
-        db.session.commit()
-        return jsonify({
-            'success': True,
-            'message': 'Asset submitted successfully.',
-            'asset': asset.to_dict(),
-            'parsed_data': parsed_data,
-            'follow_up_questions': [
-                "Can you upload supporting documents?",
-                "What is the date of acquisition?",
-                "Is there a title deed or registration?"
-            ],
-            'next_steps': [
-                "Review asset",
-                "Proceed to verification"
-            ]
-        })
+        INTAKES.inc()
+        return jsonify(intake_response(asset_dict, parsed_data))
     except Exception as e:
         logger.error(f"[INTAKE ERROR] {e}")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
@@ -100,34 +249,19 @@ def asset_intake():
 def verify_asset(asset_id):
     try:
         asset = Asset.query.get_or_404(asset_id)
-        logger.info(f"[VERIFY] Verifying asset ID {asset_id}")
+        logger.info("[VERIFY] Verifying asset ID %s", asset_id)
         asset_data = asset.to_dict()
         verification_result = verification_agent.verify_asset(asset_data)
 
-        # Store verification score, breakdown, and (optional) LLM comments in the asset table for quick access
-        asset.verification_status = verification_result['status']
-        asset.updated_at = datetime.utcnow()
-        # Optional: Save these fields if you have them in your Asset model
-        if hasattr(asset, "verification_score"):
-            asset.verification_score = verification_result.get('overall_score')
-        if hasattr(asset, "verification_breakdown"):
-            asset.verification_breakdown = json.dumps(verification_result.get('breakdown', {}))
-        if hasattr(asset, "llm_comments"):
-            asset.llm_comments = verification_result.get('llm_comments', '')
-
-        db.session.commit()
-        transaction = Transaction(
-            asset_id=asset.id,
-            transaction_type='verification',
-            status=verification_result['status'],
-            details=json.dumps(verification_result)
+        # Asset snapshot fields and the verification record are written in one commit
+        asset_dict = run_write(
+            lambda session: record_verification(session, asset_id, verification_result)
         )
-        db.session.add(transaction)
-        db.session.commit()
+        VERIFICATIONS.labels(verification_result['status']).inc()
         return jsonify({
             'success': True,
             'verification_result': verification_result,
-            'asset': asset.to_dict()
+            'asset': asset_dict
         })
     except Exception as e:
         logger.error(f"[VERIFY ERROR] {e}")
@@ -139,29 +273,38 @@ def tokenize_asset(asset_id):
         asset = Asset.query.get_or_404(asset_id)
         if asset.verification_status != 'verified':
             return jsonify({'error': 'Asset must be verified before tokenization'}), 400
-        asset_data = asset.to_dict()
-        last_verification = Transaction.query.filter_by(
-            asset_id=asset.id, transaction_type='verification'
-        ).order_by(Transaction.created_at.desc()).first()
-        verification_result = json.loads(last_verification.details) if last_verification else {'status': 'verified'}
+        if asset.token_id:
+            return jsonify({'error': 'Asset is already tokenized', 'token_id': asset.token_id}), 400
+        # Optional {"shares": N} splits the token into N fractional shares
+        shares = (request.get_json(silent=True) or {}).get('shares') or 1
+        if not isinstance(shares, int) or shares < 1:
+            return jsonify({'error': 'shares must be a positive integer'}), 400
+        asset_data = dict(asset.to_dict(), shares=shares)
+        verification_result = asset.verification_snapshot()
         tokenization_result = tokenization_agent.tokenize_asset(asset_data, verification_result)
         if tokenization_result.get("success"):
-            asset.token_id = tokenization_result["token_id"]
-            asset.updated_at = datetime.utcnow()
-            db.session.commit()
-            transaction = Transaction(
-                asset_id=asset.id,
-                transaction_type='tokenization',
-                transaction_hash=tokenization_result["transaction_hash"],
-                status='completed',
-                details=json.dumps(tokenization_result)
+            owner = asset.user.wallet_address
+            asset_dict = mint_and_record(
+                [(tokenization_result['token_id'], owner)],
+                lambda session: record_tokenization(session, asset_id, tokenization_result)
             )
-            db.session.add(transaction)
-            db.session.commit()
+            settle(tokenization_result)
+            MINTS.labels('single').inc()
+            if shares > 1:
+                fractions = tokenization_agent.fractionalize_token(tokenization_result['token_id'], owner, shares)
+                if not fractions.get('success'):
+                    # Minted and recorded as one whole token; only the split failed
+                    return jsonify({
+                        'success': False,
+                        'error': 'Fractionalization failed',
+                        'details': fractions.get('error'),
+                        'tokenization_result': tokenization_result,
+                        'asset': asset_dict
+                    }), 500
             return jsonify({
                 'success': True,
                 'tokenization_result': tokenization_result,
-                'asset': asset.to_dict()
+                'asset': asset_dict
             })
         else:
             return jsonify(tokenization_result), 400
@@ -169,28 +312,138 @@ def tokenize_asset(asset_id):
         logger.error(f"[TOKENIZATION ERROR] {e}")
         return jsonify({'error': 'Tokenization failed', 'details': str(e)}), 500
 
+@app.route('/api/tokenize/batch', methods=['POST'])
+def tokenize_batch():
+    # {"asset_ids": [...]}: verified, untokenized assets are minted under one Merkle root
+    try:
+        asset_ids = list(dict.fromkeys((request.get_json(silent=True) or {}).get('asset_ids') or []))
+        if not asset_ids:
+            return jsonify({'error': 'Missing asset_ids'}), 400
+        if len(asset_ids) > Config.TOKENIZE_BATCH_MAX:
+            return jsonify({'error': f'At most {Config.TOKENIZE_BATCH_MAX} assets per batch'}), 400
+        assets = {asset.id: asset for asset in Asset.query.filter(Asset.id.in_(asset_ids))}
+        rejected = [{'asset_id': asset_id, 'error': 'Asset not found'}
+                    for asset_id in asset_ids if asset_id not in assets]
+        rejected += [{'asset_id': asset.id, 'error': 'Asset is already tokenized'}
+                     for asset in assets.values() if asset.token_id]
+        items = [(asset.to_dict(), asset.verification_snapshot())
+                 for asset in assets.values() if not asset.token_id]
+        batch_result = tokenization_agent.tokenize_batch(items)
+        batch_result['rejected'] = rejected + batch_result['rejected']
+        if not batch_result.get('success'):
+            return jsonify(batch_result), 400
+        mint_and_record(
+            [(token['token_id'], assets[token['asset_id']].user.wallet_address) for token in batch_result['tokens']],
+            lambda session: record_tokenization_batch(session, batch_result)
+        )
+        settle(batch_result)
+        MINTS.labels('batch').inc(len(batch_result['tokens']))
+        return jsonify(batch_result)
+    except Exception as e:
+        logger.error(f"[BATCH TOKENIZATION ERROR] {e}")
+        return jsonify({'error': 'Batch tokenization failed', 'details': str(e)}), 500
+
+@app.route('/api/transfer', methods=['POST'])
+def transfer_token():
+    # {"token_id": ..., "from_address": ..., "to_address": ...}
+    try:
+        data = request.get_json(silent=True) or {}
+        if not all(data.get(field) for field in ('token_id', 'from_address', 'to_address')):
+            return jsonify({'error': 'Missing required fields'}), 400
+        asset = read_session.query(Asset).filter_by(token_id=data['token_id']).first()
+        if not asset:
+            return jsonify({'error': 'Token not found'}), 404
+        transfer_result = tokenization_agent.transfer_token(data['token_id'], data['from_address'],
+                                                            data['to_address'])
+        if not transfer_result.get('success'):
+            return jsonify(transfer_result), 400
+        run_write(lambda session: record_transfer(session, asset.id, transfer_result))
+        settle(transfer_result)
+        return jsonify(transfer_result)
+    except Exception as e:
+        logger.error(f"[TRANSFER ERROR] {e}")
+        return jsonify({'error': 'Transfer failed', 'details': str(e)}), 500
+
+@app.route('/api/shares/transfer', methods=['POST'])
+def transfer_shares():
+    # {"transfers": [{"token_id", "from_address", "to_address", "shares"}, ...]}: all or nothing
+    try:
+        transfers = (request.get_json(silent=True) or {}).get('transfers') or []
+        if not transfers:
+            return jsonify({'error': 'Missing transfers'}), 400
+        if len(transfers) > Config.SHARE_TRANSFER_BATCH_MAX:
+            return jsonify({'error': f'At most {Config.SHARE_TRANSFER_BATCH_MAX} transfers per batch'}), 400
+        fields = ('token_id', 'from_address', 'to_address', 'shares')
+        if not all(isinstance(move, dict) and all(move.get(field) for field in fields) for move in transfers):
+            return jsonify({'error': 'Each transfer needs token_id, from_address, to_address and shares'}), 400
+        token_ids = {move['token_id'] for move in transfers}
+        asset_ids = dict(read_session.query(Asset.token_id, Asset.id).filter(Asset.token_id.in_(token_ids)))
+        missing = token_ids - set(asset_ids)
+        if missing:
+            return jsonify({'error': 'Token not found', 'token_ids': sorted(missing)}), 404
+        transfer_result = tokenization_agent.transfer_shares([tuple(move[field] for field in fields)
+                                                              for move in transfers])
+        if not transfer_result.get('success'):
+            return jsonify(transfer_result), 400
+        run_write(lambda session: record_share_transfers(session, asset_ids, transfer_result))
+        return jsonify(transfer_result)
+    except Exception as e:
+        logger.error(f"[SHARE TRANSFER ERROR] {e}")
+        return jsonify({'error': 'Share transfer failed', 'details': str(e)}), 500
+
+@app.route('/api/holdings/<string:wallet_address>')
+def get_holdings(wallet_address):
+    # Whole tokens from the ownership ledger, fractional positions from the share ledger
+    positions = tokenization_agent.shares.positions_of(wallet_address)
+    tokens = [token_id for token_id in tokenization_agent.ledger.tokens_of(wallet_address)
+              if token_id not in tokenization_agent.shares.balances]
+    return jsonify({'wallet_address': wallet_address, 'tokens': tokens, 'count': len(tokens),
+                    'positions': positions})
+
+@app.route('/api/chain/stats')
+def chain_stats():
+    if not tokenization_agent.chain:
+        return jsonify({'error': 'Chain simulator is disabled'}), 404
+    return jsonify(tokenization_agent.chain.stats())
+
+@app.route('/api/chain/tx/<string:tx_hash>')
+def chain_receipt(tx_hash):
+    if not tokenization_agent.chain:
+        return jsonify({'error': 'Chain simulator is disabled'}), 404
+    receipt = tokenization_agent.chain.receipt(tx_hash)
+    if receipt is not None:
+        return jsonify(receipt)
+    if tokenization_agent.chain.is_pending(tx_hash):
+        return jsonify({'transaction_hash': tx_hash, 'status': 'pending'})
+    # Never submitted to this worker, or older than CHAIN_RECEIPT_HISTORY
+    return jsonify({'error': 'Transaction not found'}), 404
+
 @app.route('/api/asset/<int:asset_id>')
 def get_asset(asset_id):
     try:
-        asset = Asset.query.get_or_404(asset_id)
-        transactions = Transaction.query.filter_by(asset_id=asset_id).order_by(Transaction.created_at.desc()).all()
-        # Optionally, include latest verification score, breakdown, and LLM comments if present
-        extra_fields = {}
-        if hasattr(asset, "verification_score"):
-            extra_fields["verification_score"] = asset.verification_score
-        if hasattr(asset, "verification_breakdown"):
-            try:
-                extra_fields["verification_breakdown"] = json.loads(asset.verification_breakdown)
-            except Exception:
-                extra_fields["verification_breakdown"] = asset.verification_breakdown
-        if hasattr(asset, "llm_comments"):
-            extra_fields["llm_comments"] = asset.llm_comments
-        asset_dict = asset.to_dict()
-        asset_dict.update(extra_fields)
-        return jsonify({
-            'asset': asset_dict,
-            'transactions': [tx.to_dict() for tx in transactions]
-        })
+        asset = read_session.get(Asset, asset_id) or abort(404)
+        # History is paged on demand: ?limit=N&cursor=<next_cursor>&archived=0
+        limit = min(request.args.get('limit', Config.HISTORY_PAGE_SIZE, type=int), 100)
+        try:
+            history = transaction_history(
+                read_session, asset_id, limit=limit,
+                cursor=request.args.get('cursor'),
+                include_archived=request.args.get('archived', '1') != '0'
+            )
+        except ValueError:
+            # Only a malformed cursor fails to parse
+            return jsonify({'error': 'invalid cursor'}), 400
+        with span('serialize', 'asset'):
+            body = {
+                'asset': asset.to_dict(),
+                'verification': asset.verification_snapshot(),
+                'transactions': history['transactions'],
+                'next_cursor': history['next_cursor']
+            }
+        # Transfers change the history without an event: tag the body itself
+        response = jsonify(body)
+        response.add_etag()
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"[GET ASSET ERROR] {e}")
         return jsonify({'error': 'Asset not found', 'details': str(e)}), 404
@@ -198,33 +451,124 @@ def get_asset(asset_id):
 @app.route('/api/assets/<string:wallet_address>')
 def get_user_assets(wallet_address):
     try:
-        user = User.query.filter_by(wallet_address=wallet_address).first()
+        tag = f'a{latest_event_id(read_session, wallet_address)}'
+        cached = not_modified(tag)
+        if cached:
+            return cached
+        user = read_session.query(User).filter_by(wallet_address=wallet_address).first()
         if not user:
-            return jsonify({'assets': []})
-        assets = Asset.query.filter_by(user_id=user.id).order_by(Asset.created_at.desc()).all()
-        return jsonify({
-            'user': user.to_dict(),
-            'assets': [asset.to_dict() for asset in assets]
-        })
+            response = jsonify({'assets': []})
+        else:
+            assets = read_session.query(Asset).filter_by(user_id=user.id).order_by(Asset.created_at.desc()).all()
+            with span('serialize', 'assets'):
+                body = {
+                    'user': user.to_dict(),
+                    'assets': [asset.to_dict() for asset in assets]
+                }
+            response = jsonify(body)
+        response.set_etag(tag)
+        return response
     except Exception as e:
         logger.error(f"[USER ASSETS ERROR] {e}")
         return jsonify({'error': 'Failed to retrieve assets', 'details': str(e)}), 500
 
+@app.route('/api/events')
+def asset_events():
+    # SSE: ?wallet=0x... gets its own asset changes and every stats delta;
+    # resumes after Last-Event-ID (or ?last_event_id= from /api/stats)
+    if not Config.EVENTS_STREAM_ENABLED:
+        return jsonify({'error': 'Event stream disabled'}), 404
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    stream = EventStream(event_hub, request.args.get('wallet'),
+                         int(last_id) if last_id and last_id.isdigit() else None,
+                         replay_max=Config.EVENTS_REPLAY_MAX)
+
+    def generate():
+        inbox = queue.Queue()
+        deadline = time.monotonic() + Config.EVENTS_STREAM_SECONDS
+        try:
+            yield from stream.open(inbox.put)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows = inbox.get(timeout=min(Config.EVENTS_HEARTBEAT_SECONDS, remaining))
+                except queue.Empty:
+                    yield HEARTBEAT
+                    continue
+                yield from stream.render(rows)
+        finally:
+            stream.close()
+
+    return app.response_class(generate(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/search')
+def search():
+    # ?q=words [prefix*]&status=verified&type=real_estate&limit=N&cursor=<next_cursor>
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Missing search query (q)'}), 400
+    try:
+        page = search_assets(
+            read_session, query,
+            status=request.args.get('status'),
+            asset_type=request.args.get('type'),
+            limit=min(request.args.get('limit', 20, type=int), 100),
+            cursor=request.args.get('cursor'),
+            max_candidates=Config.SEARCH_MAX_CANDIDATES
+        )
+        return jsonify({'query': query, **page})
+    except ValueError:
+        # Only a malformed cursor fails to parse
+        return jsonify({'error': 'invalid cursor'}), 400
+    except Exception as e:
+        logger.error(f"[SEARCH ERROR] {e}")
+        return jsonify({'error': 'Search failed', 'details': str(e)}), 500
+
+@app.route('/api/analytics')
+def get_analytics():
+    # ?bucket=hour|day|week&locations=N (top locations by asset count)
+    try:
+        return jsonify(analytics_store.summary(
+            read_session.get_bind(),
+            bucket=request.args.get('bucket', 'day'),
+            top_locations=min(request.args.get('locations', 20, type=int), 200)
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"[ANALYTICS ERROR] {e}")
+        return jsonify({'error': 'Failed to compute analytics', 'details': str(e)}), 500
+
 @app.route('/api/stats')
 def get_stats():
     try:
-        total_assets = Asset.query.count()
-        total_users = User.query.count()
-        verified_assets = Asset.query.filter_by(verification_status='verified').count()
-        tokenized_assets = Asset.query.filter(Asset.token_id.isnot(None)).count()
-        return jsonify({
+        # The newest event id changes whenever a counter can
+        cached = not_modified(f's{latest_event_id(read_session)}')
+        if cached:
+            return cached
+        # One statement, so the counts and the event id streams resume after share a snapshot
+        event_id, total_assets, total_users, verified_assets, tokenized_assets = read_session.execute(db.select(
+            db.select(db.func.max(AssetEvent.id)).scalar_subquery(),
+            db.select(db.func.count()).select_from(Asset).scalar_subquery(),
+            db.select(db.func.count()).select_from(User).scalar_subquery(),
+            db.select(db.func.count()).select_from(Asset).filter_by(verification_status='verified').scalar_subquery(),
+            db.select(db.func.count()).select_from(Asset).filter(Asset.token_id.isnot(None)).scalar_subquery()
+        )).one()
+        event_id = event_id or 0
+        response = jsonify({
             'total_assets': total_assets,
             'total_users': total_users,
             'verified_assets': verified_assets,
             'tokenized_assets': tokenized_assets,
             'verification_rate': (verified_assets / total_assets * 100) if total_assets else 0,
-            'tokenization_rate': (tokenized_assets / verified_assets * 100) if verified_assets else 0
+            'tokenization_rate': (tokenized_assets / verified_assets * 100) if verified_assets else 0,
+            'event_id': event_id
         })
+        response.set_etag(f's{event_id}')
+        return response
     except Exception as e:
         logger.error(f"[STATS ERROR] {e}")
         return jsonify({'error': 'Failed to retrieve stats', 'details': str(e)}), 500
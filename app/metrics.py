@@ -0,0 +1,119 @@
+"""
+Prometheus metrics for /metrics.
+
+HTTP request counts, latency and in-flight requests per route; database
+connection checkout time and connections in use per engine; commit latency;
+and business counters (intakes, verifications by status, mints).
+
+Under gunicorn each worker is a separate process, so with
+PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py) every worker writes its
+values to memory-mapped files in that directory and /metrics sums them
+across the live workers, whichever worker answers the scrape. The
+directory must be set before prometheus_client is imported and emptied
+before the server starts.
+"""
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+HTTP_REQUESTS = Counter('http_requests_total', 'HTTP requests by route and status',
+                        ['method', 'route', 'status'])
+HTTP_LATENCY = Histogram('http_request_duration_seconds', 'HTTP request latency by route',
+                         ['method', 'route'], buckets=LATENCY_BUCKETS)
+HTTP_IN_PROGRESS = Gauge('http_requests_in_progress', 'HTTP requests being served',
+                         multiprocess_mode='livesum')
+DB_CHECKOUT = Histogram('db_pool_checkout_seconds', 'Time to obtain a pooled database connection (wait + connect)',
+                        ['engine'], buckets=DB_BUCKETS)
+DB_CHECKED_OUT = Gauge('db_pool_checked_out', 'Database connections in use', ['engine'],
+                       multiprocess_mode='livesum')
+DB_COMMIT = Histogram('db_commit_duration_seconds', 'Session commit latency (flush + COMMIT)',
+                      buckets=DB_BUCKETS)
+INTAKES = Counter('asset_intakes_total', 'Assets submitted through /api/intake')
+VERIFICATIONS = Counter('asset_verifications_total', 'Asset verifications by resulting status', ['status'])
+MINTS = Counter('tokens_minted_total', 'Tokens minted', ['mode'])
+
+
+def instrument_engine(engine, name: str):
+    """Times connection checkout and tracks connections in use for one engine."""
+    if getattr(engine, '_metered', False):
+        return engine
+    checkout = DB_CHECKOUT.labels(name)
+    in_use = DB_CHECKED_OUT.labels(name)
+    raw_connection = engine.raw_connection
+
+    # Engine.connect() gets its DBAPI connection here, so the wrapper sees
+    # pool waits and new connections alike, and survives engine.dispose()
+    def timed_raw_connection():
+        start = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            checkout.observe(time.perf_counter() - start)
+
+    engine.raw_connection = timed_raw_connection
+    event.listen(engine, 'checkout', lambda *args: in_use.inc())
+    event.listen(engine, 'checkin', lambda *args: in_use.dec())
+    engine._metered = True
+    return engine
+
+
+def _before_commit(session):
+    session.info['commit_start'] = time.perf_counter()
+
+
+def _after_commit(session):
+    start = session.info.pop('commit_start', None)
+    if start is not None:
+        DB_COMMIT.observe(time.perf_counter() - start)
+
+
+def _after_rollback(session):
+    session.info.pop('commit_start', None)
+
+
+def metrics_response() -> Response:
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app, engines):
+    """
+    Records request metrics for every request of the app and database
+    metrics for the given {name: engine} map and for every Session commit.
+    """
+    for name, engine in engines.items():
+        instrument_engine(engine, name)
+    if not event.contains(Session, 'before_commit', _before_commit):
+        event.listen(Session, 'before_commit', _before_commit)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+
+    @app.before_request
+    def _start_request():
+        g.metrics_start = time.perf_counter()
+        HTTP_IN_PROGRESS.inc()
+
+    @app.after_request
+    def _record_request(response):
+        # The route template, not the path, keeps label cardinality bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUESTS.labels(request.method, route, response.status_code).inc()
+        HTTP_LATENCY.labels(request.method, route).observe(time.perf_counter() - g.metrics_start)
+        return response
+
+    @app.teardown_request
+    def _end_request(exc):
+        if 'metrics_start' in g:
+            HTTP_IN_PROGRESS.dec()
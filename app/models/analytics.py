@@ -0,0 +1,271 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import event, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.database import Asset, Transaction, TransactionArchive
+
+ASSETS = Asset.__table__
+HOT = Transaction.__table__
+ARCHIVE = TransactionArchive.__table__
+
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+BUCKETS = {'hour': 3600, 'day': 86400, 'week': 7 * 86400}
+SCORE_BINS = np.linspace(0.0, 1.0, 11)
+# updated_at is stamped at flush, before the commit, so a slow transaction can
+# commit rows older than the watermark; re-read this much history each refresh
+WATERMARK_LAG = timedelta(seconds=60)
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """'  etawah, Uttar Pradesh, India' -> 'Etawah'; blanks and 'unknown' -> 'Unknown'."""
+    head = (location or '').split(',')[0].strip()
+    if not head or head.lower() == 'unknown':
+        return 'Unknown'
+    return ' '.join(head.split()).title()
+
+
+class Codes:
+    """Interns strings (asset types, locations, agents) as small integer codes."""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def code(self, name: str) -> int:
+        if name not in self._index:
+            self._index[name] = len(self.names)
+            self.names.append(name)
+        return self._index[name]
+
+
+def _breakdown(value) -> Dict:
+    # SQLite hands back the stored JSON text, Postgres a decoded value
+    if value is None:
+        return {}
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _score(value) -> float:
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def _distribution(values: np.ndarray, bins) -> Dict:
+    if values.size == 0:
+        return {'count': 0}
+    counts, edges = np.histogram(values, bins=bins)
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'percentiles': dict(zip((f'p{p}' for p in PERCENTILES), np.percentile(values, PERCENTILES).tolist())),
+        'histogram': {'edges': edges.tolist(), 'counts': counts.tolist()},
+    }
+
+
+def _value_bins(values: np.ndarray, count: int = 12):
+    # Asset values span orders of magnitude: log-spaced bins over the positive range
+    positive = values[values > 0]
+    if positive.size == 0:
+        return count
+    low, high = np.log10(positive.min()), np.log10(positive.max())
+    if low == high:
+        high = low + 1
+    return np.concatenate(([0.0], np.logspace(low, high, count)))
+
+
+class AnalyticsStore:
+    """
+    Columnar copy of the fields /api/analytics aggregates over.
+
+    Assets are held as NumPy arrays indexed by id order and refreshed
+    incrementally from `updated_at`; transactions (hot and archived) as
+    timestamp and type arrays refreshed by id. Aggregates are cached until a
+    commit touches assets or transactions in this process, or for `ttl`
+    seconds, which covers writes from other workers.
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.types, self.locations, self.agents, self.tx_types = Codes(), Codes(), Codes(), Codes()
+        self.asset_ids = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=np.float64)
+        self.type_codes = np.empty(0, dtype=np.int32)
+        self.location_codes = np.empty(0, dtype=np.int32)
+        self.overall_scores = np.empty(0, dtype=np.float64)
+        self.agent_scores = np.empty((0, 0), dtype=np.float64)  # asset x agent, NaN when absent
+        self.tx_times = np.empty(0, dtype=np.int64)  # epoch seconds
+        self.tx_type_codes = np.empty(0, dtype=np.int32)
+        self.asset_watermark: Optional[datetime] = None
+        self.tx_watermark = 0
+        self._results: Dict[tuple, Dict] = {}
+        self._refreshed_at = 0.0
+        self._stale = True
+
+    def invalidate(self):
+        self._stale = True
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    # --- loading -------------------------------------------------------
+
+    def _load_assets(self, conn):
+        stmt = select(ASSETS.c.id, ASSETS.c.asset_type, ASSETS.c.estimated_value, ASSETS.c.location,
+                      ASSETS.c.verification_score, ASSETS.c.verification_breakdown, ASSETS.c.updated_at)
+        if self.asset_watermark is not None:
+            # Re-reading rows already held is harmless: they are upserted
+            stmt = stmt.where(ASSETS.c.updated_at >= self.asset_watermark - WATERMARK_LAG)
+        # Sorted here, not in SQL: ORDER BY id would make SQLite scan the
+        # primary key instead of using ix_asset_updated
+        rows = sorted(conn.execute(stmt).all(), key=lambda row: row.id)
+        if not rows:
+            return
+        # Work column by column; strings are interned once per distinct value
+        ids, types, values, locations, overall, breakdowns, updated = zip(*rows)
+        type_codes = {name: self.types.code(name or 'unknown') for name in set(types)}
+        location_codes = {name: self.locations.code(normalize_location(name)) for name in set(locations)}
+        breakdowns = [_breakdown(value) for value in breakdowns]
+        for agent in sorted(set().union(*breakdowns)):
+            self.agents.code(agent)
+
+        ids = np.array(ids, dtype=np.int64)
+        values = np.array([value or 0.0 for value in values], dtype=np.float64)
+        types = np.array([type_codes[name] for name in types], dtype=np.int32)
+        locations = np.array([location_codes[name] for name in locations], dtype=np.int32)
+        overall = np.array([_score(value) for value in overall], dtype=np.float64)
+        scores = np.array([[_score(breakdown.get(agent)) for agent in self.agents.names]
+                           for breakdown in breakdowns], dtype=np.float64).reshape(len(rows), -1)
+
+        # New agents add columns to the existing score matrix
+        if self.agent_scores.shape[1] < scores.shape[1]:
+            pad = np.full((self.agent_scores.shape[0], scores.shape[1] - self.agent_scores.shape[1]), np.nan)
+            self.agent_scores = np.hstack([self.agent_scores, pad])
+
+        # Rows already held are updated in place; the rest are appended (ids only grow)
+        positions = np.searchsorted(self.asset_ids, ids)
+        known = np.zeros(ids.size, dtype=bool)
+        in_range = positions < self.asset_ids.size
+        known[in_range] = self.asset_ids[positions[in_range]] == ids[in_range]
+        at = positions[known]
+        self.values[at], self.type_codes[at], self.location_codes[at] = values[known], types[known], locations[known]
+        self.overall_scores[at], self.agent_scores[at] = overall[known], scores[known]
+        new = ~known
+        self.asset_ids = np.concatenate([self.asset_ids, ids[new]])
+        self.values = np.concatenate([self.values, values[new]])
+        self.type_codes = np.concatenate([self.type_codes, types[new]])
+        self.location_codes = np.concatenate([self.location_codes, locations[new]])
+        self.overall_scores = np.concatenate([self.overall_scores, overall[new]])
+        self.agent_scores = np.vstack([self.agent_scores, scores[new]])
+        self.asset_watermark = max((stamp for stamp in updated if stamp), default=self.asset_watermark)
+
+    def _load_transactions(self, conn):
+        def newer(table):
+            return select(table.c.id, table.c.transaction_type, table.c.created_at) \
+                .where(table.c.id > self.tx_watermark)
+        # Archiving moves rows between tables without changing their id or time
+        rows = conn.execute(union_all(newer(HOT), newer(ARCHIVE))).all()
+        if not rows:
+            return
+        ids, types, created = zip(*rows)
+        type_codes = {name: self.tx_types.code(name) for name in set(types)}
+        self.tx_times = np.concatenate([self.tx_times,
+                                        np.array(created, dtype='datetime64[s]').astype(np.int64)])
+        self.tx_type_codes = np.concatenate([self.tx_type_codes,
+                                             np.array([type_codes[name] for name in types], dtype=np.int32)])
+        self.tx_watermark = max(ids)
+
+    def refresh(self, engine):
+        with engine.connect() as conn:
+            self._load_assets(conn)
+            self._load_transactions(conn)
+        self._results.clear()
+        self._refreshed_at = time.monotonic()
+
+    # --- aggregates ----------------------------------------------------
+
+    def _grouped(self, codes: Codes, code_array: np.ndarray, limit: Optional[int] = None) -> Dict:
+        counts = np.bincount(code_array, minlength=len(codes.names))
+        # One stable sort by code gives every group's values as a contiguous slice
+        grouped = np.split(self.values[np.argsort(code_array, kind='stable')], np.cumsum(counts)[:-1])
+        order = np.argsort(-counts, kind='stable')
+        if limit:
+            order = order[:limit]
+        bins = _value_bins(self.values)
+        return {codes.names[code]: dict(_distribution(grouped[code], bins), total=float(grouped[code].sum()))
+                for code in order if counts[code]}
+
+    def _scores(self) -> Dict:
+        scores = {'overall': _distribution(self.overall_scores[~np.isnan(self.overall_scores)], SCORE_BINS)}
+        for code, agent in enumerate(self.agents.names):
+            column = self.agent_scores[:, code]
+            scores[agent] = _distribution(column[~np.isnan(column)], SCORE_BINS)
+        return scores
+
+    def _throughput(self, bucket: str) -> Dict:
+        width = BUCKETS[bucket]
+        series = {}
+        for code, tx_type in enumerate(self.tx_types.names):
+            starts, counts = np.unique(self.tx_times[self.tx_type_codes == code] // width * width,
+                                       return_counts=True)
+            series[tx_type] = [[datetime.utcfromtimestamp(int(start)).isoformat(), int(count)]
+                               for start, count in zip(starts, counts)]
+        return {'bucket': bucket, 'series': series}
+
+    def summary(self, engine, bucket: str = 'day', top_locations: int = 20) -> Dict:
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+        with self._lock:
+            if self._stale or time.monotonic() - self._refreshed_at > self.ttl:
+                self._stale = False
+                self.refresh(engine)
+            key = (bucket, top_locations)
+            if key not in self._results:
+                self._results[key] = {
+                    'generated_at': datetime.utcnow().isoformat(),
+                    'total_assets': int(self.asset_ids.size),
+                    'total_value': float(self.values.sum()),
+                    'value_by_type': self._grouped(self.types, self.type_codes),
+                    'value_by_location': self._grouped(self.locations, self.location_codes, top_locations),
+                    'verification_scores': self._scores(),
+                    'throughput': self._throughput(bucket),
+                }
+            return self._results[key]
+
+
+analytics_store = AnalyticsStore()
+_TOUCHED = 'analytics_touched'
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_writes(session, flush_context):
+    if any(isinstance(obj, (Asset, Transaction)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_TOUCHED] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _note_bulk_writes(state):
+    # executemany UPDATE/INSERT statements never pass through the flush
+    if state.is_insert or state.is_update or state.is_delete:
+        if getattr(state.statement, 'table', None) in (ASSETS, HOT):
+            state.session.info[_TOUCHED] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if session.info.pop(_TOUCHED, False):
+        analytics_store.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_writes(session):
+    session.info.pop(_TOUCHED, None)
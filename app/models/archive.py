@@ -0,0 +1,111 @@
+import json
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, delete, exists, insert, or_, select
+from sqlalchemy.orm import aliased
+
+from app.models.database import Transaction, TransactionArchive
+
+HOT = Transaction.__table__
+ARCHIVE = TransactionArchive.__table__
+
+
+def _details_text(value) -> Optional[str]:
+    # SQLite hands back the stored JSON text, Postgres a decoded value
+    if value is None:
+        return None
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _archivable(cutoff: datetime):
+    """Transactions older than cutoff that are not the newest of their type for the asset."""
+    newer = aliased(Transaction)
+    return and_(
+        Transaction.created_at < cutoff,
+        exists().where(
+            newer.asset_id == Transaction.asset_id,
+            newer.transaction_type == Transaction.transaction_type,
+            or_(newer.created_at > Transaction.created_at,
+                and_(newer.created_at == Transaction.created_at, newer.id > Transaction.id))
+        )
+    )
+
+
+def archive_transactions(session, cutoff: datetime, batch_size: int = 1000, level: int = 6) -> int:
+    """
+    Moves archivable transactions into transaction_archive in batches, one
+    commit per batch, and returns how many rows were moved. The newest row of
+    each (asset, type) always stays hot so snapshots and the first history
+    page never touch the archive.
+    """
+    moved = 0
+    last_id = 0
+    while True:
+        rows = session.execute(
+            select(HOT.c.id, HOT.c.asset_id, HOT.c.transaction_type, HOT.c.transaction_hash,
+                   HOT.c.status, HOT.c.details, HOT.c.created_at)
+            .where(HOT.c.id > last_id, _archivable(cutoff))
+            .order_by(HOT.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return moved
+        now = datetime.utcnow()
+        session.execute(insert(ARCHIVE), [{
+            'id': row.id,
+            'asset_id': row.asset_id,
+            'transaction_type': row.transaction_type,
+            'transaction_hash': row.transaction_hash,
+            'status': row.status,
+            'payload': zlib.compress(_details_text(row.details).encode(), level) if row.details is not None else None,
+            'created_at': row.created_at,
+            'archived_at': now,
+        } for row in rows])
+        session.execute(delete(HOT).where(HOT.c.id.in_([row.id for row in rows])))
+        session.commit()
+        moved += len(rows)
+        last_id = rows[-1].id
+
+
+def purge_archive(session, cutoff: datetime) -> int:
+    """Retention: permanently deletes archived transactions created before cutoff."""
+    result = session.execute(delete(ARCHIVE).where(ARCHIVE.c.created_at < cutoff))
+    session.commit()
+    return result.rowcount
+
+
+def encode_cursor(tx: Dict) -> str:
+    return f"{tx['created_at']}|{tx['id']}"
+
+
+def decode_cursor(cursor: str):
+    created_at, tx_id = cursor.rsplit('|', 1)
+    return datetime.fromisoformat(created_at), int(tx_id)
+
+
+def _page(session, model, asset_id, limit, before):
+    query = session.query(model).filter(model.asset_id == asset_id)
+    if before:
+        created_at, tx_id = before
+        query = query.filter(or_(model.created_at < created_at,
+                                 and_(model.created_at == created_at, model.id < tx_id)))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit).all()
+
+
+def transaction_history(session, asset_id: int, limit: int = 20, cursor: Optional[str] = None,
+                        include_archived: bool = True) -> Dict:
+    """
+    One page of an asset's history, newest first, merged from the hot and
+    archive tables with keyset pagination on (created_at, id). Returns the
+    page and the cursor for the next one (None when exhausted).
+    """
+    before = decode_cursor(cursor) if cursor else None
+    rows = [tx.to_dict() for tx in _page(session, Transaction, asset_id, limit + 1, before)]
+    if include_archived:
+        rows += [tx.to_dict() for tx in _page(session, TransactionArchive, asset_id, limit + 1, before)]
+        rows.sort(key=lambda tx: (tx['created_at'], tx['id']), reverse=True)
+    page: List[Dict] = rows[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(rows) > limit else None
+    return {'transactions': page, 'next_cursor': next_cursor}
@@ -0,0 +1,251 @@
+"""
+Online backups of the SQLite database.
+
+A backup first copies the live database to a private snapshot with SQLite's
+online backup API, so the result is always a consistent database even while
+the app is writing. The snapshot is integrity-checked, then stored either as a
+full gzip image or, when a previous backup exists, as an incremental delta
+holding only the pages whose hash changed since that backup. Each backup has a
+JSON manifest (page hashes, base backup, sizes); a restore replays the chain
+from its full backup and copies the result back with the same backup API.
+
+Incrementals save backup storage, not backup time: every run still copies
+and checks the whole database, because the changed pages are only known by
+hashing a consistent copy. (The live file alone is not consistent in WAL
+mode, and Python's SQLite does not ship the sqlite_dbpage table.)
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+DELTA_RECORD = struct.Struct('>I')  # page number, followed by the page bytes
+
+
+def database_path(engine) -> str:
+    path = engine.url.database
+    if engine.dialect.name != 'sqlite' or not path or path == ':memory:':
+        raise RuntimeError("Backups need a file-based SQLite database")
+    return os.path.abspath(path)
+
+
+def _journal_mode(conn) -> str:
+    return conn.execute('PRAGMA journal_mode').fetchone()[0].lower()
+
+
+def snapshot(source_path: str, target_path: str, step_pages: int = 1024, sleep: float = 0.005):
+    """
+    Consistent copy of a live database via the online backup API.
+
+    In WAL mode the copy runs as one step: it only holds a read snapshot, so
+    writers are never blocked. In rollback-journal mode a reader blocks
+    writers, so pages are copied `step_pages` at a time with a short sleep in
+    between to let writers in.
+    """
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        pages = -1 if _journal_mode(source) == 'wal' else step_pages
+        source.backup(target, pages=pages, sleep=sleep)
+    finally:
+        target.close()
+        source.close()
+
+
+def integrity_check(path: str) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('PRAGMA integrity_check').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _pages(path: str):
+    conn = sqlite3.connect(path)
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    conn.close()
+    with open(path, 'rb') as f:
+        while True:
+            page = f.read(page_size)
+            if not page:
+                return
+            yield page
+
+
+def _page_hash(page: bytes) -> str:
+    return hashlib.blake2b(page, digest_size=8).hexdigest()
+
+
+def _manifest_path(backup_dir: str, name: str) -> str:
+    return os.path.join(backup_dir, f'{name}.json')
+
+
+def load_manifest(backup_dir: str, name: str) -> Dict:
+    with open(_manifest_path(backup_dir, name)) as f:
+        return json.load(f)
+
+
+def list_backups(backup_dir: str) -> List[Dict]:
+    """Manifests of every backup in backup_dir, oldest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    manifests = [load_manifest(backup_dir, file[:-5]) for file in os.listdir(backup_dir) if file.endswith('.json')]
+    return sorted(manifests, key=lambda manifest: manifest['created_at'])
+
+
+def _chain_length(backup_dir: str, manifest: Dict) -> int:
+    length = 1
+    while manifest['kind'] == 'incremental':
+        manifest = load_manifest(backup_dir, manifest['base'])
+        length += 1
+    return length
+
+
+def create_backup(engine, backup_dir: str, full: bool = False, max_chain: int = 24,
+                  step_pages: int = 1024, sleep: float = 0.005, level: int = 6) -> Dict:
+    """
+    Takes a backup and returns its manifest. An incremental backup is taken
+    against the newest backup unless `full` is set, there is none yet, or the
+    chain since the last full backup has reached `max_chain`. Either kind
+    snapshots the whole database first; incrementals only store less.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    source_path = database_path(engine)
+    previous = (list_backups(backup_dir) or [None])[-1]
+    if previous is None or _chain_length(backup_dir, previous) >= max_chain:
+        full = True
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=backup_dir) as scratch:
+        copy_path = os.path.join(scratch, 'snapshot.db')
+        snapshot(source_path, copy_path, step_pages, sleep)
+        integrity = integrity_check(copy_path)
+        if integrity != 'ok':
+            raise RuntimeError(f"Snapshot failed integrity check: {integrity}")
+
+        name = f"rwa_{'full' if full else 'incr'}_{datetime.utcnow():%Y%m%d_%H%M%S_%f}"
+        hashes = []
+        changed = 0
+        size = os.path.getsize(copy_path)
+        if full:
+            data_path = os.path.join(backup_dir, f'{name}.db.gz')
+            with gzip.open(data_path, 'wb', compresslevel=level) as out:
+                for page in _pages(copy_path):
+                    hashes.append(_page_hash(page))
+                    out.write(page)
+            changed = len(hashes)
+        else:
+            base_hashes = previous['hashes']
+            data_path = os.path.join(backup_dir, f'{name}.delta.gz')
+            with gzip.open(data_path, 'wb', compresslevel=level) as out:
+                for number, page in enumerate(_pages(copy_path)):
+                    digest = _page_hash(page)
+                    hashes.append(digest)
+                    if number >= len(base_hashes) or base_hashes[number] != digest:
+                        out.write(DELTA_RECORD.pack(number))
+                        out.write(page)
+                        changed += 1
+    seconds = time.perf_counter() - start
+
+    manifest = {
+        'name': name,
+        'kind': 'full' if full else 'incremental',
+        'base': None if full else previous['name'],
+        'file': os.path.basename(data_path),
+        'created_at': datetime.utcnow().isoformat(),
+        'database_bytes': size,
+        'stored_bytes': os.path.getsize(data_path),
+        'page_size': size // len(hashes) if hashes else 0,
+        'page_count': len(hashes),
+        'pages_changed': changed,
+        'integrity': integrity,
+        'seconds': round(seconds, 3),
+        'bytes_per_sec': round(size / seconds) if seconds else None,
+        'hashes': hashes,
+    }
+    with open(_manifest_path(backup_dir, name), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def _chain(backup_dir: str, name: str) -> List[Dict]:
+    """The full backup and every incremental up to `name`, in apply order."""
+    chain = [load_manifest(backup_dir, name)]
+    while chain[-1]['kind'] == 'incremental':
+        chain.append(load_manifest(backup_dir, chain[-1]['base']))
+    return list(reversed(chain))
+
+
+def rebuild(backup_dir: str, name: str, target_path: str) -> Dict:
+    """Writes the database as of backup `name` to target_path and checks its integrity."""
+    chain = _chain(backup_dir, name)
+    with open(target_path, 'wb') as out:
+        with gzip.open(os.path.join(backup_dir, chain[0]['file']), 'rb') as full:
+            while True:
+                block = full.read(1 << 20)
+                if not block:
+                    break
+                out.write(block)
+        for manifest in chain[1:]:
+            page_size = manifest['page_size']
+            with gzip.open(os.path.join(backup_dir, manifest['file']), 'rb') as delta:
+                while True:
+                    header = delta.read(DELTA_RECORD.size)
+                    if not header:
+                        break
+                    (number,) = DELTA_RECORD.unpack(header)
+                    out.seek(number * page_size)
+                    out.write(delta.read(page_size))
+        out.truncate(chain[-1]['page_count'] * chain[-1]['page_size'])
+    integrity = integrity_check(target_path)
+    if integrity != 'ok':
+        raise RuntimeError(f"Backup {name} failed integrity check: {integrity}")
+    return chain[-1]
+
+
+def restore_backup(engine, backup_dir: str, name: str) -> Dict:
+    """
+    Replaces the live database with backup `name`. The rebuilt copy is written
+    into the live file with the backup API in one step, so other connections
+    see either the old or the restored database, never a mix.
+    """
+    target_path = database_path(engine)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=backup_dir) as scratch:
+        rebuilt_path = os.path.join(scratch, 'restore.db')
+        manifest = rebuild(backup_dir, name, rebuilt_path)
+        source = sqlite3.connect(rebuilt_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+    engine.dispose()  # pooled connections may hold pages from before the restore
+    seconds = time.perf_counter() - start
+    return {'name': name, 'chain': len(_chain(backup_dir, name)), 'database_bytes': manifest['database_bytes'],
+            'seconds': round(seconds, 3),
+            'bytes_per_sec': round(manifest['database_bytes'] / seconds) if seconds else None}
+
+
+def apply_retention(backup_dir: str, keep_full: int = 5) -> List[str]:
+    """Keeps the newest `keep_full` full backups and their incrementals; deletes the rest."""
+    manifests = list_backups(backup_dir)
+    fulls = [manifest['name'] for manifest in manifests if manifest['kind'] == 'full']
+    keep = set(fulls[-keep_full:]) if keep_full > 0 else set(fulls)
+    removed = []
+    for manifest in manifests:
+        if _chain(backup_dir, manifest['name'])[0]['name'] in keep:
+            continue
+        os.remove(os.path.join(backup_dir, manifest['file']))
+        removed.append(manifest['name'])
+    # Manifests last: chains are resolved through them above
+    for name in removed:
+        os.remove(_manifest_path(backup_dir, name))
+    return removed
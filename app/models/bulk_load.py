@@ -0,0 +1,177 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.database import User, Asset, AssetEvent
+
+USERS = User.__table__
+ASSETS = Asset.__table__
+# Stay under SQLite's default host-parameter limit for IN (...) lookups
+LOOKUP_CHUNK = 500
+
+
+class Checkpoint:
+    """
+    Progress of one load: byte offset of the next unread line, plus counters.
+    Saved atomically (write-then-rename) after every committed batch, so a
+    killed load resumes at the first line of the first uncommitted batch.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+
+    def load(self) -> Dict:
+        state = {'offset': 0, 'lines': 0, 'loaded': 0, 'errors': 0}
+        if self.path and os.path.exists(self.path):
+            with open(self.path) as f:
+                state.update(json.load(f))
+        return state
+
+    def save(self, state: Dict):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def read_lines(path: str, offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Yields (offset after the line, raw line) from `offset` on, skipping blank lines."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            if line.strip():
+                yield offset, line
+
+
+def read_batches(path: str, offset: int, batch_size: int) -> Iterator[Tuple[int, List[bytes]]]:
+    batch: List[bytes] = []
+    end = offset
+    for end, line in read_lines(path, offset):
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield end, batch
+            batch = []
+    if batch:
+        yield end, batch
+
+
+def parse_record(line: bytes, extract: Callable[[str], dict]) -> Optional[Dict]:
+    """
+    One JSONL record -> asset row values, or None if the record is unusable.
+    Records need `wallet_address` and `user_input` (or `description`);
+    `email` is optional.
+    """
+    try:
+        record = json.loads(line)
+        user_input = record.get('user_input') or record.get('description')
+        wallet_address = record.get('wallet_address')
+        if not user_input or not wallet_address:
+            return None
+        parsed = extract(user_input)
+    except Exception:
+        return None
+    # Same defaults as create_asset(); extractors may also return explicit nulls
+    return {
+        'wallet_address': wallet_address,
+        'email': record.get('email'),
+        'asset_type': parsed.get('asset_type') or 'unknown',
+        'description': parsed.get('description') or user_input,
+        'estimated_value': parsed.get('estimated_value') or 0,
+        'location': parsed.get('location') or 'unknown',
+    }
+
+
+def _insert_users(conn, rows: List[Dict]) -> Dict[str, int]:
+    """Creates missing users with one executemany INSERT-or-ignore, then maps wallets to ids."""
+    emails: Dict[str, Optional[str]] = {}
+    for row in rows:
+        emails.setdefault(row['wallet_address'], row['email'])
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(USERS).on_conflict_do_nothing(index_elements=['wallet_address'])
+    elif dialect == 'postgresql':
+        stmt = pg_insert(USERS).on_conflict_do_nothing(index_elements=['wallet_address'])
+    else:
+        raise NotImplementedError(f"bulk load not available for {dialect}")
+    now = datetime.utcnow()
+    conn.execute(stmt, [{'wallet_address': wallet, 'email': email, 'created_at': now}
+                        for wallet, email in emails.items()])
+    wallets = list(emails)
+    user_ids = {}
+    for start in range(0, len(wallets), LOOKUP_CHUNK):
+        chunk = wallets[start:start + LOOKUP_CHUNK]
+        user_ids.update(conn.execute(
+            select(USERS.c.wallet_address, USERS.c.id).where(USERS.c.wallet_address.in_(chunk))
+        ).all())
+    return user_ids
+
+
+def _insert_assets(conn, rows: List[Dict], user_ids: Dict[str, int]):
+    now = datetime.utcnow()
+    conn.execute(insert(ASSETS), [{
+        'user_id': user_ids[row['wallet_address']],
+        'asset_type': row['asset_type'],
+        'description': row['description'],
+        'estimated_value': row['estimated_value'],
+        'location': row['location'],
+        'verification_status': 'requires_review',
+        'requirements': {},
+        'created_at': now,
+        'updated_at': now,
+    } for row in rows])
+
+
+def load_file(engine, path: str, extract: Callable[[str], dict], batch_size: int = 1000,
+              concurrency: int = 8, checkpoint_path: Optional[str] = None,
+              report: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Loads a JSONL file of asset descriptions straight into the database.
+
+    Lines are read in batches of `batch_size`; each batch is extracted by at
+    most `concurrency` threads, then written in one transaction (executemany
+    for users and assets) and checkpointed. `report` is called with the
+    running totals after every batch.
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    state = checkpoint.load()
+    start = time.perf_counter()
+    lines_this_run = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for end, lines in read_batches(path, state['offset'], batch_size):
+            parsed = list(pool.map(lambda line: parse_record(line, extract), lines))
+            rows = [row for row in parsed if row is not None]
+            if rows:
+                with engine.begin() as conn:
+                    _insert_assets(conn, rows, _insert_users(conn, rows))
+                    # Dashboards recount stats and refetch their lists
+                    conn.execute(insert(AssetEvent.__table__), {
+                        'kind': 'assets.loaded', 'changes': {'count': len(rows)}, 'created_at': datetime.utcnow()
+                    })
+            state['offset'] = end
+            state['lines'] += len(lines)
+            state['loaded'] += len(rows)
+            state['errors'] += len(lines) - len(rows)
+            checkpoint.save(state)
+            lines_this_run += len(lines)
+            if report:
+                seconds = time.perf_counter() - start
+                report(dict(state, lines_per_sec=round(lines_this_run / seconds, 1) if seconds else None))
+    seconds = time.perf_counter() - start
+    return dict(state, seconds=round(seconds, 3),
+                lines_per_sec=round(lines_this_run / seconds, 1) if seconds else None)
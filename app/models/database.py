@@ -1,6 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import json
+import zlib
+
+from app.models.types import JSONDocument, lazy_json
 
 db = SQLAlchemy()
 
@@ -23,6 +26,17 @@ class User(db.Model):
         }
 
 class Asset(db.Model):
+    __table_args__ = (
+        db.Index('ix_asset_user_created', 'user_id', 'created_at'),
+        db.Index('ix_asset_status', 'verification_status'),
+        # Incremental refresh of the analytics arrays
+        db.Index('ix_asset_updated', 'updated_at'),
+        # Partial: only tokenized assets carry a token_id worth indexing
+        db.Index('ix_asset_tokenized', 'token_id',
+                 sqlite_where=db.text('token_id IS NOT NULL'),
+                 postgresql_where=db.text('token_id IS NOT NULL')),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     asset_type = db.Column(db.String(50), nullable=False)
@@ -31,12 +45,18 @@ class Asset(db.Model):
     location = db.Column(db.String(200), nullable=False)
     verification_status = db.Column(db.String(20), default='pending')
     token_id = db.Column(db.String(100), nullable=True)
-    requirements = db.Column(db.Text, nullable=True)  # JSON string
+    metadata_hash = db.Column(db.String(64), nullable=True)  # TokenMetadata.content_hash
+    _requirements = db.Column('requirements', JSONDocument, nullable=True)
+    requirements = lazy_json('_requirements')
 
     # --- NEW FIELDS FOR VERIFICATION SESSION DATA ---
     verification_score = db.Column(db.Float, nullable=True)
-    verification_breakdown = db.Column(db.Text, nullable=True)  # JSON string (dict)
+    _verification_breakdown = db.Column('verification_breakdown', JSONDocument, nullable=True)  # agent -> score
+    verification_breakdown = lazy_json('_verification_breakdown')
     llm_comments = db.Column(db.Text, nullable=True)
+    # Snapshot of the latest verification, written with its Transaction row
+    verifier_version = db.Column(db.String(20), nullable=True)
+    verification_tx_id = db.Column(db.Integer, nullable=True)  # Transaction.id
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -53,22 +73,53 @@ class Asset(db.Model):
             'location': self.location,
             'verification_status': self.verification_status,
             'token_id': self.token_id,
-            'requirements': json.loads(self.requirements) if self.requirements else {},
+            'requirements': self.requirements or {},
             'verification_score': self.verification_score,
-            'verification_breakdown': json.loads(self.verification_breakdown) if self.verification_breakdown else {},
+            'verification_breakdown': self.verification_breakdown or {},
             'llm_comments': self.llm_comments,
+            'verifier_version': self.verifier_version,
+            'verification_tx_id': self.verification_tx_id,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
 
+    def verification_snapshot(self):
+        """Latest verification outcome, without touching the Transaction history."""
+        return {
+            'status': self.verification_status,
+            'overall_score': self.verification_score or 0.0,
+            'breakdown': self.verification_breakdown or {},
+            'verifier_version': self.verifier_version,
+            'transaction_id': self.verification_tx_id
+        }
+
+    @classmethod
+    def breakdown_score(cls, agent):
+        """Server-side JSON path into verification_breakdown, e.g. Asset.breakdown_score('jurisdiction') < 0.5"""
+        return cls.verification_breakdown[agent].as_float()
+
+
+# Literal (not bound) so SQLite can use the partial index
+PENDING_TRANSACTION = "status = 'pending'"
+
 
 class Transaction(db.Model):
+    __table_args__ = (
+        db.Index('ix_transaction_asset_type_created', 'asset_id', 'transaction_type', 'created_at'),
+        db.Index('ix_transaction_asset_created', 'asset_id', 'created_at'),
+        # Partial: chain transactions still waiting for a block (usually none)
+        db.Index('ix_transaction_pending', 'transaction_hash',
+                 sqlite_where=db.text(PENDING_TRANSACTION),
+                 postgresql_where=db.text(PENDING_TRANSACTION)),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
     transaction_type = db.Column(db.String(50), nullable=False)  # tokenize, transfer, etc.
     transaction_hash = db.Column(db.String(100), nullable=True)
     status = db.Column(db.String(20), default='pending')
-    details = db.Column(db.Text, nullable=True)  # JSON string
+    _details = db.Column('details', JSONDocument, nullable=True)
+    details = lazy_json('_details')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     asset = db.relationship('Asset', backref=db.backref('transactions', lazy=True))
@@ -80,6 +131,69 @@ class Transaction(db.Model):
             'transaction_type': self.transaction_type,
             'transaction_hash': self.transaction_hash,
             'status': self.status,
-            'details': json.loads(self.details) if self.details else {},
+            'details': self.details or {},
             'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+        }
+
+
+class TransactionArchive(db.Model):
+    """Transactions moved out of the hot table; details are zlib-compressed JSON."""
+    __tablename__ = 'transaction_archive'
+    __table_args__ = (
+        db.Index('ix_transaction_archive_asset_created', 'asset_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)  # same id as in the hot table
+    asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
+    transaction_type = db.Column(db.String(50), nullable=False)
+    transaction_hash = db.Column(db.String(100), nullable=True)
+    status = db.Column(db.String(20), nullable=True)
+    payload = db.Column(db.LargeBinary, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'asset_id': self.asset_id,
+            'transaction_type': self.transaction_type,
+            'transaction_hash': self.transaction_hash,
+            'status': self.status,
+            'details': json.loads(zlib.decompress(self.payload)) if self.payload else {},
+            'created_at': self.created_at.isoformat(),
+            'archived': True
+        }
+
+class IdSequence(db.Model):
+    """High-water mark of a named id sequence; workers lease blocks of values from it."""
+    __tablename__ = 'id_sequence'
+
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class TokenMetadata(db.Model):
+    """Canonical token metadata JSON, stored once per content hash (see app/models/metadata_store.py)."""
+    __tablename__ = 'token_metadata'
+    # Keyed by text: without a rowid SQLite stores the key once, not in a second index
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    content_hash = db.Column(db.String(64), primary_key=True)  # sha256 of the canonical JSON
+    body = db.Column(db.LargeBinary, nullable=False)
+
+class AssetEvent(db.Model):
+    """Outbox of asset changes, written in the writing transaction and streamed by /api/events."""
+    __tablename__ = 'asset_event'
+    __table_args__ = (
+        db.Index('ix_asset_event_wallet', 'wallet_address', 'id'),
+        # Ids are never reused, so they double as SSE event ids and ETags
+        {'sqlite_autoincrement': True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)  # asset.created, asset.verified, asset.tokenized, assets.loaded
+    wallet_address = db.Column(db.String(42), nullable=True)  # None: not tied to one wallet
+    asset_id = db.Column(db.Integer, nullable=True)
+    changes = db.Column(JSONDocument, nullable=True)  # changed asset fields
+    stats = db.Column(JSONDocument, nullable=True)  # /api/stats counter deltas; None = recount
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
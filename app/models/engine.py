@@ -0,0 +1,74 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+
+def sqlite_pragmas(config) -> dict:
+    """Collects the SQLite profile from a config object (see config.Config)."""
+    return {
+        'journal_mode': config.SQLITE_JOURNAL_MODE,
+        'synchronous': config.SQLITE_SYNCHRONOUS,
+        'mmap_size': config.SQLITE_MMAP_SIZE,
+        'cache_size': config.SQLITE_CACHE_SIZE,
+        'busy_timeout': config.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def apply_sqlite_profile(engine, pragmas: dict, read_only: bool = False):
+    """
+    Registers a connect listener that applies the pragmas to every new
+    connection of the engine. journal_mode is a property of the database file,
+    so it is only set from the write engine; read-only connections get
+    query_only instead.
+    """
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()
+                  if not (read_only and name == 'journal_mode')]
+    if read_only:
+        statements.append("PRAGMA query_only=ON")
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+    # Connections opened before the listener existed would miss the profile
+    engine.dispose()
+    return engine
+
+
+def create_read_engine(write_engine, pragmas: dict = None, pool_size: int = 8):
+    """
+    Opens a separate read-only engine on the same SQLite file so readers
+    neither queue behind nor block the writer's pool. Other backends (and
+    in-memory SQLite) share the write engine.
+    """
+    url = write_engine.url
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return write_engine
+    read_url = make_url(f"sqlite:///file:{url.database}?mode=ro&uri=true")
+    engine = create_engine(read_url, pool_size=pool_size, max_overflow=pool_size)
+    if pragmas:
+        apply_sqlite_profile(engine, pragmas, read_only=True)
+    return engine
+
+
+def init_engines(app, db, config):
+    """
+    Applies the SQLite profile to db.engine and returns a scoped session bound
+    to the read engine, removed at the end of each app context. Must be called
+    inside an app context after the database file exists.
+    """
+    engine = db.engine
+    pragmas = sqlite_pragmas(config) if config.SQLITE_PROFILE_ENABLED else None
+    if engine.dialect.name == 'sqlite' and pragmas:
+        apply_sqlite_profile(engine, pragmas)
+    read_engine = create_read_engine(engine, pragmas, pool_size=config.SQLITE_READ_POOL_SIZE)
+    read_session = scoped_session(sessionmaker(bind=read_engine))
+
+    @app.teardown_appcontext
+    def _remove_read_session(exc):
+        read_session.remove()
+
+    return read_session
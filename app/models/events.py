@@ -0,0 +1,259 @@
+"""
+Pushed dashboard updates: the asset_event outbox and its SSE stream.
+
+Write paths record one small event per asset change in the same
+transaction (see operations.py): the changed asset fields and the deltas
+to the /api/stats counters. Each process runs one EventHub that polls the
+outbox once per interval (or right after a local commit) and fans new rows
+out to its open streams, so read load grows with processes, not with
+dashboards. A stream resumes after the client's Last-Event-ID; when that
+point has been pruned or is too far behind, the client is told to refetch.
+
+Event ids are only assigned in commit order because SQLite has one writer
+at a time; a multi-writer database would need a commit-ordered sequence.
+"""
+import json
+import logging
+import threading
+import weakref
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.database import AssetEvent
+from app.models.types import RawJSON
+
+logger = logging.getLogger(__name__)
+EVENTS = AssetEvent.__table__
+HEARTBEAT = ': ping\n\n'
+_LOCAL = 'asset_events_pending'
+_hubs = weakref.WeakSet()
+
+VERIFIED_FIELDS = ('verification_status', 'verification_score', 'verification_breakdown', 'llm_comments',
+                   'verifier_version', 'verification_tx_id', 'updated_at')
+TOKENIZED_FIELDS = ('token_id', 'updated_at')
+
+
+def record_event(session, kind: str, wallet_address: Optional[str], asset_id: Optional[int] = None,
+                 changes: Optional[Dict] = None, stats: Optional[Dict] = None):
+    """Adds one outbox row to the session's transaction."""
+    session.add(AssetEvent(kind=kind, wallet_address=wallet_address, asset_id=asset_id,
+                           changes=changes, stats=stats))
+    session.info[_LOCAL] = True
+
+
+def record_events(session, rows: List[Dict]):
+    """executemany INSERT of outbox rows (kind, wallet_address, asset_id, changes, stats)."""
+    if rows:
+        now = datetime.utcnow()
+        session.execute(insert(EVENTS), [dict(row, created_at=now) for row in rows])
+        session.info[_LOCAL] = True
+
+
+def latest_event_id(session, wallet_address: Optional[str] = None) -> int:
+    """
+    Id of the newest event (0 if none). With a wallet, the newest event that
+    can change that wallet's asset list: its own or a bulk load's.
+    """
+    query = select(func.max(EVENTS.c.id))
+    if wallet_address is not None:
+        query = query.where(or_(EVENTS.c.wallet_address == wallet_address, EVENTS.c.wallet_address.is_(None)))
+    return session.execute(query).scalar() or 0
+
+
+def events_after(conn, last_id: int, limit: int) -> List:
+    return conn.execute(
+        select(EVENTS.c.id, EVENTS.c.kind, EVENTS.c.wallet_address, EVENTS.c.asset_id,
+               EVENTS.c.changes, EVENTS.c.stats)
+        .where(EVENTS.c.id > last_id).order_by(EVENTS.c.id).limit(limit)
+    ).all()
+
+
+def prune_events(session, cutoff: datetime) -> int:
+    """Retention: deletes events created before cutoff, always keeping the newest one."""
+    newest = latest_event_id(session)
+    result = session.execute(delete(EVENTS).where(EVENTS.c.created_at < cutoff, EVENTS.c.id < newest))
+    session.commit()
+    return result.rowcount
+
+
+def _json(value) -> str:
+    # SQLite hands back the stored JSON text, which is sent as-is
+    if isinstance(value, RawJSON):
+        return str(value)
+    return json.dumps(value, separators=(',', ':'))
+
+
+def format_event(row, wallet_address: Optional[str]) -> Optional[str]:
+    """
+    One SSE message for a stream following `wallet_address`: the asset
+    changes for its own assets, only the stats deltas for everyone else's
+    (None when there is nothing to send).
+    """
+    own = row.wallet_address is not None and row.wallet_address == wallet_address
+    stats = _json(row.stats)
+    if not own and row.wallet_address is not None and stats == '{}':
+        return None
+    data = f'{{"kind":"{row.kind}","asset_id":{_json(row.asset_id)},"stats":{stats}'
+    if own:
+        data += f',"asset":{_json(row.changes)}'
+    # Wallet-less events (bulk loads) ask the client to refetch its list too
+    if row.wallet_address is None:
+        data += ',"refetch":true'
+    return f'id: {row.id}\ndata: {data}}}\n\n'
+
+
+def reset_event(last_id: int) -> str:
+    return f'id: {last_id}\nevent: reset\ndata: {{}}\n\n'
+
+
+class EventHub:
+    """
+    One outbox poller per process, fanning new events out to subscribers.
+
+    A subscriber is a callable taking a list of rows; it is called on the
+    poller thread and must not block. The poller only runs queries while
+    there are subscribers.
+    """
+
+    def __init__(self, engine, poll_ms: float = 500, batch: int = 500):
+        self.engine = engine
+        self.poll_seconds = poll_ms / 1000.0
+        self.batch = batch
+        self.cursor: Optional[int] = None
+        self._subscribers: Dict[int, Callable] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        _hubs.add(self)
+
+    def subscribe(self, deliver: Callable[[List], None]) -> Tuple[int, int]:
+        """Registers `deliver`; returns (token, id of the newest event it will not be given)."""
+        with self._lock:
+            if self.cursor is None:
+                with self.engine.connect() as conn:
+                    self.cursor = latest_event_id(conn)
+            self._next_token += 1
+            self._subscribers[self._next_token] = deliver
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='event-hub', daemon=True)
+                self._thread.start()
+            return self._next_token, self.cursor
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+            if not self._subscribers:
+                # Nobody is listening: the next subscriber starts from the head again
+                self.cursor = None
+
+    def wake(self):
+        self._wakeup.set()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def poll(self) -> int:
+        """Delivers events after the cursor to every subscriber; returns how many."""
+        with self._lock:
+            if self.cursor is None or not self._subscribers:
+                return 0
+            delivered = 0
+            with self.engine.connect() as conn:
+                while True:
+                    rows = events_after(conn, self.cursor, self.batch)
+                    if not rows:
+                        break
+                    self.cursor = rows[-1].id
+                    delivered += len(rows)
+                    for deliver in list(self._subscribers.values()):
+                        deliver(rows)
+                    if len(rows) < self.batch:
+                        break
+            return delivered
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_seconds)
+            self._wakeup.clear()
+            try:
+                self.poll()
+            except Exception as e:
+                # Retried on the next tick from the same cursor
+                logger.warning("[EVENTS] outbox poll failed: %s", e)
+
+    def replay(self, last_id: int, limit: int) -> Optional[List]:
+        """Events after last_id, or None if some were pruned or there are more than `limit`."""
+        with self.engine.connect() as conn:
+            oldest = conn.execute(select(func.min(EVENTS.c.id))).scalar()
+            if oldest is not None and last_id + 1 < oldest:
+                return None
+            rows = events_after(conn, last_id, limit + 1)
+        return rows if len(rows) <= limit else None
+
+
+class EventStream:
+    """
+    One client's view of the hub: replay after Last-Event-ID, then live
+    events, each sent once and filtered for the client's wallet.
+    """
+
+    def __init__(self, hub: EventHub, wallet_address: Optional[str], last_id: Optional[int],
+                 replay_max: int = 1000, retry_ms: int = 3000):
+        self.hub = hub
+        self.wallet_address = wallet_address
+        self.last_id = last_id
+        self.replay_max = replay_max
+        self.retry_ms = retry_ms
+        self.sent = 0
+        self._token = None
+
+    def open(self, deliver: Callable[[List], None]) -> List[str]:
+        """Subscribes, then returns the first messages: retry interval and resume id, then the replay or a reset."""
+        # Subscribe before reading the replay, so nothing committed in between is missed
+        self._token, head = self.hub.subscribe(deliver)
+        if self.last_id is None:
+            self.sent = head
+            return [self._hello()]
+        rows = self.hub.replay(self.last_id, self.replay_max)
+        if rows is None:
+            self.sent = max(head, self.last_id)
+            return [self._hello(), reset_event(self.sent)]
+        self.sent = self.last_id
+        return [self._hello()] + self.render(rows)
+
+    def _hello(self) -> str:
+        # No data, so no event fires, but the browser resumes from this id
+        return f'retry: {self.retry_ms}\nid: {self.sent}\n\n'
+
+    def render(self, rows: Iterable) -> List[str]:
+        messages = []
+        for row in rows:
+            if row.id <= self.sent:
+                continue
+            self.sent = row.id
+            message = format_event(row, self.wallet_address)
+            if message:
+                messages.append(message)
+        return messages
+
+    def close(self):
+        if self._token is not None:
+            self.hub.unsubscribe(self._token)
+            self._token = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_hubs(session):
+    # Local writes reach this process's streams without waiting for the next poll
+    if session.info.pop(_LOCAL, False):
+        for hub in list(_hubs):
+            hub.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_local(session):
+    session.info.pop(_LOCAL, None)
@@ -0,0 +1,155 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import DateTime, Float, Integer, LargeBinary, select
+
+from app.models.database import User, Asset, Transaction
+from app.models.types import JSONDocument
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+TABLES = {
+    'users': User.__table__,
+    'assets': Asset.__table__,
+    'transactions': Transaction.__table__,
+}
+FORMATS = ('jsonl', 'csv', 'parquet')
+
+
+def iter_batches(engine, table, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                 batch_size: int = 5000) -> Iterator[List[tuple]]:
+    """
+    Streams a table in id order, batch_size rows at a time, on one
+    connection with a server-side cursor, so memory does not grow with the
+    table. JSON columns arrive as their stored text (no decode).
+    """
+    stmt = select(table).order_by(table.c.id)
+    if since is not None:
+        stmt = stmt.where(table.c.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(table.c.created_at < until)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+        for partition in result.partitions():
+            yield partition
+
+
+def _text(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class JSONLWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.columns = columns
+        self.json_columns = {c.name for c in columns if isinstance(c.type, JSONDocument)}
+
+    def write(self, rows):
+        names = [c.name for c in self.columns]
+        lines = []
+        for row in rows:
+            record = {}
+            for name, value in zip(names, row):
+                if name in self.json_columns and isinstance(value, str):
+                    value = json.loads(value)
+                elif isinstance(value, datetime):
+                    value = value.isoformat()
+                record[name] = value
+            lines.append(json.dumps(record, ensure_ascii=False))
+        self.file.write('\n'.join(lines) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+class CSVWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([c.name for c in columns])
+
+    def write(self, rows):
+        self.writer.writerows([_text(value) for value in row] for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(column.type, LargeBinary):
+        return pa.binary()
+    return pa.string()  # strings, text and JSON documents as text
+
+
+class ParquetWriter:
+    """Columnar output: each streamed batch becomes one Parquet row group."""
+
+    def __init__(self, path, columns):
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.columns = columns
+        self.schema = pa.schema([(c.name, _arrow_type(c)) for c in columns])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def write(self, rows):
+        arrays = []
+        for index, field in enumerate(self.schema):
+            values = [row[index] for row in rows]
+            if pa.types.is_string(field.type):
+                values = [_text(value) if value is not None else None for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {'jsonl': JSONLWriter, 'csv': CSVWriter, 'parquet': ParquetWriter}
+
+
+def export_table(engine, name: str, out_dir: str, fmt: str = 'jsonl', since=None, until=None,
+                 batch_size: int = 5000) -> Dict:
+    table = TABLES[name]
+    path = os.path.join(out_dir, f"{name}.{fmt}")
+    start = time.perf_counter()
+    rows = 0
+    writer = WRITERS[fmt](path, list(table.columns))
+    try:
+        for batch in iter_batches(engine, table, since, until, batch_size):
+            writer.write(batch)
+            rows += len(batch)
+    finally:
+        writer.close()
+    seconds = time.perf_counter() - start
+    return {'table': name, 'path': path, 'rows': rows, 'seconds': round(seconds, 3),
+            'rows_per_sec': round(rows / seconds, 1) if seconds else None}
+
+
+def export_tables(engine, names: List[str], out_dir: str, fmt: str = 'jsonl', since=None, until=None,
+                  batch_size: int = 5000, workers: int = 1) -> List[Dict]:
+    """Exports each table to its own file, up to `workers` tables at once."""
+    os.makedirs(out_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(export_table, engine, name, out_dir, fmt, since, until, batch_size)
+                   for name in names]
+        return [future.result() for future in futures]
@@ -0,0 +1,78 @@
+"""
+Unique ids for token ids and transaction hashes without a database
+round-trip per id.
+
+Each process leases a block of `block_size` sequence values from a named
+row in `id_sequence` (one short UPDATE transaction) and hands them out from
+memory with a counter. Leases never overlap, so values are unique across
+workers and restarts; values burned by a crash or a rolled-back mint are
+simply skipped. Each value is packed snowflake-style with the worker id in
+the low bits, so an id also tells which worker issued it.
+"""
+import os
+import threading
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models.database import IdSequence
+
+SEQUENCES = IdSequence.__table__
+WORKER_BITS = 10
+WORKER_MASK = (1 << WORKER_BITS) - 1
+
+
+class IdAllocator:
+    def __init__(self, engine, name: str = 'rwa', block_size: int = 1000):
+        self.engine = engine
+        self.name = name
+        self.block_size = block_size
+        self.leases = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # A forked worker must not keep handing out its parent's block
+        self._pid = os.getpid()
+        self.worker_id = self._pid & WORKER_MASK
+        self._next = self._end = 0
+
+    def _lease(self) -> Tuple[int, int]:
+        """Reserves [start, end) in the shared sequence."""
+        row = SEQUENCES.c.name == self.name
+        for _ in range(2):
+            try:
+                with self.engine.begin() as conn:
+                    # The UPDATE takes the write lock, so the read-back is ours alone
+                    if conn.execute(update(SEQUENCES).where(row).values(
+                            next_value=SEQUENCES.c.next_value + self.block_size,
+                            updated_at=datetime.utcnow())).rowcount:
+                        end = conn.execute(select(SEQUENCES.c.next_value).where(row)).scalar_one()
+                    else:
+                        end = 1 + self.block_size
+                        conn.execute(insert(SEQUENCES).values(name=self.name, next_value=end,
+                                                              updated_at=datetime.utcnow()))
+                self.leases += 1
+                return end - self.block_size, end
+            except IntegrityError:
+                continue  # another worker created the row first; lease from it
+        raise RuntimeError(f"Could not lease ids from sequence {self.name}")
+
+    def next_ids(self, count: int) -> List[int]:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            ids = []
+            while len(ids) < count:
+                if self._next >= self._end:
+                    self._next, self._end = self._lease()
+                take = min(count - len(ids), self._end - self._next)
+                ids.extend((sequence << WORKER_BITS) | self.worker_id
+                           for sequence in range(self._next, self._next + take))
+                self._next += take
+            return ids
+
+    def next_id(self) -> int:
+        return self.next_ids(1)[0]
@@ -0,0 +1,163 @@
+"""
+Content-addressed token metadata.
+
+Metadata is serialised canonically (sorted keys, no whitespace, non-ASCII
+escaped) and stored once per sha256 of those bytes; each tokenized asset
+records the hash of its metadata. Identical metadata is stored once however many tokens share it, and a
+token's metadata never changes, so served bodies can be cached forever (the
+hash doubles as the ETag).
+
+Bodies are deflated against a preset dictionary of the structure every
+token shares (trait names, URLs, asset types), which leaves little more
+than the per-asset values: ~100 bytes instead of ~400 with plain zlib. The
+first byte of a stored body names its codec, so the dictionary is frozen:
+a new one needs a new codec byte, and old bodies stay readable.
+"""
+import hashlib
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.database import Asset, TokenMetadata
+
+BODIES = TokenMetadata.__table__
+ASSETS = Asset.__table__
+# One encoder for every call: json.dumps with options builds a new one each time
+_CANONICAL = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
+
+CODEC_DEFLATE_V1 = b'\x01'
+# Frozen: never edit, add a new codec instead
+ZDICT_V1 = (
+    b'commodity equipment artwork vehicle real_estate Commodity Equipment Artwork Vehicle '
+    b'{"attributes":[{"trait_type":"Asset Type","value":"Real_Estate"},'
+    b'{"trait_type":"Estimated Value","value":"$0.00"},{"trait_type":"Location","value":""},'
+    b'{"trait_type":"Verification Status","value":"Verified"},'
+    b'{"trait_type":"Verification Score","value":"0.0%"},'
+    b'{"trait_type":"Token Standard","value":"RWA-721"},{"trait_type":"Network","value":"RWA-TestNet"},'
+    b'{"trait_type":"Tokenization Date","value":"2025-01-01"}],"description":"",'
+    b'"external_url":"https://rwa-marketplace.com/asset/0",'
+    b'"image":"https://via.placeholder.com/400x400.png?text=real_estate","name":"RWA Token - Real_Estate",'
+    b'"properties":{"category":"Real World Asset","fractional":false,"subcategory":"real_estate",'
+    b'"total_shares":0,"transferable":true}}'
+)
+
+
+def canonical_json(metadata: Dict) -> bytes:
+    return _CANONICAL.encode(metadata).encode()
+
+
+def content_hash(metadata: Dict) -> str:
+    return hashlib.sha256(canonical_json(metadata)).hexdigest()
+
+
+def hash_metadata(metadata: Dict) -> str:
+    """content_hash() that keeps the encoded body, so storing the token later does not encode it again."""
+    body = canonical_json(metadata)
+    digest = hashlib.sha256(body).hexdigest()
+    encoded_bodies.put(digest, body)
+    return digest
+
+
+def compress_body(body: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15, zdict=ZDICT_V1)
+    return CODEC_DEFLATE_V1 + compressor.compress(body) + compressor.flush()
+
+
+def decompress_body(stored: bytes) -> bytes:
+    if stored[:1] != CODEC_DEFLATE_V1:
+        raise ValueError(f"Unknown metadata codec {stored[:1]!r}")
+    decompressor = zlib.decompressobj(-15, zdict=ZDICT_V1)
+    return decompressor.decompress(stored[1:]) + decompressor.flush()
+
+
+def _insert_ignore(session):
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return sqlite_insert(BODIES).on_conflict_do_nothing(index_elements=['content_hash'])
+    if dialect == 'postgresql':
+        return pg_insert(BODIES).on_conflict_do_nothing(index_elements=['content_hash'])
+    raise NotImplementedError(f"metadata store not available for {dialect}")
+
+
+def store_metadata(session, tokens: Iterable[Tuple[str, Dict, Optional[str]]]) -> Dict[str, str]:
+    """
+    Stores the bodies of (token_id, metadata, metadata_hash) triples not
+    seen before, as one executemany, and returns token_id -> content hash for
+    the caller to record on the asset. The hash may be None; a body kept by
+    hash_metadata() is reused, anything else is encoded here. Like the other
+    write helpers, the commit is the caller's.
+    """
+    bodies: Dict[str, bytes] = {}
+    refs: Dict[str, str] = {}
+    for token_id, metadata, digest in tokens:
+        body = encoded_bodies.pop(digest) if digest else None
+        if body is None:
+            body = canonical_json(metadata)
+            digest = hashlib.sha256(body).hexdigest()
+        bodies.setdefault(digest, body)
+        refs[token_id] = digest
+    if not refs:
+        return refs
+    session.execute(_insert_ignore(session), [{'content_hash': digest, 'body': compress_body(body)}
+                                              for digest, body in bodies.items()])
+    return refs
+
+
+class MetadataCache:
+    """Bounded LRU; keys name immutable content, so entries never go stale."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str):
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# token_id -> (content hash, canonical JSON bytes), for /metadata
+metadata_cache = MetadataCache()
+# content hash -> canonical JSON bytes of minted but not yet stored metadata
+encoded_bodies = MetadataCache()
+
+
+def load_metadata(session, token_id: str) -> Optional[Tuple[str, bytes]]:
+    """(content hash, canonical JSON bytes) for a token, or None. Hits are cached; misses are not."""
+    entry = metadata_cache.get(token_id)
+    if entry is not None:
+        return entry
+    row = session.execute(
+        select(BODIES.c.content_hash, BODIES.c.body)
+        .join(ASSETS, ASSETS.c.metadata_hash == BODIES.c.content_hash)
+        .where(ASSETS.c.token_id == token_id)
+    ).first()
+    if row is None:
+        return None
+    entry = (row.content_hash, decompress_body(row.body))
+    metadata_cache.put(token_id, entry)
+    return entry
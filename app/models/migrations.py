@@ -0,0 +1,404 @@
+"""
+Versioned schema migrations for the models in app/models/database.py.
+
+Each migration has an upgrade and a downgrade step and is applied in its own
+transaction together with its row in `schema_migration`, so a failed step
+leaves the schema at the previous version. Steps are written to be idempotent
+because db.create_all() may already have created new tables and indexes.
+"""
+import json
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import inspect, select, text
+
+from app.models.database import (db, User, Asset, Transaction, TransactionArchive, IdSequence, TokenMetadata,
+                                 AssetEvent, PENDING_TRANSACTION)
+
+LEGACY_INDEXES = [
+    'idx_assets_user_id',
+    'idx_assets_verification_status',
+    'idx_assets_token_id',
+    'idx_transactions_asset_id',
+    'idx_transactions_type',
+    'idx_users_wallet',
+]
+
+
+class Migration:
+    def __init__(self, version: int, description: str,
+                 upgrade: Callable, downgrade: Callable):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+        self.downgrade = downgrade
+
+
+def _model_indexes(*models):
+    return [index for model in models for index in model.__table__.indexes]
+
+
+def _baseline_upgrade(conn):
+    db.metadata.create_all(conn, tables=[User.__table__, Asset.__table__, Transaction.__table__])
+
+
+def _baseline_downgrade(conn):
+    # The baseline tables hold all data; rolling back past them is not supported.
+    raise RuntimeError("Cannot downgrade below the baseline schema")
+
+
+def _indexes_upgrade(conn):
+    for name in LEGACY_INDEXES:
+        conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+    for index in _model_indexes(Asset, Transaction):
+        index.create(conn, checkfirst=True)
+
+
+def _indexes_downgrade(conn):
+    for index in _model_indexes(Asset, Transaction):
+        index.drop(conn, checkfirst=True)
+
+
+def _column_names(conn, table):
+    return {column['name'] for column in inspect(conn).get_columns(table)}
+
+
+def _add_column(conn, table, column):
+    """ALTER TABLE ADD COLUMN for a model column, skipped if create_all already added it."""
+    if column.name not in _column_names(conn, table):
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column.name} {column_type}'))
+
+
+def _drop_column(conn, table, name):
+    if name in _column_names(conn, table):
+        conn.execute(text(f'ALTER TABLE {table} DROP COLUMN {name}'))
+
+
+def _verification_snapshot_upgrade(conn):
+    _add_column(conn, 'asset', Asset.__table__.c.verifier_version)
+    _add_column(conn, 'asset', Asset.__table__.c.verification_tx_id)
+    # Point existing assets at their newest verification record
+    conn.execute(text(
+        'UPDATE asset SET verification_tx_id = ('
+        ' SELECT t.id FROM "transaction" t'
+        " WHERE t.asset_id = asset.id AND t.transaction_type = 'verification'"
+        ' ORDER BY t.created_at DESC, t.id DESC LIMIT 1'
+        ') WHERE verification_tx_id IS NULL'
+    ))
+
+
+def _verification_snapshot_downgrade(conn):
+    _drop_column(conn, 'asset', 'verification_tx_id')
+    _drop_column(conn, 'asset', 'verifier_version')
+
+
+JSON_COLUMNS = [('asset', 'requirements'), ('asset', 'verification_breakdown'), ('transaction', 'details')]
+
+
+def _json_columns_upgrade(conn):
+    for table, column in JSON_COLUMNS:
+        if conn.dialect.name == 'postgresql':
+            conn.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb'))
+        elif conn.dialect.name == 'sqlite':
+            # JSON1 stores documents as TEXT; keep any non-JSON legacy text as a JSON string
+            conn.execute(text(
+                f'UPDATE "{table}" SET {column} = json_quote({column})'
+                f' WHERE {column} IS NOT NULL AND NOT json_valid({column})'
+            ))
+
+
+def _json_columns_downgrade(conn):
+    if conn.dialect.name == 'postgresql':
+        for table, column in JSON_COLUMNS:
+            conn.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN {column} TYPE TEXT USING {column}::text'))
+
+
+def _archive_upgrade(conn):
+    TransactionArchive.__table__.create(conn, checkfirst=True)
+
+
+def _archive_downgrade(conn):
+    # Move archived rows back into the hot table before dropping the archive
+    archive = TransactionArchive.__table__
+    if not inspect(conn).has_table(archive.name):
+        return
+    rows = conn.execute(select(archive)).all()
+    if rows:
+        conn.execute(Transaction.__table__.insert(), [{
+            'id': row.id,
+            'asset_id': row.asset_id,
+            'transaction_type': row.transaction_type,
+            'transaction_hash': row.transaction_hash,
+            'status': row.status,
+            'details': json.loads(zlib.decompress(row.payload)) if row.payload else None,
+            'created_at': row.created_at,
+        } for row in rows])
+    archive.drop(conn)
+
+
+# External-content FTS5 index over asset text, kept in sync by triggers.
+# prefix='2 3' adds prefix indexes so short prefix queries ("ban*") stay fast.
+ASSET_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS asset_fts USING fts5("
+    "description, location, asset_type, content='asset', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_insert AFTER INSERT ON asset BEGIN"
+    " INSERT INTO asset_fts(rowid, description, location, asset_type)"
+    " VALUES (new.id, new.description, new.location, new.asset_type); END",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_delete AFTER DELETE ON asset BEGIN"
+    " INSERT INTO asset_fts(asset_fts, rowid, description, location, asset_type)"
+    " VALUES ('delete', old.id, old.description, old.location, old.asset_type); END",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_update AFTER UPDATE OF description, location, asset_type"
+    " ON asset BEGIN"
+    " INSERT INTO asset_fts(asset_fts, rowid, description, location, asset_type)"
+    " VALUES ('delete', old.id, old.description, old.location, old.asset_type);"
+    " INSERT INTO asset_fts(rowid, description, location, asset_type)"
+    " VALUES (new.id, new.description, new.location, new.asset_type); END",
+]
+
+
+def _asset_fts_upgrade(conn):
+    # FTS5 is SQLite-only; other databases have no search index yet
+    if conn.dialect.name != 'sqlite':
+        return
+    for statement in ASSET_FTS_DDL:
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql("INSERT INTO asset_fts(asset_fts) VALUES ('rebuild')")
+
+
+def _asset_fts_downgrade(conn):
+    if conn.dialect.name != 'sqlite':
+        return
+    for trigger in ('asset_fts_insert', 'asset_fts_delete', 'asset_fts_update'):
+        conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger}')
+    conn.exec_driver_sql('DROP TABLE IF EXISTS asset_fts')
+
+
+def _index(model, name):
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+def _asset_updated_index_upgrade(conn):
+    _index(Asset, 'ix_asset_updated').create(conn, checkfirst=True)
+
+
+def _asset_updated_index_downgrade(conn):
+    _index(Asset, 'ix_asset_updated').drop(conn, checkfirst=True)
+
+
+def _id_sequence_upgrade(conn):
+    IdSequence.__table__.create(conn, checkfirst=True)
+
+
+def _id_sequence_downgrade(conn):
+    IdSequence.__table__.drop(conn, checkfirst=True)
+
+
+def _token_metadata_upgrade(conn):
+    TokenMetadata.__table__.create(conn, checkfirst=True)
+    _add_column(conn, 'asset', Asset.__table__.c.metadata_hash)
+
+
+def _token_metadata_downgrade(conn):
+    _drop_column(conn, 'asset', 'metadata_hash')
+    TokenMetadata.__table__.drop(conn, checkfirst=True)
+
+
+def _asset_event_upgrade(conn):
+    AssetEvent.__table__.create(conn, checkfirst=True)
+
+
+def _asset_event_downgrade(conn):
+    AssetEvent.__table__.drop(conn, checkfirst=True)
+
+
+def _transaction_pending_index_upgrade(conn):
+    _index(Transaction, 'ix_transaction_pending').create(conn, checkfirst=True)
+
+
+def _transaction_pending_index_downgrade(conn):
+    _index(Transaction, 'ix_transaction_pending').drop(conn, checkfirst=True)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'baseline user/asset/transaction tables', _baseline_upgrade, _baseline_downgrade),
+    Migration(2, 'composite and partial indexes for hot queries', _indexes_upgrade, _indexes_downgrade),
+    Migration(3, 'latest-verification snapshot on asset', _verification_snapshot_upgrade,
+              _verification_snapshot_downgrade),
+    Migration(4, 'native JSON columns (JSON1 / JSONB)', _json_columns_upgrade, _json_columns_downgrade),
+    Migration(5, 'compressed transaction archive table', _archive_upgrade, _archive_downgrade),
+    Migration(6, 'FTS5 full-text index over asset text', _asset_fts_upgrade, _asset_fts_downgrade),
+    Migration(7, 'asset updated_at index for incremental analytics', _asset_updated_index_upgrade,
+              _asset_updated_index_downgrade),
+    Migration(8, 'id_sequence table for leased token/transaction id blocks', _id_sequence_upgrade,
+              _id_sequence_downgrade),
+    Migration(9, 'content-addressed token metadata store', _token_metadata_upgrade, _token_metadata_downgrade),
+    Migration(10, 'asset_event outbox for pushed dashboard updates', _asset_event_upgrade, _asset_event_downgrade),
+    Migration(11, 'partial index of pending chain transactions', _transaction_pending_index_upgrade,
+              _transaction_pending_index_downgrade),
+]
+
+HEAD = MIGRATIONS[-1].version
+
+
+def _ensure_version_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_migration ('
+            'version INTEGER PRIMARY KEY, description VARCHAR(200), applied_at TIMESTAMP)'
+        ))
+
+
+def _lock(conn):
+    """Serialises concurrent runners (e.g. several gunicorn workers starting at once)."""
+    if conn.dialect.name == 'sqlite':
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+    elif conn.dialect.name == 'postgresql':
+        conn.execute(text('LOCK TABLE schema_migration IN EXCLUSIVE MODE'))
+
+
+def _version(conn) -> int:
+    return conn.execute(text('SELECT COALESCE(MAX(version), 0) FROM schema_migration')).scalar()
+
+
+def current_version(engine) -> int:
+    _ensure_version_table(engine)
+    with engine.connect() as conn:
+        return _version(conn)
+
+
+def upgrade(engine, target: Optional[int] = None) -> List[int]:
+    """Applies pending migrations up to `target` (default: head). Returns applied versions."""
+    _ensure_version_table(engine)
+    target = HEAD if target is None else target
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version > target:
+            break
+        with engine.connect() as conn:
+            _lock(conn)
+            if _version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            migration.upgrade(conn)
+            conn.execute(
+                text('INSERT INTO schema_migration (version, description, applied_at) VALUES (:v, :d, :t)'),
+                {'v': migration.version, 'd': migration.description, 't': datetime.utcnow()}
+            )
+            conn.commit()
+        applied.append(migration.version)
+    if applied:
+        # Model tables only: stats taken on the (empty) FTS5 shadow tables
+        # mislead the planner for FTS5's own queries and make inserts slow down
+        # as the index grows.
+        with engine.begin() as conn:
+            existing = inspect(conn)
+            for table in (User, Asset, Transaction, TransactionArchive):
+                if existing.has_table(table.__tablename__):
+                    conn.execute(text(f'ANALYZE "{table.__tablename__}"'))
+    return applied
+
+
+def downgrade(engine, target: int) -> List[int]:
+    """Rolls back applied migrations newer than `target`. Returns rolled-back versions."""
+    _ensure_version_table(engine)
+    rolled_back = []
+    for migration in reversed(MIGRATIONS):
+        if migration.version <= target:
+            break
+        with engine.connect() as conn:
+            _lock(conn)
+            if _version(conn) < migration.version:
+                conn.rollback()
+                continue
+            migration.downgrade(conn)
+            conn.execute(text('DELETE FROM schema_migration WHERE version = :v'), {'v': migration.version})
+            conn.commit()
+        rolled_back.append(migration.version)
+    return rolled_back
+
+
+# Hot queries and the index each one must be served by. Built lazily so the
+# statements use the current model definitions.
+HOT_QUERIES: Dict[str, tuple] = {
+    'latest_verification_for_asset': (
+        lambda: select(Transaction).filter_by(asset_id=1, transaction_type='verification')
+        .order_by(Transaction.created_at.desc()).limit(1),
+        'ix_transaction_asset_type_created',
+    ),
+    'asset_history': (
+        lambda: select(Transaction).filter_by(asset_id=1).order_by(Transaction.created_at.desc()),
+        'ix_transaction_asset_created',
+    ),
+    'assets_by_user': (
+        lambda: select(Asset).filter_by(user_id=1).order_by(Asset.created_at.desc()),
+        'ix_asset_user_created',
+    ),
+    'verified_asset_count': (
+        lambda: select(db.func.count()).select_from(Asset).filter_by(verification_status='verified'),
+        'ix_asset_status',
+    ),
+    'tokenized_asset_count': (
+        lambda: select(db.func.count()).select_from(Asset).filter(Asset.token_id.isnot(None)),
+        'ix_asset_tokenized',
+    ),
+    'latest_event_for_wallet': (
+        lambda: select(db.func.max(AssetEvent.id)).filter_by(wallet_address='0x0'),
+        'ix_asset_event_wallet',
+    ),
+    'pending_chain_transactions': (
+        lambda: select(Transaction.id, Transaction.transaction_hash).where(text(PENDING_TRANSACTION)),
+        'ix_transaction_pending',
+    ),
+    'user_by_wallet': (
+        lambda: select(User).filter_by(wallet_address='0x0'),
+        'sqlite_autoindex_user_1',
+    ),
+}
+
+
+def explain(engine, name: str) -> List[str]:
+    """Returns the SQLite EXPLAIN QUERY PLAN detail lines for a hot query."""
+    build, _ = HOT_QUERIES[name]
+    compiled = build().compile(dialect=engine.dialect)
+    params = tuple(compiled.params[key] for key in compiled.positiontup)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).all()
+    return [row[-1] for row in rows]
+
+
+def check_query_plans(engine) -> Dict[str, dict]:
+    """Checks every hot query uses its index without a temp B-tree sort (SQLite only)."""
+    report = {}
+    for name, (_, index_name) in HOT_QUERIES.items():
+        plan = explain(engine, name)
+        uses_index = any(index_name in line for line in plan)
+        sorts = any('TEMP B-TREE' in line for line in plan)
+        report[name] = {'index': index_name, 'plan': plan, 'ok': uses_index and not sorts}
+    return report
+
+
+def verify(engine) -> List[str]:
+    """Returns a list of problems: pending migrations, missing indexes, bad query plans."""
+    problems = []
+    version = current_version(engine)
+    if version != HEAD:
+        problems.append(f'schema at version {version}, head is {HEAD}')
+    inspector = inspect(engine)
+    for index in _model_indexes(User, Asset, Transaction, TransactionArchive, AssetEvent):
+        if not inspector.has_table(index.table.name):
+            problems.append(f'missing table {index.table.name}')
+            continue
+        existing = {i['name'] for i in inspector.get_indexes(index.table.name)}
+        if index.name not in existing:
+            problems.append(f'missing index {index.name} on {index.table.name}')
+    if engine.dialect.name == 'sqlite' and version >= 6 and not inspector.has_table('asset_fts'):
+        problems.append('missing full-text index asset_fts')
+    # Query plans are only meaningful against the schema the models describe
+    if engine.dialect.name == 'sqlite' and version == HEAD:
+        for name, result in check_query_plans(engine).items():
+            if not result['ok']:
+                problems.append(f"query {name} not served by {result['index']}: {result['plan']}")
+    return problems
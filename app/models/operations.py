@@ -0,0 +1,190 @@
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, insert, select, text, update
+
+from app.models.database import Asset, Transaction, User, PENDING_TRANSACTION
+from app.models.events import record_event, record_events, VERIFIED_FIELDS, TOKENIZED_FIELDS
+from app.models.metadata_store import store_metadata
+from app.models.user_cache import get_or_create_user
+
+
+# Write paths for the intake -> verify -> tokenize pipeline. Each function takes
+# a Session, only adds/flushes, and leaves the commit to the caller so a whole
+# request is one unit of work (or one slot in a group commit). Every asset
+# change also records its outbox event (app/models/events.py) in that unit.
+
+def create_asset(session, wallet_address: str, email: str, parsed_data: Dict, user_input: str) -> Dict:
+    # Cached wallets cost no query; the asset INSERT is the only round-trip
+    user_id, new_user = get_or_create_user(session, wallet_address, email)
+    asset = Asset(
+        user_id=user_id,
+        asset_type=parsed_data.get('asset_type', 'unknown'),
+        description=parsed_data.get('description', user_input),
+        estimated_value=parsed_data.get('estimated_value', 0),
+        location=parsed_data.get('location', 'unknown'),
+        verification_status='requires_review',
+        requirements={}
+    )
+    session.add(asset)
+    session.flush()
+    asset_dict = asset.to_dict()
+    record_event(session, 'asset.created', wallet_address, asset.id, asset_dict,
+                 {'total_assets': 1, 'total_users': int(new_user)})
+    return asset_dict
+
+
+def record_verification(session, asset_id: int, verification_result: Dict) -> Dict:
+    asset = session.get(Asset, asset_id)
+    was_verified = asset.verification_status == 'verified'
+    asset.verification_status = verification_result['status']
+    asset.verification_score = verification_result.get('overall_score')
+    asset.verification_breakdown = verification_result.get('breakdown', {})
+    asset.llm_comments = verification_result.get('llm_comments', '')
+    asset.verifier_version = verification_result.get('verifier_version')
+    asset.updated_at = datetime.utcnow()
+    transaction = Transaction(
+        asset_id=asset.id,
+        transaction_type='verification',
+        status=verification_result['status'],
+        details=verification_result
+    )
+    session.add(transaction)
+    session.flush()
+    asset.verification_tx_id = transaction.id
+    session.flush()
+    asset_dict = asset.to_dict()
+    verified = (asset.verification_status == 'verified') - was_verified
+    record_event(session, 'asset.verified', asset.user.wallet_address, asset.id,
+                 {key: asset_dict[key] for key in VERIFIED_FIELDS},
+                 {'verified_assets': verified} if verified else {})
+    return asset_dict
+
+
+def _without_metadata(result: Dict) -> Dict:
+    # Metadata lives in the content-addressed store; history keeps its hash
+    return {key: value for key, value in result.items() if key != 'metadata'}
+
+
+def _transaction_status(result: Dict) -> str:
+    # Submitted to the chain but not yet in a block when the response was built
+    return 'pending' if result.get('status') == 'pending' else 'completed'
+
+
+def confirm_chain_transactions(session, receipt: Callable[[str], Optional[Dict]]) -> int:
+    """
+    Marks pending history rows 'completed' once `receipt(transaction_hash)`
+    has their chain transaction in a block; returns how many rows changed.
+    """
+    hashes = set(session.execute(
+        select(Transaction.transaction_hash).where(text(PENDING_TRANSACTION))
+    ).scalars())
+    mined = [tx_hash for tx_hash in hashes if receipt(tx_hash)]
+    if not mined:
+        return 0
+    return session.execute(
+        update(Transaction.__table__)
+        .where(text(PENDING_TRANSACTION), Transaction.__table__.c.transaction_hash.in_(mined))
+        .values(status='completed')
+    ).rowcount
+
+
+def record_tokenization(session, asset_id: int, tokenization_result: Dict) -> Dict:
+    asset = session.get(Asset, asset_id)
+    if asset.token_id is not None:
+        # Checked again inside the write: a concurrent request may have won
+        raise ValueError(f"Asset {asset_id} is already tokenized")
+    token_id = tokenization_result["token_id"]
+    hashes = store_metadata(session, [(token_id, tokenization_result["metadata"],
+                                       tokenization_result.get("metadata_hash"))])
+    asset.token_id = token_id
+    asset.metadata_hash = hashes[token_id]
+    asset.updated_at = datetime.utcnow()
+    session.add(Transaction(
+        asset_id=asset.id,
+        transaction_type='tokenization',
+        transaction_hash=tokenization_result["transaction_hash"],
+        status=_transaction_status(tokenization_result),
+        details=_without_metadata(tokenization_result)
+    ))
+    session.flush()
+    asset_dict = asset.to_dict()
+    # Counted once per asset: token_id was NULL (checked above)
+    record_event(session, 'asset.tokenized', asset.user.wallet_address, asset.id,
+                 {key: asset_dict[key] for key in TOKENIZED_FIELDS}, {'tokenized_assets': 1})
+    return asset_dict
+
+
+def record_tokenization_batch(session, batch_result: Dict) -> List[int]:
+    """
+    Persists a tokenize_batch result with one executemany INSERT of new
+    metadata bodies, one executemany UPDATE of the assets and one executemany
+    INSERT of their tokenization transactions. Assets that were tokenized
+    concurrently make the whole batch fail and roll back, so a token is never
+    minted twice. Returns the tokenized asset ids.
+    """
+    tokens = batch_result['tokens']
+    status = _transaction_status(batch_result)
+    now = datetime.utcnow()
+    assets = Asset.__table__
+    hashes = store_metadata(session, [(token['token_id'], token['metadata'], token.get('metadata_hash'))
+                                      for token in tokens])
+    updated = session.execute(
+        update(assets)
+        .where(assets.c.id == bindparam('b_asset_id'), assets.c.token_id.is_(None))
+        .values(token_id=bindparam('b_token_id'), metadata_hash=bindparam('b_metadata_hash'), updated_at=now),
+        [{'b_asset_id': token['asset_id'], 'b_token_id': token['token_id'],
+          'b_metadata_hash': hashes[token['token_id']]} for token in tokens]
+    ).rowcount
+    if updated != len(tokens):
+        raise ValueError(f"{len(tokens) - updated} assets in the batch are already tokenized")
+    session.execute(insert(Transaction.__table__), [{
+        'asset_id': token['asset_id'],
+        'transaction_type': 'tokenization',
+        # The chain transaction carrying the batch; the Merkle root stays in details
+        'transaction_hash': token.get('chain_tx_hash') or token['transaction_hash'],
+        'status': status,
+        'details': _without_metadata(token),
+        'created_at': now,
+    } for token in tokens])
+    wallets = dict(session.execute(
+        select(Asset.id, User.wallet_address).join(User)
+        .where(Asset.id.in_([token['asset_id'] for token in tokens]))
+    ).all())
+    record_events(session, [{
+        'kind': 'asset.tokenized',
+        'wallet_address': wallets.get(token['asset_id']),
+        'asset_id': token['asset_id'],
+        'changes': {'token_id': token['token_id'], 'updated_at': now.isoformat()},
+        'stats': {'tokenized_assets': 1},
+    } for token in tokens])
+    return [token['asset_id'] for token in tokens]
+
+
+def record_transfer(session, asset_id: int, transfer_result: Dict) -> Dict:
+    # Ownership itself lives in the ledger; this is the asset's history entry
+    transaction = Transaction(
+        asset_id=asset_id,
+        transaction_type='transfer',
+        transaction_hash=transfer_result['transaction_hash'],
+        status=_transaction_status(transfer_result),
+        details=transfer_result
+    )
+    session.add(transaction)
+    session.flush()
+    return transaction.to_dict()
+
+
+def record_share_transfers(session, asset_ids: Dict[str, int], transfer_result: Dict) -> int:
+    """One 'share_transfer' history row per move of a batch, in one executemany INSERT."""
+    now = datetime.utcnow()
+    rows = [{
+        'asset_id': asset_ids[move['token_id']],
+        'transaction_type': 'share_transfer',
+        'transaction_hash': transfer_result['transaction_hash'],
+        'status': 'completed',
+        'details': dict(move, ledger_seq=transfer_result['ledger_seq']),
+        'created_at': now,
+    } for move in transfer_result['transfers']]
+    session.execute(insert(Transaction.__table__), rows)
+    return len(rows)
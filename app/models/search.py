@@ -0,0 +1,97 @@
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+
+from app.models.database import Asset
+
+# bm25 column weights: description, location, asset_type
+BM25_WEIGHTS = (10.0, 4.0, 2.0)
+TOKEN = re.compile(r'\w+\*?')
+
+
+def build_match(query: str) -> Optional[str]:
+    """
+    User text -> FTS5 MATCH expression. Every word must match (implicit AND);
+    a trailing `*` makes it a prefix query. Words are quoted so FTS5 operators
+    and punctuation in the input cannot cause syntax errors.
+    """
+    terms = []
+    for token in TOKEN.findall(query):
+        word, prefix = token.rstrip('*'), token.endswith('*')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return ' '.join(terms) or None
+
+
+def encode_cursor(hit: Dict, floor: int) -> str:
+    return f"{hit['score']!r}|{hit['id']}|{floor}"
+
+
+def decode_cursor(cursor: str):
+    score, asset_id, floor = cursor.split('|')
+    return float(score), int(asset_id), int(floor)
+
+
+def _candidate_floor(session, match: str, max_candidates: int) -> int:
+    """Smallest rowid among the newest `max_candidates` matches (0 when there are fewer)."""
+    floor = session.execute(text(
+        'SELECT rowid FROM asset_fts WHERE asset_fts MATCH :match'
+        ' ORDER BY rowid DESC LIMIT 1 OFFSET :offset'
+    ), {'match': match, 'offset': max_candidates - 1}).scalar()
+    return floor or 0
+
+
+def search_assets(session, query: str, status: Optional[str] = None, asset_type: Optional[str] = None,
+                  limit: int = 20, cursor: Optional[str] = None, max_candidates: int = 5000) -> Dict:
+    """
+    Ranked full-text search over asset description, location and type.
+
+    Results are ordered by bm25 score (lower is better), then id, and paged
+    with a keyset cursor on that pair. bm25 has to score every match, so only
+    the newest `max_candidates` matches are ranked: a term that matches half
+    the table costs the same as a rare one. The cursor pins that window so
+    pages stay consistent while new assets arrive.
+    """
+    match = build_match(query)
+    if match is None:
+        return {'results': [], 'next_cursor': None}
+    if cursor:
+        after_score, after_id, floor = decode_cursor(cursor)
+    else:
+        floor = _candidate_floor(session, match, max_candidates)
+    conditions = ['asset_fts MATCH :match', 'asset_fts.rowid >= :floor']
+    params = {'match': match, 'floor': floor, 'limit': limit + 1}
+    if status:
+        conditions.append('asset.verification_status = :status')
+        params['status'] = status
+    if asset_type:
+        conditions.append('asset.asset_type = :asset_type')
+        params['asset_type'] = asset_type
+    score = 'bm25(asset_fts, {}, {}, {})'.format(*BM25_WEIGHTS)
+    after = ''
+    if cursor:
+        params.update(after_score=after_score, after_id=after_id)
+        after = ' WHERE score > :after_score OR (score = :after_score AND id > :after_id)'
+    # Only join asset when a filter needs it
+    source = 'asset_fts JOIN asset ON asset.id = asset_fts.rowid' if status or asset_type else 'asset_fts'
+    rows = session.execute(text(
+        f'SELECT id, score FROM ('
+        f' SELECT asset_fts.rowid AS id, {score} AS score FROM {source}'
+        f' WHERE {" AND ".join(conditions)}'
+        f'){after} ORDER BY score, id LIMIT :limit'
+    ), params).all()
+
+    page = rows[:limit]
+    ids = [row.id for row in page]
+    assets = {asset.id: asset for asset in session.query(Asset).filter(Asset.id.in_(ids))}
+    # Snippets only for the rows on this page
+    snippets = dict(session.execute(
+        text("SELECT rowid, snippet(asset_fts, 0, '[', ']', '…', 12) FROM asset_fts"
+             " WHERE asset_fts MATCH :match AND rowid IN :ids").bindparams(bindparam('ids', expanding=True)),
+        {'match': match, 'ids': ids}
+    ).all())
+    results: List[Dict] = [dict(assets[row.id].to_dict(), score=row.score, snippet=snippets.get(row.id))
+                           for row in page]
+    next_cursor = encode_cursor(results[-1], floor) if len(rows) > limit else None
+    return {'results': results, 'next_cursor': next_cursor}
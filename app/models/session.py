@@ -0,0 +1,115 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def unit_of_work(session):
+    """
+    Runs a request's writes as a single transaction: one commit on success,
+    rollback on any error. Use session.flush() inside the block when a
+    generated id is needed before the end of the unit.
+    """
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+class GroupCommitWriter:
+    """
+    Background writer that merges write units submitted by concurrent
+    requests into one database commit.
+
+    Each unit is a callable taking a Session. Units collected within
+    `window_ms` (up to `max_batch`) run in a single transaction, each inside
+    its own SAVEPOINT so a failing unit only rolls back itself. The batch is
+    then committed once and every caller's future is resolved with the value
+    its unit returned.
+    """
+
+    def __init__(self, engine, window_ms: float = 5.0, max_batch: int = 64):
+        self.engine = engine
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[Callable[[Session], Any], Future]]" = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, work: Callable[[Session], Any]) -> Future:
+        if self._stopped.is_set():
+            raise RuntimeError("GroupCommitWriter is stopped")
+        future: Future = Future()
+        self._queue.put((work, future))
+        return future
+
+    def run(self, work: Callable[[Session], Any], timeout: float = 30.0) -> Any:
+        """Submits a unit and blocks until the batch containing it is committed."""
+        return self.submit(work).result(timeout=timeout)
+
+    def stop(self, timeout: float = 5.0):
+        self._stopped.set()
+        self._thread.join(timeout)
+
+    def _collect(self) -> List[Tuple[Callable[[Session], Any], Future]]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._stopped.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if batch:
+                self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        results = []
+        session = Session(self.engine, expire_on_commit=False)
+        try:
+            if self.engine.dialect.name == "sqlite":
+                # pysqlite does not emit BEGIN before a SAVEPOINT, which would make
+                # every RELEASE a commit; open the transaction explicitly.
+                session.execute(text("BEGIN IMMEDIATE"))
+            for work, future in batch:
+                try:
+                    with session.begin_nested():
+                        results.append((future, work(session), None))
+                except Exception as e:
+                    results.append((future, None, e))
+            session.commit()
+        except Exception as e:
+            logger.error(f"[GROUP COMMIT ERROR] {e}")
+            session.rollback()
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            session.close()
+        for future, value, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
@@ -0,0 +1,74 @@
+import json
+
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.types import TypeDecorator
+
+
+class RawJSON(str):
+    """JSON text loaded from SQLite and not decoded yet."""
+
+
+class JSONDocument(TypeDecorator):
+    """
+    JSON column stored with SQLite JSON1 (TEXT) or Postgres JSONB.
+
+    Supports server-side JSON-path expressions (`column['key'].as_float()`).
+    On SQLite, loaded values are returned as RawJSON and only decoded by the
+    model attribute that wraps the column (see lazy_json), so rows that are
+    fetched but never serialised skip json.loads entirely.
+    """
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(JSON(none_as_null=True))
+
+    def bind_processor(self, dialect):
+        serialize = self.load_dialect_impl(dialect).bind_processor(dialect)
+
+        def process(value):
+            if isinstance(value, RawJSON):
+                # Unchanged value written back as-is, never re-encoded
+                return str(value)
+            return serialize(value) if serialize else value
+        return process
+
+    def result_processor(self, dialect, coltype):
+        if dialect.name == 'sqlite':
+            return lambda value: RawJSON(value) if value is not None else None
+        return self.load_dialect_impl(dialect).result_processor(dialect, coltype)
+
+
+def decode_json(value):
+    if isinstance(value, RawJSON):
+        return json.loads(value)
+    return value
+
+
+def lazy_json(column_attr: str):
+    """
+    Public attribute over a JSONDocument column mapped as `column_attr`.
+
+    Instance access decodes the stored text on first use and caches the
+    result as the committed value (no dirty flag, no re-encode on flush).
+    Class access returns the column so JSON-path filters work in queries.
+    """
+    def fget(self):
+        value = getattr(self, column_attr)
+        if isinstance(value, RawJSON):
+            value = json.loads(value)
+            set_committed_value(self, column_attr, value)
+        return value
+
+    def fset(self, value):
+        setattr(self, column_attr, value)
+
+    def expr(cls):
+        return getattr(cls, column_attr)
+
+    return hybrid_property(fget, fset, expr=expr)
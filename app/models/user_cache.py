@@ -0,0 +1,137 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, scoped_session
+
+from app.models.database import User
+
+_PENDING = 'wallet_cache_pending'
+_caches = weakref.WeakSet()
+
+
+class WalletCache:
+    """
+    Bounded LRU of wallet_address -> User.id for the intake path.
+
+    Entries are only published when the transaction that read them commits,
+    and are dropped when a User row is updated or deleted in this process.
+    Users are never deleted by the app, so other workers' entries stay valid.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    def get(self, wallet_address: str) -> Optional[int]:
+        with self._lock:
+            user_id = self._entries.get(wallet_address)
+            if user_id is not None:
+                self._entries.move_to_end(wallet_address)
+            return user_id
+
+    def put(self, wallet_address: str, user_id: int):
+        with self._lock:
+            self._entries[wallet_address] = user_id
+            self._entries.move_to_end(wallet_address)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, wallet_address: str):
+        with self._lock:
+            self._entries.pop(wallet_address, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+wallet_cache = WalletCache()
+
+
+def _insert_ignore(session, wallet_address: str, email: Optional[str]) -> Optional[int]:
+    """INSERT ... ON CONFLICT DO NOTHING; returns the new id, or None if the wallet exists."""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(User)
+    elif dialect == 'postgresql':
+        stmt = pg_insert(User)
+    else:
+        raise NotImplementedError(f"insert-or-ignore not available for {dialect}")
+    stmt = stmt.values(wallet_address=wallet_address, email=email) \
+        .on_conflict_do_nothing(index_elements=['wallet_address']) \
+        .returning(User.id)
+    return session.execute(stmt).scalar()
+
+
+def get_or_create_user(session, wallet_address: str, email: Optional[str] = None,
+                       cache: Optional[WalletCache] = wallet_cache) -> Tuple[int, bool]:
+    """
+    Resolves a wallet to (user id, created). A cache hit costs no queries; a
+    known wallet costs one SELECT; a new wallet costs one INSERT, and
+    concurrent intakes for the same new wallet cannot raise IntegrityError.
+    """
+    if isinstance(session, scoped_session):
+        session = session()
+    if cache is not None:
+        user_id = cache.get(wallet_address)
+        if user_id is not None:
+            return user_id, False
+    created = False
+    user_id = session.execute(select(User.id).filter_by(wallet_address=wallet_address)).scalar()
+    if user_id is None:
+        user_id = _insert_ignore(session, wallet_address, email)
+        created = user_id is not None
+        if user_id is None:
+            # Lost the race: another request inserted the wallet first
+            user_id = session.execute(select(User.id).filter_by(wallet_address=wallet_address)).scalar()
+    if cache is not None:
+        transaction = session.get_nested_transaction() or session.get_transaction()
+        session.info.setdefault(_PENDING, []).append((transaction, cache, wallet_address, user_id))
+    return user_id, created
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending(session):
+    for _, cache, wallet_address, user_id in session.info.pop(_PENDING, []):
+        cache.put(wallet_address, user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_pending(session):
+    session.info.pop(_PENDING, None)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_pending_savepoint(session, previous_transaction):
+    # A rolled-back SAVEPOINT (e.g. one failed unit in a group commit) may have
+    # inserted the user that was staged; forget only that unit's entries.
+    if _PENDING in session.info:
+        session.info[_PENDING] = [entry for entry in session.info[_PENDING]
+                                  if entry[0] is not previous_transaction]
+
+
+def _invalidate_everywhere(wallet_address: str):
+    for cache in list(_caches):
+        cache.invalidate(wallet_address)
+
+
+@event.listens_for(User, 'after_update')
+def _invalidate_updated(mapper, connection, user):
+    history = inspect(user).attrs.wallet_address.history
+    for wallet_address in (history.deleted or []) + [user.wallet_address]:
+        _invalidate_everywhere(wallet_address)
+
+
+@event.listens_for(User, 'after_delete')
+def _invalidate_deleted(mapper, connection, user):
+    _invalidate_everywhere(user.wallet_address)
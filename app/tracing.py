@@ -0,0 +1,274 @@
+"""
+Lightweight per-request tracing.
+
+Each request gets a Trace held in a context variable; code running on the
+request's thread adds timed spans to it with span(category, name). SQL is
+timed from SQLAlchemy cursor events, so no query needs touching. When the
+request ends a sample of traces, plus every slow one, is kept in a ring
+buffer for /debug/traces. With TRACE_HEADERS the per-category totals also
+go out in a Server-Timing header (visible in the browser's network panel).
+
+Categories can nest (an agent span contains its LLM call), so totals may
+add up to more than the request. Statements run on the group-commit writer
+thread belong to no trace; the request's "write" span covers them.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+# Spans kept per trace; totals keep counting past this
+MAX_SPANS = 200
+PROFILE_DEPTH = 40
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+
+
+class Trace:
+    def __init__(self, method: str, path: str, sampled: bool = False):
+        self.id = os.urandom(8).hex()
+        self.method = method
+        self.path = path
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status: Optional[int] = None
+        self.spans: List[tuple] = []
+        self.totals: Dict[str, List[float]] = {}
+        self.samples: Counter = Counter()
+        self.thread_id = threading.get_ident()
+
+    def add(self, category: str, name: str, start: float, end: float):
+        total = self.totals.setdefault(category, [0.0, 0])
+        total[0] += (end - start) * 1000
+        total[1] += 1
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append((category, name, round((start - self.start) * 1000, 3),
+                               round((end - start) * 1000, 3)))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def server_timing(self) -> str:
+        entries = [f'{category};dur={ms:.1f};desc="{count}x"' for category, (ms, count) in self.totals.items()]
+        entries.append(f'total;dur={self.elapsed_ms():.1f}')
+        return ', '.join(entries)
+
+    def to_dict(self, detail: bool = False) -> Dict:
+        data = {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            'totals': {category: {'ms': round(ms, 3), 'count': count}
+                       for category, (ms, count) in self.totals.items()},
+        }
+        if detail:
+            data['spans'] = [dict(zip(('category', 'name', 'offset_ms', 'duration_ms'), entry))
+                             for entry in self.spans]
+            if self.samples:
+                data['profile'] = [{'stack': stack, 'samples': count}
+                                   for stack, count in self.samples.most_common(50)]
+        return data
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def span(category: str, name: str = ''):
+    """Times the block into the current trace; does nothing outside a request."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(category, name, start, time.perf_counter())
+
+
+def instrument_engine(engine):
+    """Adds a "db" span per statement executed on the engine by a traced request."""
+    if getattr(engine, '_traced', False):
+        return engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault('trace_starts', []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        trace = _current.get()
+        starts = conn.info.get('trace_starts')
+        if trace is not None and starts:
+            trace.add('db', statement[:80].split('\n', 1)[0], starts.pop(), time.perf_counter())
+
+    engine._traced = True
+    return engine
+
+
+class TracedJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider timing jsonify() as a "json" span."""
+
+    def response(self, *args, **kwargs):
+        with span('json'):
+            return super().response(*args, **kwargs)
+
+
+class TraceBuffer:
+    """Bounded, thread-safe store of finished traces, newest last."""
+
+    def __init__(self, maxsize: int = 200):
+        self._traces: "deque[Trace]" = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def list(self, min_ms: float = 0, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            traces = list(self._traces)
+        return [trace.to_dict() for trace in reversed(traces)
+                if (trace.duration_ms or 0) >= min_ms][:limit]
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            return next((trace for trace in self._traces if trace.id == trace_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+class SamplingProfiler:
+    """
+    Background thread that every `interval_ms` records the stack of each
+    thread serving a traced request, as collapsed "file:function;..." strings
+    counted on the trace. Costs nothing per request; only kept traces (slow
+    or sampled) carry the result.
+    """
+
+    def __init__(self, interval_ms: float = 5.0):
+        self.interval = interval_ms / 1000
+        self._active: Dict[int, Trace] = {}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trace-profiler", daemon=True)
+        self._thread.start()
+
+    def register(self, trace: Trace):
+        self._active[trace.thread_id] = trace
+
+    def unregister(self, trace: Trace):
+        self._active.pop(trace.thread_id, None)
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            for thread_id, trace in list(self._active.items()):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    trace.samples[collapse_stack(frame)] += 1
+
+
+def collapse_stack(frame) -> str:
+    names = []
+    while frame is not None and len(names) < PROFILE_DEPTH:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Tracer:
+    """Starts and finishes request traces and decides which ones are kept."""
+
+    def __init__(self, sample_rate: float = 0.01, slow_ms: float = 1000, buffer_size: int = 200,
+                 profiler: Optional[SamplingProfiler] = None):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.buffer = TraceBuffer(buffer_size)
+        self.profiler = profiler
+
+    def start(self, method: str, path: str) -> Trace:
+        trace = Trace(method, path, sampled=random.random() < self.sample_rate)
+        _current.set(trace)
+        if self.profiler:
+            self.profiler.register(trace)
+        return trace
+
+    def finish(self, trace: Trace, status: Optional[int] = None) -> bool:
+        """Ends the trace; returns whether it was kept in the buffer."""
+        if self.profiler:
+            self.profiler.unregister(trace)
+        _current.set(None)
+        trace.duration_ms = trace.elapsed_ms()
+        trace.status = status
+        if trace.sampled or trace.duration_ms >= self.slow_ms:
+            self.buffer.add(trace)
+            return True
+        return False
+
+
+def init_tracing(app, config, engines) -> Optional[Tracer]:
+    """
+    Traces every request of the app when TRACING_ENABLED: SQL on the given
+    engines, jsonify() and any span() in between. Timings are only exposed
+    to clients with TRACE_HEADERS. Returns the Tracer, or None when tracing
+    is off.
+    """
+    if not config.TRACING_ENABLED:
+        return None
+    for engine in engines:
+        instrument_engine(engine)
+    app.json = TracedJSONProvider(app)
+    tracer = Tracer(
+        sample_rate=config.TRACE_SAMPLE_RATE,
+        slow_ms=config.TRACE_SLOW_MS,
+        buffer_size=config.TRACE_BUFFER_SIZE,
+        profiler=SamplingProfiler(config.TRACE_PROFILE_INTERVAL_MS) if config.TRACE_PROFILE else None
+    )
+
+    @app.before_request
+    def _start_trace():
+        tracer.start(request.method, request.path)
+
+    @app.after_request
+    def _server_timing(response):
+        trace = _current.get()
+        if trace is not None:
+            trace.status = response.status_code
+            if config.TRACE_HEADERS:
+                response.headers['Server-Timing'] = trace.server_timing()
+                response.headers['X-Trace-Id'] = trace.id
+        return response
+
+    @app.teardown_request
+    def _finish_trace(exc):
+        trace = _current.get()
+        if trace is not None:
+            tracer.finish(trace, trace.status if exc is None else 500)
+
+    return tracer
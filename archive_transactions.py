@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+from datetime import datetime, timedelta
+sys.path.append('.')
+
+from config import Config
+from app.main import app, db
+from app.models.archive import archive_transactions, purge_archive
+from app.models.events import prune_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old transactions to the compressed archive and apply retention.")
+    parser.add_argument('--older-than-days', type=int, default=Config.ARCHIVE_AFTER_DAYS)
+    parser.add_argument('--retention-days', type=int, default=Config.ARCHIVE_RETENTION_DAYS,
+                        help='purge archived rows older than this (0 = keep forever)')
+    parser.add_argument('--events-retention-days', type=int, default=Config.EVENTS_RETENTION_DAYS,
+                        help='delete dashboard events older than this (0 = keep forever)')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    with app.app_context():
+        cutoff = datetime.utcnow() - timedelta(days=args.older_than_days)
+        print(f"🗄 Archiving transactions created before {cutoff.isoformat()}...")
+        moved = archive_transactions(db.session, cutoff, batch_size=args.batch_size)
+        print(f"✅ Archived {moved} transactions")
+        if args.retention_days:
+            purge_cutoff = datetime.utcnow() - timedelta(days=args.retention_days)
+            purged = purge_archive(db.session, purge_cutoff)
+            print(f"🧹 Purged {purged} archived transactions created before {purge_cutoff.isoformat()}")
+        if args.events_retention_days:
+            events_cutoff = datetime.utcnow() - timedelta(days=args.events_retention_days)
+            pruned = prune_events(db.session, events_cutoff)
+            print(f"🧹 Pruned {pruned} dashboard events created before {events_cutoff.isoformat()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+import tempfile
+sys.path.append('.')
+
+from config import Config
+from app.main import app, db
+from app.models.backup import apply_retention, create_backup, list_backups, rebuild, restore_backup
+
+
+def _mb(n):
+    return f"{n / 1e6:.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online SQLite backups: full, incremental, verify and restore.")
+    parser.add_argument('--dir', default=Config.BACKUP_DIR, help='backup directory')
+    sub = parser.add_subparsers(dest='command', required=True)
+    backup = sub.add_parser('backup', help='take a backup (incremental when possible)')
+    backup.add_argument('--full', action='store_true', help='force a full backup')
+    backup.add_argument('--keep-full', type=int, default=Config.BACKUP_KEEP_FULL,
+                        help='full backups (with their incrementals) to keep; 0 keeps all')
+    restore = sub.add_parser('restore', help='replace the database with a backup')
+    restore.add_argument('name', help='backup name (see list)')
+    restore.add_argument('--yes', action='store_true', help='do not ask for confirmation')
+    sub.add_parser('list', help='list backups')
+    verify = sub.add_parser('verify', help='rebuild a backup to a scratch file and integrity-check it')
+    verify.add_argument('name')
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.command == 'backup':
+            manifest = create_backup(db.engine, args.dir, full=args.full, max_chain=Config.BACKUP_MAX_CHAIN,
+                                     step_pages=Config.BACKUP_STEP_PAGES)
+            print(f"💾 {manifest['kind']} backup {manifest['name']}: {manifest['pages_changed']}/"
+                  f"{manifest['page_count']} pages, {_mb(manifest['database_bytes'])} -> "
+                  f"{_mb(manifest['stored_bytes'])} in {manifest['seconds']}s "
+                  f"({_mb(manifest['bytes_per_sec'] or 0)}/s), integrity {manifest['integrity']}")
+            removed = apply_retention(args.dir, args.keep_full)
+            if removed:
+                print(f"🧹 Removed {len(removed)} old backups")
+        elif args.command == 'restore':
+            if not args.yes:
+                reply = input(f"⚠  Replace the database with {args.name}? A full backup is taken first. (y/N): ")
+                if reply.strip().lower() != 'y':
+                    print("Restore cancelled")
+                    sys.exit(1)
+            safety = create_backup(db.engine, args.dir, full=True)
+            print(f"💾 Current state saved as {safety['name']}")
+            result = restore_backup(db.engine, args.dir, args.name)
+            print(f"✅ Restored {result['name']} ({result['chain']} files, {_mb(result['database_bytes'])}) in "
+                  f"{result['seconds']}s ({_mb(result['bytes_per_sec'] or 0)}/s)")
+            print("🔄 Restart the application to drop cached state")
+        elif args.command == 'list':
+            backups = list_backups(args.dir)
+            if not backups:
+                print("No backups found")
+            for manifest in backups:
+                base = f" <- {manifest['base']}" if manifest['base'] else ''
+                print(f"{manifest['name']}  {manifest['kind']:<11} {_mb(manifest['stored_bytes']):>9}  "
+                      f"{manifest['created_at']}{base}")
+        elif args.command == 'verify':
+            with tempfile.TemporaryDirectory() as scratch:
+                rebuild(args.dir, args.name, os.path.join(scratch, 'verify.db'))
+            print(f"✅ {args.name} rebuilds cleanly and passes integrity_check")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+/api/analytics cost on a large table: NumPy store vs per-row ORM objects.
+
+"orm" loads every Asset and Transaction and aggregates in Python, which is
+what a naive endpoint would do. "store" is AnalyticsStore: a cold load, a
+cached hit, and an incremental refresh after a small batch of writes.
+
+    python benchmarks/bench_analytics.py --assets 200000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+
+from config import Config
+from app.models.database import db, User, Asset, Transaction
+from app.models.analytics import AnalyticsStore, normalize_location
+from app.models.engine import apply_sqlite_profile, sqlite_pragmas
+from app.models.migrations import upgrade
+
+TYPES = ['real_estate', 'vehicle', 'commodity', 'art', 'equipment']
+CITIES = ['Mumbai', 'Pune', 'Etawah, Uttar Pradesh', 'Bangalore', 'Delhi', 'unknown', 'Jaipur']
+AGENTS = ['basic_info', 'value_assessment', 'jurisdiction', 'asset_specific']
+
+
+def seed(engine, count, batch=50000):
+    db.metadata.create_all(engine)
+    upgrade(engine)
+    rng = random.Random(3)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{'wallet_address': '0x1', 'created_at': start}])
+    for first in range(0, count, batch):
+        size = min(batch, count - first)
+        with engine.begin() as conn:
+            conn.execute(insert(Asset.__table__), [{
+                'user_id': 1, 'asset_type': rng.choice(TYPES), 'description': 'x',
+                'estimated_value': 10 ** rng.uniform(4, 8), 'location': rng.choice(CITIES),
+                'verification_status': 'verified', 'verification_score': rng.random(),
+                'verification_breakdown': {agent: rng.random() for agent in AGENTS},
+                'created_at': start, 'updated_at': start + timedelta(seconds=first + i),
+            } for i in range(size)])
+            conn.execute(insert(Transaction.__table__), [{
+                'asset_id': first + i + 1, 'transaction_type': 'verification', 'status': 'verified',
+                'created_at': start + timedelta(minutes=rng.randint(0, 60 * 24 * 180)),
+            } for i in range(size)])
+
+
+def orm_summary(engine):
+    with Session(engine) as session:
+        by_type, by_location, scores = defaultdict(list), defaultdict(list), defaultdict(list)
+        for asset in session.query(Asset):
+            by_type[asset.asset_type].append(asset.estimated_value)
+            by_location[normalize_location(asset.location)].append(asset.estimated_value)
+            for agent, score in (asset.verification_breakdown or {}).items():
+                scores[agent].append(score)
+        days = defaultdict(int)
+        for tx in session.query(Transaction):
+            days[(tx.transaction_type, tx.created_at.date())] += 1
+        return {name: statistics.quantiles(values, n=4) for name, values in by_type.items()}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--assets', type=int, default=200000)
+    parser.add_argument('--writes', type=int, default=100, help='assets re-verified before the refresh')
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    apply_sqlite_profile(engine, sqlite_pragmas(Config))
+    seed(engine, args.assets)
+    store = AnalyticsStore(ttl=3600)
+    report = {
+        'assets': args.assets,
+        'orm_ms': timed(lambda: orm_summary(engine)),
+        'store_cold_ms': timed(lambda: store.summary(engine)),
+        'store_cached_ms': timed(lambda: store.summary(engine)),
+    }
+    with engine.begin() as conn:
+        conn.execute(update(Asset.__table__).where(Asset.__table__.c.id <= args.writes)
+                     .values(verification_score=0.5, updated_at=datetime.utcnow()))
+    store.invalidate()
+    report['store_refresh_ms'] = timed(lambda: store.summary(engine))
+    print(json.dumps(report))
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Sync (gunicorn, sync workers) vs async (uvicorn app.asgi:app, one process)
+serving of LLM-bound requests.
+
+Each mode gets a fresh server on a throwaway database with the stub LLM
+answering after --llm-ms, standing in for Gemini. --requests intakes, then
+as many verifications (four model calls each), are sent with --concurrency
+requests in flight; throughput and latency are reported per phase.
+
+    python benchmarks/bench_asgi.py --requests 200 --concurrency 200 --llm-ms 200
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from performance_test import percentile, wait_healthy
+
+INPUT = '3BHK apartment flat in Pune, 1450 sqft with registered deed, valued at ₹1.2 Cr'
+
+
+def spawn(mode, port, workers, llm_ms):
+    workdir = tempfile.mkdtemp(prefix=f'rwa-{mode}-')
+    env = dict(os.environ, LLM_BACKEND='stub', LLM_STUB_LATENCY_MS=str(llm_ms),
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+               OWNERSHIP_LEDGER_DIR=os.path.join(workdir, 'ledger'), LOG_FILE=os.path.join(workdir, 'app.log'),
+               PROMETHEUS_MULTIPROC_DIR=os.path.join(workdir, 'prometheus'))
+    if mode == 'sync':
+        env.update(GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS=str(workers), GUNICORN_THREADS='1')
+        command = ['gunicorn', '-c', 'gunicorn.conf.py', 'app.main:app']
+    else:
+        env.pop('PROMETHEUS_MULTIPROC_DIR')
+        command = ['uvicorn', 'app.asgi:app', '--port', str(port), '--log-level', 'warning']
+    return subprocess.Popen(command, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def phase(calls, concurrency):
+    """Runs the calls with `concurrency` in flight; returns (seconds, latencies, errors, results)."""
+    def timed(call):
+        start = time.perf_counter()
+        try:
+            response = call()
+            return time.perf_counter() - start, response.ok, response.json() if response.ok else None
+        except requests.RequestException:
+            return time.perf_counter() - start, False, None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed, calls))
+    elapsed = time.perf_counter() - start
+    return elapsed, [o[0] for o in outcomes], sum(not o[1] for o in outcomes), [o[2] for o in outcomes]
+
+
+def report(mode, name, elapsed, latencies, errors):
+    ordered = sorted(latencies)
+    print(f"{mode:6} {name:7} {len(latencies) / elapsed:>8.1f} req/s  p50 {percentile(ordered, 50) * 1000:>7.0f} ms  "
+          f"p99 {percentile(ordered, 99) * 1000:>7.0f} ms  errors {errors}")
+
+
+def run(mode, args):
+    port = args.port + (mode == 'async')
+    server = spawn(mode, port, args.workers, args.llm_ms)
+    base = f'http://127.0.0.1:{port}'
+    try:
+        if not wait_healthy(base, 30):
+            print(f"❌ {mode} server did not start")
+            return
+        timeout = max(60.0, args.requests * args.llm_ms / 1000)
+        intakes = [lambda n=n: requests.post(f'{base}/api/intake', timeout=timeout,
+                                             json={'wallet_address': f'0xbench{n % 50}', 'user_input': INPUT})
+                   for n in range(args.requests)]
+        elapsed, latencies, errors, results = phase(intakes, args.concurrency)
+        report(mode, 'intake', elapsed, latencies, errors)
+        ids = [result['asset']['id'] for result in results if result]
+        verifies = [lambda asset_id=asset_id: requests.post(f'{base}/api/verify/{asset_id}', timeout=timeout)
+                    for asset_id in ids]
+        report(mode, 'verify', *phase(verifies, args.concurrency)[:3])
+    finally:
+        server.terminate()
+        server.wait(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs async serving of LLM-bound requests.")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--llm-ms', type=float, default=200, help='stub model latency per call')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn sync workers (as deployed)')
+    parser.add_argument('--port', type=int, default=5090)
+    parser.add_argument('--mode', choices=['sync', 'async', 'both'], default='both')
+    args = parser.parse_args()
+    print(f"{args.requests} requests, {args.concurrency} in flight, {args.llm_ms:.0f} ms per model call")
+    for mode in (['sync', 'async'] if args.mode == 'both' else [args.mode]):
+        run(mode, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Backup and restore throughput, and how long writers stall during a backup.
+
+Seeds a database with the app's SQLite profile, then takes a full and an
+incremental backup while a writer thread keeps inserting, and reports the
+writer's worst commit latency next to the backup and restore rates.
+
+    python benchmarks/bench_backup.py --assets 200000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert
+
+from config import Config
+from app.models.backup import create_backup, restore_backup
+from app.models.database import db, User, Asset
+from app.models.engine import apply_sqlite_profile, sqlite_pragmas
+from app.models.migrations import upgrade
+
+
+def seed(engine, count, batch=50000):
+    db.metadata.create_all(engine)
+    upgrade(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{'wallet_address': '0x1', 'created_at': now}])
+    for start in range(0, count, batch):
+        with engine.begin() as conn:
+            conn.execute(insert(Asset.__table__), [{
+                'user_id': 1, 'asset_type': 'real_estate', 'description': f'flat number {start + i} in Pune',
+                'estimated_value': 2500000.0, 'location': 'Pune', 'requirements': {},
+                'created_at': now, 'updated_at': now,
+            } for i in range(min(batch, count - start))])
+
+
+class Writer(threading.Thread):
+    """Commits one small insert at a time and records the slowest commit."""
+
+    def __init__(self, engine):
+        super().__init__(daemon=True)
+        self.engine, self.stop, self.worst, self.commits = engine, threading.Event(), 0.0, 0
+
+    def run(self):
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            with self.engine.begin() as conn:
+                conn.execute(insert(Asset.__table__).values(
+                    user_id=1, asset_type='vehicle', description='car', estimated_value=1.0, location='Pune',
+                    created_at=datetime.utcnow(), updated_at=datetime.utcnow()))
+            self.worst = max(self.worst, time.perf_counter() - start)
+            self.commits += 1
+            time.sleep(0.001)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--assets', type=int, default=200000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    apply_sqlite_profile(engine, sqlite_pragmas(Config))
+    seed(engine, args.assets)
+    backups = os.path.join(workdir, 'backups')
+
+    for kind in ('full', 'incremental'):
+        writer = Writer(engine)
+        writer.start()
+        time.sleep(0.2)
+        manifest = create_backup(engine, backups, full=kind == 'full')
+        writer.stop.set()
+        writer.join()
+        print(json.dumps({
+            'backup': manifest['kind'], 'database_mb': round(manifest['database_bytes'] / 1e6, 1),
+            'stored_mb': round(manifest['stored_bytes'] / 1e6, 2), 'pages_changed': manifest['pages_changed'],
+            'seconds': manifest['seconds'], 'mb_per_sec': round(manifest['bytes_per_sec'] / 1e6, 1),
+            'writer_commits': writer.commits, 'writer_worst_commit_ms': round(writer.worst * 1000, 1),
+        }))
+
+    result = restore_backup(engine, backups, manifest['name'])
+    print(json.dumps({'restore': result['name'], 'chain': result['chain'], 'seconds': result['seconds'],
+                      'mb_per_sec': round(result['bytes_per_sec'] / 1e6, 1)}))
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Minting N verified assets: one tokenize_asset + commit per asset vs one
+tokenize_batch + one executemany write.
+
+    python benchmarks/bench_batch_mint.py --assets 5000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from config import Config
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import db, User, Asset
+from app.models.engine import apply_sqlite_profile, sqlite_pragmas
+from app.models.operations import record_tokenization, record_tokenization_batch
+from app.models.session import unit_of_work
+
+
+def seed(engine, count):
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(wallet_address='0x1')
+        session.add_all(Asset(user=user, asset_type='real_estate', description=f'flat {i}', location='Pune',
+                              estimated_value=2500000.0, verification_status='verified', verification_score=0.9)
+                        for i in range(count))
+        session.commit()
+
+
+def one_by_one(engine, agent):
+    with Session(engine) as session:
+        assets = session.query(Asset).all()
+        for asset in assets:
+            result = agent.tokenize_asset(asset.to_dict(), asset.verification_snapshot())
+            with unit_of_work(session) as uow:
+                record_tokenization(uow, asset.id, result)
+
+
+def batched(engine, agent):
+    with Session(engine) as session:
+        assets = session.query(Asset).all()
+        batch = agent.tokenize_batch([(asset.to_dict(), asset.verification_snapshot()) for asset in assets])
+        with unit_of_work(session) as uow:
+            record_tokenization_batch(uow, batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--assets', type=int, default=5000)
+    args = parser.parse_args()
+
+    agent = TokenizationAgent()
+    report = {'assets': args.assets}
+    for name, mint in (('one_by_one', one_by_one), ('batch', batched)):
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+        apply_sqlite_profile(engine, sqlite_pragmas(Config))
+        seed(engine, args.assets)
+        start = time.perf_counter()
+        mint(engine, agent)
+        seconds = time.perf_counter() - start
+        report[f'{name}_s'] = round(seconds, 3)
+        report[f'{name}_tokens_per_s'] = round(args.assets / seconds)
+        engine.dispose()
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
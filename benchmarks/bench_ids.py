@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Id allocation: ids per second from several processes sharing one SQLite
+database, by lease block size, with a uniqueness check. Also counts
+collisions of the old time-based token ids for comparison.
+
+    python benchmarks/bench_ids.py --workers 4 --ids 50000
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+
+from config import Config
+from app.models.database import IdSequence
+from app.models.engine import apply_sqlite_profile, sqlite_pragmas
+from app.models.id_allocator import IdAllocator
+
+
+def _engine(path):
+    engine = create_engine(f'sqlite:///{path}')
+    apply_sqlite_profile(engine, sqlite_pragmas(Config))
+    return engine
+
+
+def worker(path, count, block_size, results):
+    allocator = IdAllocator(_engine(path), block_size=block_size)
+    start = time.perf_counter()
+    ids = [allocator.next_id() for _ in range(count)]
+    results.put((time.perf_counter() - start, ids))
+
+
+def run(workers, count, block_size):
+    path = os.path.join(tempfile.mkdtemp(), 'ids.db')
+    IdSequence.__table__.create(_engine(path))
+    results = multiprocessing.Queue()
+    pool = [multiprocessing.Process(target=worker, args=(path, count // workers, block_size, results))
+            for _ in range(workers)]
+    for process in pool:
+        process.start()
+    outcomes = [results.get() for _ in pool]
+    for process in pool:
+        process.join()
+    issued = [value for _, ids in outcomes for value in ids]
+    return {
+        'block_size': block_size,
+        'ids_per_s': round(len(issued) / max(seconds for seconds, _ in outcomes)),
+        'duplicates': len(issued) - len(set(issued)),
+    }
+
+
+def legacy_collisions(count):
+    # The old scheme: asset id + type + int(time.time()), truncated sha256
+    seen = set()
+    for _ in range(count):
+        base = f"42_real_estate_{int(time.time())}"
+        seen.add(hashlib.sha256(base.encode()).hexdigest()[:16])
+    return count - len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--ids', type=int, default=50000)
+    args = parser.parse_args()
+    runs = [run(args.workers, args.ids if block_size > 1 else args.ids // 10, block_size)
+            for block_size in (1, 100, 1000)]
+    print(json.dumps({'workers': args.workers, 'runs': runs,
+                      'legacy_duplicates_of_1000_same_asset': legacy_collisions(1000)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
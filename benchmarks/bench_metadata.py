@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tokenization cost per token, for single mints and batches: agent time
+(metadata, contract, ids), time to record the result and database bytes per
+minted token. Agent times are the best of --rounds runs.
+
+    python benchmarks/bench_metadata.py --assets 5000 --rounds 5
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from config import Config
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import db, User, Asset
+from app.models.engine import apply_sqlite_profile, sqlite_pragmas
+from app.models.operations import record_tokenization, record_tokenization_batch
+
+TYPES = ['real_estate', 'vehicle', 'artwork', 'equipment', 'commodity']
+
+
+def seed(engine, count):
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(wallet_address='0x1')
+        session.add_all(Asset(user=user, asset_type=TYPES[i % len(TYPES)], description=f'3BHK flat number {i}',
+                              location='Pune, Maharashtra', estimated_value=2500000.0 + i,
+                              verification_status='verified', verification_score=0.9)
+                        for i in range(count))
+        session.commit()
+
+
+def database(count):
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    apply_sqlite_profile(engine, sqlite_pragmas(Config))
+    seed(engine, count)
+    with Session(engine) as session:
+        items = [(asset.to_dict(), asset.verification_snapshot()) for asset in session.query(Asset)]
+    return engine, items
+
+
+def size(engine):
+    with engine.connect() as conn:
+        conn.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+        return conn.execute(text('PRAGMA page_count')).scalar() * conn.execute(text('PRAGMA page_size')).scalar()
+
+
+def best(rounds, fn):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--assets', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    agent = TokenizationAgent()
+    report = {'assets': args.assets}
+
+    engine, items = database(args.assets)
+    elapsed, results = best(args.rounds, lambda: [agent.tokenize_asset(*item) for item in items])
+    report['single_agent_us'] = round(elapsed / len(items) * 1e6, 1)
+    before = size(engine)
+    start = time.perf_counter()
+    with Session(engine) as session:
+        for (asset_data, _), result in zip(items, results):
+            record_tokenization(session, asset_data['id'], result)
+        session.commit()
+    report['single_record_us'] = round((time.perf_counter() - start) / len(items) * 1e6, 1)
+    report['single_db_bytes_per_token'] = round((size(engine) - before) / len(items))
+
+    engine, items = database(args.assets)
+    elapsed, batch = best(args.rounds, lambda: agent.tokenize_batch(items))
+    report['batch_agent_us'] = round(elapsed / len(items) * 1e6, 1)
+    before = size(engine)
+    start = time.perf_counter()
+    with Session(engine) as session:
+        record_tokenization_batch(session, batch)
+        session.commit()
+    report['batch_record_us'] = round((time.perf_counter() - start) / len(items) * 1e6, 1)
+    report['batch_db_bytes_per_token'] = round((size(engine) - before) / len(items))
+    report['batch_response_bytes_per_token'] = round(len(json.dumps(batch['tokens'])) / len(items))
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
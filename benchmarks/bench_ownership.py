@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Ownership ledger: transfers per second (memory-only and persisted) and
+startup replay time.
+
+    python benchmarks/bench_ownership.py --tokens 100000 --transfers 200000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.agents.ownership_ledger import OwnershipLedger
+
+
+def run_transfers(ledger, tokens, wallets, count):
+    rng = random.Random(7)
+    start = time.perf_counter()
+    for _ in range(count):
+        token_id = rng.choice(tokens)
+        owner = ledger.owners[token_id]
+        recipient = rng.choice(wallets)
+        if recipient != owner:
+            ledger.transfer(token_id, owner, recipient)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=100000)
+    parser.add_argument('--wallets', type=int, default=10000)
+    parser.add_argument('--transfers', type=int, default=200000)
+    parser.add_argument('--snapshot-every', type=int, default=10000)
+    args = parser.parse_args()
+
+    tokens = [f'RWA_{i:016X}' for i in range(args.tokens)]
+    wallets = [f'0x{i:040x}' for i in range(args.wallets)]
+    report = {'tokens': args.tokens, 'transfers': args.transfers}
+
+    ledger = OwnershipLedger()
+    ledger.mint_many((token_id, wallets[i % len(wallets)]) for i, token_id in enumerate(tokens))
+    seconds = run_transfers(ledger, tokens, wallets, args.transfers)
+    report['memory_transfers_per_s'] = round(args.transfers / seconds)
+
+    directory = tempfile.mkdtemp()
+    ledger = OwnershipLedger(directory, snapshot_every=args.snapshot_every)
+    ledger.mint_many((token_id, wallets[i % len(wallets)]) for i, token_id in enumerate(tokens))
+    seconds = run_transfers(ledger, tokens, wallets, args.transfers)
+    report['persisted_transfers_per_s'] = round(args.transfers / seconds)
+
+    start = time.perf_counter()
+    for _ in range(10000):
+        ledger.owner_of(random.choice(tokens))
+    report['owner_of_us'] = round((time.perf_counter() - start) / 10000 * 1e6, 2)
+
+    start = time.perf_counter()
+    reopened = OwnershipLedger(directory, snapshot_every=args.snapshot_every)
+    report['replay_s'] = round(time.perf_counter() - start, 3)
+    assert reopened.owners == ledger.owners
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
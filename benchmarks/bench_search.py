@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+/api/search latency over a large asset table (SQLite FTS5).
+
+Seeds N synthetic assets (index kept by the triggers from migration 6), then
+times search_assets for selective, common, prefix and filtered queries,
+first page and a deep keyset page.
+
+    python benchmarks/bench_search.py --assets 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from config import Config
+from app.models.database import db, User, Asset
+from app.models.engine import apply_sqlite_profile, sqlite_pragmas
+from app.models.migrations import upgrade
+from app.models.search import search_assets
+
+CITIES = ['Mumbai', 'Pune', 'Bandra', 'Bangalore', 'Chennai', 'Etawah', 'Nashik', 'Delhi', 'Jaipur', 'Kochi']
+KINDS = {
+    'real_estate': ['apartment', 'villa', 'flat', 'plot', 'warehouse', 'office'],
+    'vehicle': ['sedan', 'motorbike', 'truck', 'vintage car'],
+    'commodity': ['gold bars', 'silver coins', 'copper stock'],
+    'art': ['oil painting', 'sculpture', 'manuscript'],
+}
+QUERIES = [
+    ('selective', 'sculpture jaipur', {}),
+    ('common', 'apartment', {}),
+    ('prefix', 'ban*', {}),
+    ('filtered', 'gold', {'status': 'verified'}),
+]
+
+
+def seed(engine, count, batch=50000):
+    db.metadata.create_all(engine)
+    upgrade(engine)
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{'wallet_address': f'0x{i:040x}', 'created_at': now}
+                                              for i in range(1000)])
+    # One transaction per batch, as bulk_load.py does: a single huge WAL
+    # transaction spills FTS segment pages over and over
+    for start in range(0, count, batch):
+        rows = []
+        for _ in range(min(batch, count - start)):
+            asset_type = rng.choice(list(KINDS))
+            thing, city = rng.choice(KINDS[asset_type]), rng.choice(CITIES)
+            rows.append({
+                'user_id': rng.randint(1, 1000), 'asset_type': asset_type,
+                'description': f'{thing} in {city}, ref {rng.randint(1, 10 ** 6)}',
+                'estimated_value': float(rng.randint(1, 10 ** 7)), 'location': city,
+                'verification_status': rng.choice(['verified', 'pending', 'requires_review']),
+                'created_at': now, 'updated_at': now,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Asset.__table__), rows)
+
+
+def timed(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return result, round(timings[len(timings) // 2] * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--assets', type=int, default=1000000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    apply_sqlite_profile(engine, sqlite_pragmas(Config))
+    start = time.perf_counter()
+    seed(engine, args.assets)
+    print(json.dumps({'assets': args.assets, 'seed_seconds': round(time.perf_counter() - start, 1)}))
+    with Session(engine) as session:
+        for name, query, filters in QUERIES:
+            page, first_ms = timed(lambda: search_assets(session, query, **filters), args.iterations)
+            cursor = page['next_cursor']
+            for _ in range(49):  # walk to page 50
+                cursor = search_assets(session, query, cursor=cursor, **filters)['next_cursor']
+            _, deep_ms = timed(lambda: search_assets(session, query, cursor=cursor, **filters), args.iterations)
+            print(json.dumps({'query': name, 'q': query, **filters,
+                              'first_page_p50_ms': first_ms, 'page_50_p50_ms': deep_ms}))
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Share ledger: transfers per second under concurrent load, for single moves
+and batches, with threads in one process and with processes sharing a
+persisted ledger directory (as gunicorn workers do).
+
+    python benchmarks/bench_shares.py --tokens 1000 --wallets 1000 --moves 100000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.agents.share_ledger import ShareLedger
+
+SHARES = 1_000_000
+
+
+def seed(ledger, tokens, wallets):
+    # Every wallet starts with shares of every token, so random moves rarely fail
+    for token_id in tokens:
+        ledger.fractionalize(token_id, wallets[0], SHARES)
+        ledger.transfer_batch([(token_id, wallets[0], wallet, SHARES // len(wallets)) for wallet in wallets[1:]])
+
+
+def worker(ledger, tokens, wallets, moves, batch_size, seed_value):
+    rng = random.Random(seed_value)
+    done = 0
+    while done < moves:
+        batch = []
+        for _ in range(batch_size):
+            sender, recipient = rng.sample(wallets, 2)
+            batch.append((rng.choice(tokens), sender, recipient, 1))
+        try:
+            ledger.transfer_batch(batch)
+        except ValueError:
+            pass
+        done += batch_size
+
+
+def run_threads(ledger, tokens, wallets, moves, threads, batch_size):
+    per_thread = moves // threads
+    pool = [threading.Thread(target=worker, args=(ledger, tokens, wallets, per_thread, batch_size, i))
+            for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def process_worker(directory, tokens, wallets, moves, batch_size, seed_value, barrier, results):
+    ledger = ShareLedger(directory)
+    barrier.wait()  # startup replay is not part of the measurement
+    start = time.perf_counter()
+    worker(ledger, tokens, wallets, moves, batch_size, seed_value)
+    results.put(time.perf_counter() - start)
+
+
+def run_processes(directory, tokens, wallets, moves, processes, batch_size):
+    per_process = moves // processes
+    barrier, results = multiprocessing.Barrier(processes), multiprocessing.Queue()
+    pool = [multiprocessing.Process(target=process_worker,
+                                    args=(directory, tokens, wallets, per_process, batch_size, i, barrier, results))
+            for i in range(processes)]
+    for process in pool:
+        process.start()
+    seconds = max(results.get() for _ in pool)
+    for process in pool:
+        process.join()
+    return per_process * processes / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=1000)
+    parser.add_argument('--wallets', type=int, default=1000)
+    parser.add_argument('--moves', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    tokens = [f'RWA_{i:016X}' for i in range(args.tokens)]
+    wallets = [f'0x{i:040x}' for i in range(args.wallets)]
+    report = {'tokens': args.tokens, 'wallets': args.wallets, 'moves': args.moves, 'workers': args.workers}
+    for batch_size in (1, 100):
+        ledger = ShareLedger()
+        seed(ledger, tokens, wallets)
+        report[f'memory_threads_batch{batch_size}_per_s'] = round(
+            run_threads(ledger, tokens, wallets, args.moves, args.workers, batch_size))
+
+        directory = tempfile.mkdtemp()
+        ledger = ShareLedger(directory)
+        seed(ledger, tokens, wallets)
+        report[f'persisted_threads_batch{batch_size}_per_s'] = round(
+            run_threads(ledger, tokens, wallets, args.moves, args.workers, batch_size))
+        report[f'persisted_processes_batch{batch_size}_per_s'] = round(
+            run_processes(directory, tokens, wallets, args.moves, args.workers, batch_size))
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        ledger.positions_of(random.choice(wallets))
+    report['positions_of_ms'] = round((time.perf_counter() - start) / 1000 * 1e3, 3)
+
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
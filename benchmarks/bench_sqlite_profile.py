@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Read/write concurrency on SQLite with and without the engine profile.
+
+Spawns writer and reader processes (like gunicorn workers) against one
+database file for a fixed duration. Writers insert transactions one commit at
+a time; readers run the dashboard's assets-by-wallet query. Reports ops/sec
+and "database is locked" errors for each process mix.
+
+    python benchmarks/bench_sqlite_profile.py --seconds 5 --mixes 1x1,2x4,4x8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from config import Config
+from app.models.database import db, User, Asset, Transaction
+from app.models.engine import apply_sqlite_profile, create_read_engine, sqlite_pragmas
+
+
+def open_engines(path, profile):
+    engine = create_engine(f'sqlite:///{path}')
+    pragmas = sqlite_pragmas(Config) if profile else None
+    if pragmas:
+        apply_sqlite_profile(engine, pragmas)
+        return engine, create_read_engine(engine, pragmas)
+    return engine, engine
+
+
+def writer(path, profile, seconds, results):
+    engine, _ = open_engines(path, profile)
+    ops = errors = 0
+    deadline = time.monotonic() + seconds
+    with Session(engine) as session:
+        while time.monotonic() < deadline:
+            try:
+                session.add(Transaction(asset_id=1 + ops % 100, transaction_type='verification',
+                                        status='verified', details={'overall_score': 0.8}))
+                session.commit()
+                ops += 1
+            except OperationalError:
+                session.rollback()
+                errors += 1
+    results.put(('write', ops, errors))
+
+
+def reader(path, profile, seconds, results):
+    _, engine = open_engines(path, profile)
+    ops = errors = 0
+    deadline = time.monotonic() + seconds
+    with Session(engine) as session:
+        while time.monotonic() < deadline:
+            try:
+                user = session.query(User).filter_by(wallet_address=f'0x{ops % 10:040x}').first()
+                session.query(Asset).filter_by(user_id=user.id).order_by(Asset.created_at.desc()).all()
+                session.query(Transaction).filter_by(asset_id=1 + ops % 100).count()
+                session.rollback()
+                ops += 1
+            except OperationalError:
+                session.rollback()
+                errors += 1
+    results.put(('read', ops, errors))
+
+
+def seed(path, profile):
+    engine, _ = open_engines(path, profile)
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        users = [User(wallet_address=f'0x{i:040x}') for i in range(10)]
+        session.add_all(users)
+        session.flush()
+        session.add_all(Asset(user_id=users[i % 10].id, asset_type='vehicle', description='car',
+                              estimated_value=1.0, location='Pune') for i in range(100))
+        session.commit()
+    engine.dispose()
+
+
+def run(profile, writers, readers, seconds):
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    seed(path, profile)
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=writer, args=(path, profile, seconds, results)) for _ in range(writers)]
+    procs += [multiprocessing.Process(target=reader, args=(path, profile, seconds, results)) for _ in range(readers)]
+    for p in procs:
+        p.start()
+    totals = {'write': [0, 0], 'read': [0, 0]}
+    for _ in procs:
+        kind, ops, errors = results.get()
+        totals[kind][0] += ops
+        totals[kind][1] += errors
+    for p in procs:
+        p.join()
+    return {
+        'profile': profile, 'writers': writers, 'readers': readers,
+        'writes_per_sec': round(totals['write'][0] / seconds, 1),
+        'reads_per_sec': round(totals['read'][0] / seconds, 1),
+        'locked_errors': totals['write'][1] + totals['read'][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--mixes', default='1x1,2x4,4x8', help='comma-separated WRITERSxREADERS')
+    args = parser.parse_args()
+
+    for mix in args.mixes.split(','):
+        writers, readers = (int(n) for n in mix.split('x'))
+        for profile in (False, True):
+            print(json.dumps(run(profile, writers, readers, args.seconds)))
+
+
+if __name__ == '__main__':
+    main()
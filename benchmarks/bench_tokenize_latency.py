@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tokenization latency as an asset's verification history grows.
+
+"history" is the previous path: find the newest verification Transaction and
+decode its details. "snapshot" reads Asset.verification_snapshot(). Both
+then run TokenizationAgent.tokenize_asset.
+
+    python benchmarks/bench_tokenize_latency.py --sizes 10,1000,10000,50000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.database import db, User, Asset, Transaction
+from app.models.operations import record_verification
+from app.agents.tokenization_agent import TokenizationAgent
+
+VERIFICATION = {
+    'overall_score': 0.82, 'status': 'verified',
+    'breakdown': {'basic_info': 0.9, 'value_assessment': 0.8, 'jurisdiction': 0.9, 'asset_specific': 0.7},
+    'agent_notes': ['notes ' * 60] * 4,
+    'recommendations': ['Provide a formal valuation or appraisal document.'],
+    'next_steps': ['Proceed to tokenization'], 'issues': [], 'verifier_version': 'modular-1.0'
+}
+
+
+def seed(engine, history):
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(wallet_address='0x' + '1' * 40)
+        session.add(user)
+        session.flush()
+        asset = Asset(user_id=user.id, asset_type='real_estate', description='flat',
+                      estimated_value=2500000.0, location='Etawah')
+        session.add(asset)
+        session.flush()
+        details = VERIFICATION
+        session.add_all(Transaction(asset_id=asset.id, transaction_type='verification',
+                                    status='verified', details=details) for _ in range(history - 1))
+        record_verification(session, asset.id, VERIFICATION)
+        session.commit()
+        return asset.id
+
+
+def via_history(session, asset):
+    last = session.query(Transaction).filter_by(
+        asset_id=asset.id, transaction_type='verification'
+    ).order_by(Transaction.created_at.desc()).first()
+    return last.details
+
+
+def via_snapshot(session, asset):
+    return asset.verification_snapshot()
+
+
+def measure(engine, asset_id, lookup, iterations):
+    agent = TokenizationAgent()
+    timings = []
+    with Session(engine) as session:
+        for _ in range(iterations):
+            session.expire_all()
+            start = time.perf_counter()
+            asset = session.get(Asset, asset_id)
+            agent.tokenize_asset(asset.to_dict(), lookup(session, asset))
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return round(timings[len(timings) // 2] * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,1000,10000,50000')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    for size in (int(n) for n in args.sizes.split(',')):
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+        asset_id = seed(engine, size)
+        print(json.dumps({
+            'history': size,
+            'history_p50_ms': measure(engine, asset_id, via_history, args.iterations),
+            'snapshot_p50_ms': measure(engine, asset_id, via_snapshot, args.iterations),
+        }))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Write throughput of the intake/verify/tokenize write paths under concurrent load.
+
+Compares the original per-step commits ("legacy"), one unit of work per request
+("unit") and the group-commit writer ("group") against a throwaway SQLite file.
+No HTTP or LLM calls are involved; only the database writes are measured.
+
+    python benchmarks/bench_write_paths.py --threads 8 --requests 200
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.database import db, User, Asset, Transaction
+from app.models.session import unit_of_work, GroupCommitWriter
+from app.models.operations import create_asset, record_verification, record_tokenization
+
+PARSED = {'asset_type': 'real_estate', 'estimated_value': 2500000.0,
+          'location': 'Etawah, Uttar Pradesh, India', 'description': '3-bedroom flat'}
+VERIFIED = {'status': 'verified', 'overall_score': 0.82, 'breakdown': {'basic_info': 0.9}}
+
+
+def tokenized(i):
+    return {'token_id': f'RWA_{i:016X}', 'transaction_hash': f'0x{i:064x}', 'success': True}
+
+
+def legacy_request(engine, wallet, i):
+    """Mirrors the pre-unit-of-work handlers: a commit after every step."""
+    with Session(engine) as session:
+        user = session.query(User).filter_by(wallet_address=wallet).first()
+        if not user:
+            user = User(wallet_address=wallet)
+            session.add(user)
+            session.commit()
+        asset = Asset(user_id=user.id, asset_type='real_estate', description='flat',
+                      estimated_value=1.0, location='Etawah', verification_status='requires_review',
+                      requirements={})
+        session.add(asset)
+        session.commit()
+        asset.verification_status = 'verified'
+        session.commit()
+        session.add(Transaction(asset_id=asset.id, transaction_type='verification',
+                                status='verified', details=VERIFIED))
+        session.commit()
+        asset.token_id = tokenized(i)['token_id']
+        session.commit()
+        session.add(Transaction(asset_id=asset.id, transaction_type='tokenization',
+                                status='completed', details=tokenized(i)))
+        session.commit()
+
+
+def unit_request(engine, wallet, i):
+    with Session(engine) as session:
+        with unit_of_work(session):
+            asset = create_asset(session, wallet, None, PARSED, 'flat')
+        with unit_of_work(session):
+            record_verification(session, asset['id'], VERIFIED)
+        with unit_of_work(session):
+            record_tokenization(session, asset['id'], tokenized(i))
+
+
+def group_request(writer, wallet, i):
+    asset = writer.run(lambda s: create_asset(s, wallet, None, PARSED, 'flat'))
+    writer.run(lambda s: record_verification(s, asset['id'], VERIFIED))
+    writer.run(lambda s: record_tokenization(s, asset['id'], tokenized(i)))
+
+
+def run_mode(mode, threads, requests_per_thread, synchronous):
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    engine = create_engine(f'sqlite:///{path}', connect_args={'timeout': 30},
+                           pool_size=threads + 1)
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        # Wallets exist up front so the runs measure write paths, not the get-or-create race
+        session.add_all(User(wallet_address=f'0x{w:040x}') for w in range(4))
+        session.commit()
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f'PRAGMA synchronous={synchronous}')
+    writer = GroupCommitWriter(engine, window_ms=2) if mode == 'group' else None
+
+    def worker(t):
+        for n in range(requests_per_thread):
+            i = t * requests_per_thread + n
+            wallet = f'0x{t % 4:040x}'
+            if mode == 'legacy':
+                legacy_request(engine, wallet, i)
+            elif mode == 'unit':
+                unit_request(engine, wallet, i)
+            else:
+                group_request(writer, wallet, i)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if writer:
+        writer.stop()
+    engine.dispose()
+    total = threads * requests_per_thread
+    return {'mode': mode, 'pipelines': total, 'seconds': round(elapsed, 3),
+            'pipelines_per_sec': round(total / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100, help='pipelines per thread')
+    parser.add_argument('--synchronous', default='FULL', help='SQLite synchronous pragma')
+    parser.add_argument('--modes', default='legacy,unit,group')
+    args = parser.parse_args()
+
+    for mode in args.modes.split(','):
+        print(json.dumps(run_mode(mode, args.threads, args.requests, args.synchronous)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks of the CPU hot paths in the agents and models, offline
+(LLM_BACKEND=stub).
+
+Each case is timed with timeit: calibrated so one sample takes at least
+--min-time, then --repeat samples, reported per call as median and
+interquartile range (robust to the odd slow sample) plus the minimum.
+Allocation is measured separately with tracemalloc: peak bytes held during
+one call, and blocks still held after it (caches, leaks).
+
+--save stores the results as the baseline (benchmarks/baselines/micro.json
+by default); later runs compare with it and exit 2 when a case's median is
+more than --tolerance slower and its whole interquartile range sits above
+the baseline's, or its peak allocation grew by more than --tolerance.
+
+    python benchmarks/micro.py                      # run all, compare with the baseline
+    python benchmarks/micro.py -k tokenize --repeat 21
+    python benchmarks/micro.py --save
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault('LLM_BACKEND', 'stub')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.agents.agents_modular import CoordinatorAgent
+from app.agents.llm_utils import clean_llm_output, fallback_asset_type
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import db, User, Asset, Transaction
+from app.models.metadata_store import content_hash
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'micro.json')
+ROWS = 2000
+
+LLM_OUTPUT = '```json\n{"asset_type": "real_estate", "estimated_value": 12000000, ' \
+             '"location": "Bandra, Mumbai, India", "description": "3BHK flat in Bandra"}\n```'
+DESCRIPTIONS = [
+    '3BHK apartment in Pune, 1450 sqft with registered deed',
+    '2021 Honda City car, 24000 km mileage',
+    'Limited edition sneakers signed by the designer',  # no keyword: scans every list
+]
+ASSET = {'id': 1234, 'user_id': 7, 'asset_type': 'real_estate', 'description': DESCRIPTIONS[0],
+         'location': 'Pune, Maharashtra', 'estimated_value': 12000000.0}
+VERIFICATION = {'status': 'verified', 'overall_score': 0.85}
+
+
+def _seed(rows: int) -> Session:
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'micro.db')}")
+    db.metadata.create_all(engine)
+    agent = TokenizationAgent()
+    coordinator = CoordinatorAgent()
+    with Session(engine) as session:
+        user = User(wallet_address='0x1')
+        for i in range(rows):
+            asset = Asset(user=user, asset_type='real_estate', description=f'{DESCRIPTIONS[0]} #{i}',
+                          location='Pune, Maharashtra', estimated_value=1e7 + i, verification_status='verified',
+                          requirements={'documents': ['deed', 'tax receipt']}, verification_score=0.85,
+                          verification_breakdown=coordinator.verify(ASSET)['breakdown'])
+            session.add(asset)
+            session.add(Transaction(asset=asset, transaction_type='tokenization', status='completed',
+                                    details=agent.tokenize_asset(dict(ASSET, id=i), VERIFICATION)))
+        session.commit()
+    return Session(engine)
+
+
+def _to_dicts(session: Session, model) -> Callable[[], list]:
+    def run():
+        # Fresh instances each time, so JSON columns are decoded as in a request
+        session.expunge_all()
+        return [row.to_dict() for row in session.query(model)]
+    return run
+
+
+def cases() -> Dict[str, Tuple[Callable[[], object], int]]:
+    """name -> (function, items per call); per-item timings divide by the second value."""
+    agent = TokenizationAgent()
+    coordinator = CoordinatorAgent()
+    metadata = agent._generate_token_metadata(ASSET, VERIFICATION)
+    contract = agent._create_mock_contract(ASSET, metadata, 'RWA_0000000000000001')
+    session = _seed(ROWS)
+    return {
+        'llm_utils.clean_llm_output': (lambda: clean_llm_output(LLM_OUTPUT), 1),
+        'llm_utils.fallback_asset_type': (lambda: [fallback_asset_type(text) for text in DESCRIPTIONS],
+                                          len(DESCRIPTIONS)),
+        'CoordinatorAgent.verify[stub]': (lambda: coordinator.verify(ASSET), 1),
+        'TokenizationAgent.tokenize_asset': (lambda: agent.tokenize_asset(ASSET, VERIFICATION), 1),
+        'TokenizationAgent._generate_token_metadata': (lambda: agent._generate_token_metadata(ASSET, VERIFICATION),
+                                                       1),
+        'TokenizationAgent._generate_token_id': (lambda: agent._generate_token_id(ASSET), 1),
+        'TokenizationAgent._generate_contract_address': (lambda: agent._generate_contract_address(ASSET), 1),
+        'TokenizationAgent._generate_transaction_hash': (lambda: agent._generate_transaction_hash(contract), 1),
+        'metadata_store.content_hash': (lambda: content_hash(metadata), 1),
+        f'Asset.to_dict[{ROWS} rows]': (_to_dicts(session, Asset), ROWS),
+        f'Transaction.to_dict[{ROWS} rows]': (_to_dicts(session, Transaction), ROWS),
+    }
+
+
+def measure(fn: Callable[[], object], items: int, repeat: int, min_time: float) -> Dict:
+    fn()  # warm caches and lazy imports
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    samples = [t / number / items * 1e6 for t in timer.repeat(repeat, number)]
+    q1, median, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        blocks = len(tracemalloc.take_snapshot().traces)
+        tracemalloc.reset_peak()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+        del result
+        retained = len(tracemalloc.take_snapshot().traces) - blocks
+    finally:
+        tracemalloc.stop()
+    return {
+        'items': items,
+        'number': number,
+        'median_us': round(median, 3),
+        'q1_us': round(q1, 3),
+        'q3_us': round(q3, 3),
+        'iqr_us': round(q3 - q1, 3),
+        'min_us': round(min(samples), 3),
+        'peak_bytes': round((peak - before) / items),
+        'retained_blocks': retained,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for name, old in baseline.get('cases', {}).items():
+        new = results['cases'].get(name)
+        if not new:
+            continue
+        if new['median_us'] > old['median_us'] * (1 + tolerance) and new['q1_us'] > old['q3_us']:
+            regressions.append(f"{name}: median {old['median_us']} -> {new['median_us']} us")
+        if new['peak_bytes'] > old['peak_bytes'] * (1 + tolerance) and new['peak_bytes'] - old['peak_bytes'] > 1024:
+            regressions.append(f"{name}: peak {old['peak_bytes']} -> {new['peak_bytes']} bytes")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', '--filter', default='', help='only cases whose name contains this')
+    parser.add_argument('--repeat', type=int, default=11)
+    parser.add_argument('--min-time', type=float, default=0.05, help='seconds per sample')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--output', help='also write the results here')
+    args = parser.parse_args()
+
+    results = {'python': platform.python_version(), 'machine': platform.machine(), 'cases': {}}
+    print(f"{'case':48} {'median us':>10} {'iqr':>8} {'min':>9} {'peak B':>9} {'kept':>5}")
+    for name, (fn, items) in cases().items():
+        if args.filter not in name:
+            continue
+        row = measure(fn, items, args.repeat, args.min_time)
+        results['cases'][name] = row
+        print(f"{name:48} {row['median_us']:>10} {row['iqr_us']:>8} {row['min_us']:>9} "
+              f"{row['peak_bytes']:>9} {row['retained_blocks']:>5}")
+
+    for path in filter(None, (args.output, args.baseline if args.save else None)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if path == args.baseline and os.path.exists(path) and args.filter:
+            # A filtered run only replaces its own cases
+            with open(path) as f:
+                results = dict(results, cases=dict(json.load(f)['cases'], **results['cases']))
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+    if args.save or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if (baseline.get('python'), baseline.get('machine')) != (results['python'], results['machine']):
+        print(f"⚠ Baseline is from Python {baseline.get('python')} on {baseline.get('machine')}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} regressions against {args.baseline}:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 2
+    print(f"✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+sys.path.append('.')
+
+from app.main import app, db
+from app.agents.llm_utils import extract_asset_info_local, extract_asset_info_with_llm
+from app.models.bulk_load import Checkpoint, load_file
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bulk-load a JSONL file of asset descriptions "
+                    "({wallet_address, user_input, email?} per line), resumable.")
+    parser.add_argument('path', help='JSONL file to load')
+    parser.add_argument('--batch-size', type=int, default=1000, help='lines per transaction / checkpoint')
+    parser.add_argument('--concurrency', type=int, default=8, help='parallel extractions')
+    parser.add_argument('--llm', action='store_true',
+                        help='extract with the Gemini LLM instead of the local fast path')
+    parser.add_argument('--checkpoint', help='checkpoint file (default: <path>.checkpoint)')
+    parser.add_argument('--restart', action='store_true', help='ignore an existing checkpoint')
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or f"{args.path}.checkpoint"
+    if args.restart:
+        Checkpoint(checkpoint_path).clear()
+    extract = extract_asset_info_with_llm if args.llm else extract_asset_info_local
+
+    def report(state):
+        print(f"   {state['lines']} lines, {state['loaded']} loaded, {state['errors']} skipped "
+              f"({state['lines_per_sec']} lines/s)")
+
+    with app.app_context():
+        start = Checkpoint(checkpoint_path).load()
+        if start['offset']:
+            print(f"🔄 Resuming {args.path} at line {start['lines'] + 1} (byte {start['offset']})")
+        else:
+            print(f"📥 Loading {args.path}")
+        try:
+            result = load_file(db.engine, args.path, extract, args.batch_size, args.concurrency,
+                               checkpoint_path, report)
+        except KeyboardInterrupt:
+            print(f"\n⏸️  Interrupted; rerun the same command to resume from {checkpoint_path}")
+            sys.exit(130)
+        print(f"✅ Done: {result['loaded']} assets from {result['lines']} lines "
+              f"({result['errors']} skipped) in {result['seconds']}s, {result['lines_per_sec']} lines/s")
+
+
+if __name__ == '__main__':
+    main()
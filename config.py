@@ -8,7 +8,96 @@ class Config:
     
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
-    LOG_FILE = os.environ.get('LOG_FILE') or 'logs/app.log'
+    LOG_FILE = os.environ.get('LOG_FILE') or 'logs/app.log'  # JSON lines; '{pid}' = one file per worker
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES') or 10 * 1024 * 1024)
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT') or 5)
+    
+    # SQLite performance profile (applied per connection by app/models/engine.py)
+    SQLITE_PROFILE_ENABLED = os.environ.get('SQLITE_PROFILE_ENABLED', 'true').lower() == 'true'
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 256 * 1024 * 1024)
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE') or -64000)  # negative = KiB
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000)
+    SQLITE_READ_POOL_SIZE = int(os.environ.get('SQLITE_READ_POOL_SIZE') or 8)
+    
+    # Transaction history: archive after N days, purge archive after N days (0 = keep)
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS') or 90)
+    ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS') or 0)
+    HISTORY_PAGE_SIZE = int(os.environ.get('HISTORY_PAGE_SIZE') or 20)
+    
+    # Intake: wallet_address -> user id LRU (per worker)
+    WALLET_CACHE_SIZE = int(os.environ.get('WALLET_CACHE_SIZE') or 10000)
+    
+    # /api/search: rank only the newest N full-text matches
+    SEARCH_MAX_CANDIDATES = int(os.environ.get('SEARCH_MAX_CANDIDATES') or 5000)
+    
+    # /api/analytics: cached aggregates are recomputed after local writes or this long
+    ANALYTICS_TTL_SECONDS = float(os.environ.get('ANALYTICS_TTL_SECONDS') or 30)
+    
+    # /api/tokenize/batch: most assets minted under one Merkle root
+    TOKENIZE_BATCH_MAX = int(os.environ.get('TOKENIZE_BATCH_MAX') or 5000)
+    
+    # Token ownership ledger: append-only log + snapshot every N records
+    OWNERSHIP_LEDGER_DIR = os.environ.get('OWNERSHIP_LEDGER_DIR') or 'ledger'
+    OWNERSHIP_SNAPSHOT_EVERY = int(os.environ.get('OWNERSHIP_SNAPSHOT_EVERY') or 10000)
+    OWNERSHIP_LEDGER_FSYNC = os.environ.get('OWNERSHIP_LEDGER_FSYNC', 'false').lower() == 'true'
+    # /api/shares/transfer: most share moves applied atomically in one batch
+    SHARE_TRANSFER_BATCH_MAX = int(os.environ.get('SHARE_TRANSFER_BATCH_MAX') or 1000)
+    
+    # Token id / transaction hash allocator: ids leased from the database per block
+    ID_BLOCK_SIZE = int(os.environ.get('ID_BLOCK_SIZE') or 1000)
+    
+    # Token metadata: tokenURI base and per-worker cache of served bodies
+    METADATA_BASE_URL = os.environ.get('METADATA_BASE_URL') or 'http://localhost:5000/metadata/'
+    METADATA_CACHE_SIZE = int(os.environ.get('METADATA_CACHE_SIZE') or 10000)
+    
+    # Mock chain: mempool + block producer; run a single worker so receipts stay visible
+    CHAIN_SIMULATOR_ENABLED = os.environ.get('CHAIN_SIMULATOR_ENABLED', 'false').lower() == 'true'
+    CHAIN_BLOCK_TIME = float(os.environ.get('CHAIN_BLOCK_TIME') or 2.0)
+    CHAIN_BLOCK_SIZE = int(os.environ.get('CHAIN_BLOCK_SIZE') or 500)
+    CHAIN_CONFIRM_TIMEOUT = float(os.environ.get('CHAIN_CONFIRM_TIMEOUT') or 0)
+    # Newest blocks and receipts kept in memory; older transactions are reported unknown
+    CHAIN_BLOCK_HISTORY = int(os.environ.get('CHAIN_BLOCK_HISTORY') or 10000)
+    CHAIN_RECEIPT_HISTORY = int(os.environ.get('CHAIN_RECEIPT_HISTORY') or 100000)
+    
+    # ASGI mode (uvicorn app.asgi:app): async DB pool, threads for the Flask routes
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE') or 8)
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS') or 16)
+    
+    # /api/events (SSE): outbox polled once per interval per worker, streams
+    # closed after N seconds (clients resume), events kept N days (archive_transactions.py)
+    EVENTS_STREAM_ENABLED = os.environ.get('EVENTS_STREAM_ENABLED', 'true').lower() == 'true'
+    EVENTS_POLL_MS = float(os.environ.get('EVENTS_POLL_MS') or 500)
+    EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('EVENTS_HEARTBEAT_SECONDS') or 15)
+    EVENTS_STREAM_SECONDS = float(os.environ.get('EVENTS_STREAM_SECONDS') or 300)
+    EVENTS_REPLAY_MAX = int(os.environ.get('EVENTS_REPLAY_MAX') or 1000)
+    EVENTS_RETENTION_DAYS = int(os.environ.get('EVENTS_RETENTION_DAYS') or 7)
+    
+    # /metrics (Prometheus); under gunicorn set PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    
+    # Request tracing: sampled and slow traces kept per worker for /debug/traces
+    # (endpoint off unless enabled); Server-Timing/X-Trace-Id headers only on request
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() == 'true'
+    TRACE_HEADERS = os.environ.get('TRACE_HEADERS', 'false').lower() == 'true'
+    TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE') or 0.01)
+    TRACE_SLOW_MS = float(os.environ.get('TRACE_SLOW_MS') or 1000)
+    TRACE_BUFFER_SIZE = int(os.environ.get('TRACE_BUFFER_SIZE') or 200)
+    TRACE_DEBUG_ENDPOINT = os.environ.get('TRACE_DEBUG_ENDPOINT', 'false').lower() == 'true'
+    TRACE_PROFILE = os.environ.get('TRACE_PROFILE', 'false').lower() == 'true'
+    TRACE_PROFILE_INTERVAL_MS = float(os.environ.get('TRACE_PROFILE_INTERVAL_MS') or 5)
+    
+    # backup_db.py: online SQLite backups (full + page-level incrementals)
+    BACKUP_DIR = os.environ.get('BACKUP_DIR') or 'backups'
+    BACKUP_KEEP_FULL = int(os.environ.get('BACKUP_KEEP_FULL') or 5)
+    BACKUP_MAX_CHAIN = int(os.environ.get('BACKUP_MAX_CHAIN') or 24)
+    BACKUP_STEP_PAGES = int(os.environ.get('BACKUP_STEP_PAGES') or 1024)
+    
+    # Write path: merge concurrent request writes into one commit
+    GROUP_COMMIT_ENABLED = os.environ.get('GROUP_COMMIT_ENABLED', 'false').lower() == 'true'
+    GROUP_COMMIT_WINDOW_MS = float(os.environ.get('GROUP_COMMIT_WINDOW_MS') or 5)
+    GROUP_COMMIT_MAX_BATCH = int(os.environ.get('GROUP_COMMIT_MAX_BATCH') or 64)
     
     # API Rate Limiting
     RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL') or 'memory://'
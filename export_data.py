@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+from datetime import datetime
+sys.path.append('.')
+
+from app.main import app, db
+from app.models.export import TABLES, FORMATS, export_tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream users, assets and transactions to JSONL, CSV or Parquet.")
+    parser.add_argument('--tables', default=','.join(TABLES), help=f"comma-separated subset of {','.join(TABLES)}")
+    parser.add_argument('--format', choices=FORMATS, default='jsonl')
+    parser.add_argument('--out', default='exports', help='output directory (one file per table)')
+    parser.add_argument('--since', type=datetime.fromisoformat, help='created_at >= this ISO date')
+    parser.add_argument('--until', type=datetime.fromisoformat, help='created_at < this ISO date')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=3, help='tables exported in parallel')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.tables.split(',') if name.strip()]
+    unknown = [name for name in names if name not in TABLES]
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(unknown)}")
+
+    with app.app_context():
+        print(f"📤 Exporting {', '.join(names)} as {args.format} to {args.out}/")
+        for result in export_tables(db.engine, names, args.out, args.format, args.since, args.until,
+                                    args.batch_size, args.workers):
+            print(f"✅ {result['table']}: {result['rows']} rows in {result['seconds']}s "
+                  f"({result['rows_per_sec']} rows/s) -> {result['path']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+gunicorn settings: gunicorn -c gunicorn.conf.py app.main:app
+
+Workers record Prometheus metrics to files in PROMETHEUS_MULTIPROC_DIR so
+/metrics can sum them; the directory is emptied when the server starts and
+a dead worker's live gauges are dropped when it exits.
+
+Serve the /api/events stream with GUNICORN_THREADS > 1 or from app.asgi.
+"""
+import os
+import shutil
+
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/rwa_prometheus')
+# One log file per worker: RotatingFileHandler renames the file it is writing,
+# which races when several processes share it (monitor_logs.sh reads them all)
+os.environ.setdefault('LOG_FILE', 'logs/app-{pid}.log')
+
+bind = os.environ.get('GUNICORN_BIND') or '0.0.0.0:5000'
+workers = int(os.environ.get('GUNICORN_WORKERS') or 4)
+threads = int(os.environ.get('GUNICORN_THREADS') or 1)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 60)
+
+# An open /api/events stream would hold a sync worker for its whole life;
+# without threads dashboards fall back to conditional polling (ETag / 304)
+if threads == 1:
+    os.environ.setdefault('EVENTS_STREAM_ENABLED', 'false')
+
+
+def on_starting(server):
+    # Values left by a previous run would be summed into the new one
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
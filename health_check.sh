@@ -42,6 +42,16 @@ else
   echo "Response: $STATS_RESPONSE"
 fi
 
+# Test 5: Metrics (load and saturation, summed across workers)
+echo "Testing metrics endpoint..."
+METRICS_RESPONSE=$(curl -s "$BASE_URL/metrics")
+if echo "$METRICS_RESPONSE" | grep -q '^http_requests_total'; then
+  echo "✅ Metrics: OK"
+  echo "$METRICS_RESPONSE" | grep -E '^(http_requests_in_progress|db_pool_checked_out|asset_intakes_total|asset_verifications_total|tokens_minted_total)' | sed 's/^/   /'
+else
+  echo "❌ Metrics: FAILED"
+fi
+
 # Summary
 echo -e "\n📊 System Status Summary:"
 echo "Time: $(date)"
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Single-pass summary of the application log.
+
+Streams one or more log files (or stdin with '-') line by line and
+aggregates levels, the most frequent errors, and per-endpoint request
+volume, status classes and latency percentiles from the "request" records.
+JSON lines are parsed fully. Lines in the old plain-text format only count
+towards levels and errors.
+
+    python log_report.py                          # logs/app.log
+    python log_report.py logs/app.log.1 logs/app.log --since 60
+    tail -n 100000 logs/app.log | python log_report.py - --json
+"""
+import argparse
+import heapq
+import json
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+PERCENTILES = (50, 95, 99)
+TEXT_LINE = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),\d+ - (\w+) - (.*)$')
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))]
+
+
+def parse_line(line: str):
+    """(timestamp, record dict) of a JSON or plain-text line, or None."""
+    line = line.strip()
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+            return datetime.fromisoformat(record['ts']), record
+        except (ValueError, KeyError):
+            return None
+    match = TEXT_LINE.match(line)
+    if match:
+        return datetime.fromisoformat(match.group(1)), {'level': match.group(2), 'msg': match.group(3)}
+    return None
+
+
+class Report:
+    def __init__(self, recent_errors: int = 10):
+        self.lines = 0
+        self.unparsed = 0
+        self.first = self.last = None
+        self.levels = Counter()
+        self.errors = Counter()
+        # Newest errors by timestamp: several workers' files are read one after another
+        self.recent = []
+        self.recent_errors = recent_errors
+        self.counts = Counter()
+        self.statuses = defaultdict(Counter)
+        self.latencies = defaultdict(lambda: array('d'))
+
+    def add(self, ts: datetime, record: dict):
+        self.first = min(self.first, ts) if self.first else ts
+        self.last = max(self.last, ts) if self.last else ts
+        level = record.get('level', '')
+        self.levels[level] += 1
+        if level in ('ERROR', 'CRITICAL'):
+            # Group by the message up to its details: "[VERIFY ERROR] ..." -> one bucket per tag
+            self.errors[record.get('msg', '')[:60]] += 1
+            entry = (ts, f"{ts.isoformat(sep=' ')} {record.get('msg', '')}")
+            if len(self.recent) < self.recent_errors:
+                heapq.heappush(self.recent, entry)
+            elif self.recent_errors:
+                heapq.heappushpop(self.recent, entry)
+        if 'status' in record and 'duration_ms' in record:
+            endpoint = f"{record.get('method', '?')} {record.get('route') or record.get('path')}"
+            self.counts[endpoint] += 1
+            self.statuses[endpoint][f"{record['status'] // 100}xx"] += 1
+            self.latencies[endpoint].append(record['duration_ms'])
+
+    def summary(self, top: int = 10) -> dict:
+        endpoints = {}
+        everything = []
+        for endpoint, count in self.counts.most_common():
+            ordered = sorted(self.latencies[endpoint])
+            everything.extend(ordered)
+            endpoints[endpoint] = {
+                'count': count,
+                'statuses': dict(self.statuses[endpoint]),
+                **{f'p{p}_ms': percentile(ordered, p) for p in PERCENTILES},
+                'max_ms': ordered[-1],
+            }
+        everything.sort()
+        span = (self.last - self.first).total_seconds() if self.first else 0
+        return {
+            'lines': self.lines,
+            'unparsed': self.unparsed,
+            'from': self.first.isoformat() if self.first else None,
+            'to': self.last.isoformat() if self.last else None,
+            'levels': dict(self.levels),
+            'requests': len(everything),
+            'requests_per_s': round(len(everything) / span, 2) if span else None,
+            **{f'p{p}_ms': percentile(everything, p) for p in PERCENTILES},
+            'endpoints': endpoints,
+            'top_errors': self.errors.most_common(top),
+            'recent_errors': [line for _, line in sorted(self.recent)],
+        }
+
+
+def read(paths, report: Report, since=None):
+    for path in paths:
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', errors='replace')
+        try:
+            for line in stream:
+                report.lines += 1
+                parsed = parse_line(line)
+                if parsed is None:
+                    report.unparsed += 1
+                elif since is None or parsed[0] >= since:
+                    report.add(*parsed)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def print_summary(summary: dict):
+    print("📊 RWA Tokenization Log Report")
+    print("=" * 30)
+    print(f"{summary['lines']} lines ({summary['unparsed']} unparsed), {summary['from']} .. {summary['to']}")
+    print("Levels: " + ', '.join(f"{level} {count}" for level, count in sorted(summary['levels'].items())))
+    if summary['requests']:
+        print(f"\n📈 {summary['requests']} requests ({summary['requests_per_s']}/s), "
+              f"p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms")
+        print(f"{'endpoint':44} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  statuses")
+        for endpoint, row in summary['endpoints'].items():
+            statuses = ' '.join(f"{status}:{n}" for status, n in sorted(row['statuses'].items()))
+            print(f"{endpoint:44} {row['count']:>7} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+                  f"{row['p99_ms']:>8} {row['max_ms']:>8}  {statuses}")
+    if summary['top_errors']:
+        print("\n🔍 Top errors:")
+        for message, count in summary['top_errors']:
+            print(f"{count:>7}  {message}")
+        print("\n🕒 Recent errors:")
+        for line in summary['recent_errors']:
+            print(f"   {line}")
+    else:
+        print("\n✅ No errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-pass summary of the application log.")
+    parser.add_argument('paths', nargs='*', default=['logs/app.log'], help="log files, '-' for stdin")
+    parser.add_argument('--since', type=float, help='only the last N minutes')
+    parser.add_argument('--top', type=int, default=10, help='most frequent errors to list')
+    parser.add_argument('--recent', type=int, default=10, help='latest errors to list')
+    parser.add_argument('--json', action='store_true', help='print the summary as JSON')
+    args = parser.parse_args()
+
+    report = Report(recent_errors=args.recent)
+    since = datetime.now() - timedelta(minutes=args.since) if args.since else None
+    try:
+        read(args.paths, report, since)
+    except FileNotFoundError as e:
+        print(f"❌ Log file not found: {e.filename}")
+        sys.exit(1)
+    summary = report.summary(args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == '__main__':
+    main()
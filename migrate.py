@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+sys.path.append('.')
+
+from flask import Flask
+
+from config import Config
+from app.models import migrations
+from app.models.database import db
+
+
+def create_app():
+    """
+    Just the database, on the same file as the app (relative SQLite paths
+    resolve under instance/). Importing app.main would upgrade the schema
+    to head before any command runs.
+    """
+    app = Flask(__name__, instance_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance'))
+    app.config['SQLALCHEMY_DATABASE_URI'] = Config.SQLALCHEMY_DATABASE_URI
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply, verify and roll back schema migrations.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    up = sub.add_parser('upgrade', help='apply pending migrations')
+    up.add_argument('--to', type=int, default=None, help='target version (default: head)')
+    down = sub.add_parser('downgrade', help='roll back to a version')
+    down.add_argument('--to', type=int, required=True)
+    sub.add_parser('status', help='show current and head version')
+    sub.add_parser('verify', help='check version, indexes and hot query plans')
+    sub.add_parser('explain', help='print EXPLAIN QUERY PLAN for every hot query')
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        engine = db.engine
+        if args.command == 'upgrade':
+            applied = migrations.upgrade(engine, args.to)
+            print(f"✅ Applied migrations: {applied}" if applied else "✅ Already up to date")
+        elif args.command == 'downgrade':
+            rolled_back = migrations.downgrade(engine, args.to)
+            print(f"⏪ Rolled back migrations: {rolled_back}" if rolled_back else "Nothing to roll back")
+        elif args.command == 'status':
+            print(f"Schema version: {migrations.current_version(engine)} (head {migrations.HEAD})")
+        elif args.command == 'explain':
+            for name, result in migrations.check_query_plans(engine).items():
+                mark = "✅" if result['ok'] else "❌"
+                print(f"{mark} {name} (expects {result['index']})")
+                for line in result['plan']:
+                    print(f"    {line}")
+        elif args.command == 'verify':
+            problems = migrations.verify(engine)
+            for problem in problems:
+                print(f"❌ {problem}")
+            if problems:
+                sys.exit(1)
+            print("🎉 Schema, indexes and query plans verified")
+
+
+if __name__ == '__main__':
+    main()
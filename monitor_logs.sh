@@ -1,21 +1,18 @@
 #!/bin/bash
-LOG_FILE="logs/app.log"
-echo "📊 RWA Tokenization Log Analysis"
-echo "================================"
-if [ ! -f "$LOG_FILE" ]; then
-  echo "❌ Log file not found: $LOG_FILE"
+# Every process's file: '{pid}' in LOG_FILE matches any worker; by default
+# logs/app.log (one process) and logs/app-<pid>.log (gunicorn workers)
+PATTERN="${LOG_FILE:-logs/app*.log}"
+PATTERN="${PATTERN//\{pid\}/*}"
+LOG_FILES=()
+for path in $PATTERN; do
+  [ -f "$path" ] && LOG_FILES+=("$path")
+done
+if [ ${#LOG_FILES[@]} -eq 0 ]; then
+  echo "❌ Log file not found: $PATTERN"
   exit 1
 fi
-echo "📈 Recent Activity (Last 50 lines):"
-tail -50 "$LOG_FILE"
+# One pass over the logs: levels, per-endpoint volume and latency, top and recent errors
+python log_report.py "${LOG_FILES[@]}" "$@"
 
-echo -e "\n🔍 Error Summary:"
-grep -c "ERROR" "$LOG_FILE" && echo "Total errors found" || echo "No errors found"
-
-echo -e "\n✅ Success Summary:"
-grep -c "Asset created successfully" "$LOG_FILE" && echo "Assets created" || echo "No assets"
-grep -c "Verification completed" "$LOG_FILE" && echo "Verifications completed" || echo "No verifications"
-grep -c "Tokenization completed" "$LOG_FILE" && echo "Tokenizations completed" || echo "No tokenizations"
-
-echo -e "\n🕒 Recent Errors (Last 10):"
-grep "ERROR" "$LOG_FILE" | tail -10
+echo -e "\n📈 Recent Activity (Last 20 lines):"
+tail -n 20 "${LOG_FILES[@]}"
@@ -1,118 +1,394 @@
 #!/usr/bin/env python3
-import time
-import requests
+"""
+Load generator for the RWA API.
+
+Arrivals are open-loop: a Poisson process at --rate flows per second decides
+when each flow starts, however long earlier ones take, so an overloaded
+server builds a queue instead of slowing the client down. Flow latency is
+measured from the scheduled start and so includes that queueing; request
+latency is the time on the wire.
+
+Scenarios are weighted mixes of flows (see FLOWS):
+  onboarding  intake -> verify -> tokenize -> metadata
+  dashboard   stats, a wallet's assets, one asset, search, holdings
+  mixed       80% dashboard, 20% onboarding
+or any --mix such as dashboard=0.9,onboarding=0.1.
+
+Run the server with LLM_BACKEND=stub to stay offline, or let --spawn start
+one on a throwaway database:
+
+    python performance_test.py --spawn --scenario mixed --rate 50 --duration 30 --output report.json
+    python performance_test.py --scenario dashboard --baseline perf_baseline.json
+    python performance_test.py --spawn --save-baseline perf_baseline.json
+
+Exit status: 0 ok, 1 server unreachable, 2 regression against --baseline.
+"""
+import argparse
 import json
+import os
+import random
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
 
 BASE_URL = "http://localhost:5000"
+PERCENTILES = (50, 95, 99)
+TAIL_SAMPLES = 5
+# Settings a report is only comparable under
+COMPARABLE = ('mix', 'rate', 'duration', 'concurrency', 'workers')
+SCENARIOS = {
+    'onboarding': {'onboarding': 1.0},
+    'dashboard': {'dashboard': 1.0},
+    'mixed': {'dashboard': 0.8, 'onboarding': 0.2},
+}
+DESCRIPTIONS = [
+    "Tokenize my 3BHK flat in {city} worth ₹{value} lakh, 1450 sqft with registered sale deed",
+    "2021 Honda City car in {city}, 24000 km mileage, valued at ₹{value} lakh",
+    "Oil on canvas painting by a known artist, displayed in {city}, worth ₹{value} lakh",
+    "CNC machine with manufacturer warranty and serial number, located in {city}, ₹{value} lakh",
+    "500 grams of 24k gold, purity certified, stored in {city}, worth ₹{value} lakh",
+]
+CITIES = ['Pune', 'Mumbai', 'Bangalore', 'Chennai', 'Jaipur', 'Kochi']
 
-def test_endpoint(endpoint, method="GET", data=None):
-    """Test a single endpoint and measure response time"""
-    start_time = time.time()
-    try:
-        if method == "GET":
-            response = requests.get(f"{BASE_URL}{endpoint}")
-        elif method == "POST":
-            response = requests.post(f"{BASE_URL}{endpoint}", json=data)
-        else:
-            raise ValueError("Unsupported HTTP method")
-
-        end_time = time.time()
-        response_time = (end_time - start_time) * 1000  # in milliseconds
-
-        return {
-            'endpoint': endpoint,
-            'method': method,
-            'status_code': response.status_code,
-            'response_time_ms': round(response_time, 2),
-            'success': response.status_code < 400
-        }
-
-    except Exception as e:
-        return {
-            'endpoint': endpoint,
-            'method': method,
-            'error': str(e),
-            'success': False
-        }
-
-def run_performance_tests():
-    print("🚀 Running Performance Tests")
-    print("=" * 50)
-
-    test_cases = [
-        ('/api/health', 'GET'),
-        ('/api/stats', 'GET'),
-        ('/', 'GET'),
-        ('/static/css/style.css', 'GET'),
-        ('/static/js/app.js', 'GET'),
-        ('/api/intake', 'POST', {
-            'wallet_address': '0x742d35Cc6e34d8d7C15fE14c123456789abcdef0',
-            'user_input': 'Tokenize my $100,000 car, a 2020 Honda Civic',
-            'email': 'test@example.com'
-        })
-    ]
-
-    results = []
-
-    for case in test_cases:
-        endpoint = case[0]
-        method = case[1]
-        data = case[2] if len(case) > 2 else None
-
-        print(f"Testing {method} {endpoint}...")
-        result = test_endpoint(endpoint, method, data)
-        results.append(result)
-
-        if result['success']:
-            print(f"✅ {result['response_time_ms']} ms")
-        else:
-            error_msg = result.get("error") or f"HTTP {result.get('status_code', 'N/A')}"
-            print(f"❌ Failed: {error_msg}")
-
-    print("\n📊 Performance Summary:")
-    print("=" * 50)
-
-    successful = [r for r in results if r['success']]
-    if successful:
-        avg = sum(r['response_time_ms'] for r in successful) / len(successful)
-        print(f"✅ Successful requests: {len(successful)}/{len(results)}")
-        print(f"📈 Average Response Time: {avg:.2f} ms")
+
+def percentile(values: List[float], p: int) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def arrival_times(rate: float, duration: float, rng: random.Random) -> List[float]:
+    """Offsets (seconds) of a Poisson process with `rate` arrivals per second."""
+    times, t = [], rng.expovariate(rate)
+    while t < duration:
+        times.append(t)
+        t += rng.expovariate(rate)
+    return times
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'dashboard=0.8,onboarding=0.2' (or a scenario name) -> normalised flow weights."""
+    if text in SCENARIOS:
+        weights = SCENARIOS[text]
     else:
-        print("❌ No successful responses")
-
-def load_test(num_requests=10):
-    """Simple load test on /api/health"""
-    print(f"\n🔥 Load Testing with {num_requests} concurrent requests")
-    print("=" * 50)
-
-    def make_request():
-        return test_endpoint('/api/health')
-
-    start = time.time()
-    with ThreadPoolExecutor(max_workers=num_requests) as executor:
-        futures = [executor.submit(make_request) for _ in range(num_requests)]
-        results = [f.result() for f in futures]
-    end = time.time()
-
-    total_time = end - start
-    successful = [r for r in results if r['success']]
-    if successful:
-        avg = sum(r['response_time_ms'] for r in successful) / len(successful)
-        print(f"✅ Successful: {len(successful)}/{num_requests}")
-        print(f"⏱ Total Time: {total_time:.2f} seconds")
-        print(f"📊 Requests/sec: {num_requests / total_time:.2f}")
-        print(f"📈 Avg Response Time: {avg:.2f} ms")
+        weights = {}
+        for part in text.split(','):
+            name, _, weight = part.partition('=')
+            weights[name.strip()] = float(weight or 1)
+    unknown = set(weights) - set(FLOWS)
+    if unknown:
+        raise ValueError(f"Unknown flows: {', '.join(sorted(unknown))}")
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+# --- client ------------------------------------------------------------
+
+
+class Recorder:
+    """Latencies and outcomes per request and per flow, shared by all worker threads."""
+
+    def __init__(self):
+        self.requests: Dict[str, List[Tuple[float, bool]]] = defaultdict(list)
+        self.flows: Dict[str, List[Tuple[float, bool]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def request(self, name: str, latency: float, ok: bool):
+        with self._lock:
+            self.requests[name].append((latency, ok))
+
+    def flow(self, name: str, latency: float, ok: bool):
+        with self._lock:
+            self.flows[name].append((latency, ok))
+
+
+class FlowFailed(Exception):
+    pass
+
+
+class Client:
+    def __init__(self, base_url: str, recorder: Optional[Recorder], timeout: float = 30.0):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # One keep-alive connection per worker thread
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def call(self, name: str, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        start = time.perf_counter()
+        ok, body = False, {}
+        try:
+            response = self._session().request(method, f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+            ok = response.status_code < 400
+            if 'json' in response.headers.get('Content-Type', ''):
+                body = response.json()
+        except requests.RequestException:
+            pass
+        if self.recorder:
+            self.recorder.request(name, time.perf_counter() - start, ok)
+        if not ok:
+            raise FlowFailed(name)
+        return body
+
+
+# --- flows -------------------------------------------------------------
+
+
+class State:
+    """Wallets, assets and tokens created so far, for read flows to pick from."""
+
+    def __init__(self, rng: random.Random, wallets: int = 50):
+        self.rng = rng
+        self.wallets = [f"0x{rng.getrandbits(160):040x}" for _ in range(wallets)]
+        self.assets: List[Tuple[str, int]] = []
+        self.tokens: List[str] = []
+        self._lock = threading.Lock()
+
+    def pick(self, items):
+        with self._lock:
+            return self.rng.choice(items) if items else None
+
+    def add(self, wallet: str, asset_id: int, token_id: Optional[str]):
+        with self._lock:
+            self.assets.append((wallet, asset_id))
+            if token_id:
+                self.tokens.append(token_id)
+
+
+def onboarding(client: Client, state: State):
+    wallet = state.pick(state.wallets)
+    description = state.pick(DESCRIPTIONS).format(city=state.pick(CITIES), value=state.rng.randint(5, 500))
+    asset = client.call('POST /api/intake', 'POST', '/api/intake',
+                        {'wallet_address': wallet, 'user_input': description})['asset']
+    verification = client.call('POST /api/verify', 'POST', f"/api/verify/{asset['id']}")['verification_result']
+    token_id = None
+    if verification['status'] == 'verified':
+        token_id = client.call('POST /api/tokenize', 'POST',
+                               f"/api/tokenize/{asset['id']}")['tokenization_result']['token_id']
+        client.call('GET /metadata', 'GET', f"/metadata/{token_id}")
+    state.add(wallet, asset['id'], token_id)
+
+
+def dashboard(client: Client, state: State):
+    client.call('GET /api/stats', 'GET', '/api/stats')
+    picked = state.pick(state.assets)
+    wallet, asset_id = picked if picked else (state.pick(state.wallets), None)
+    client.call('GET /api/assets', 'GET', f"/api/assets/{wallet}")
+    if asset_id is not None:
+        client.call('GET /api/asset', 'GET', f"/api/asset/{asset_id}")
+    client.call('GET /api/search', 'GET', f"/api/search?q={state.pick(CITIES)}")
+    client.call('GET /api/holdings', 'GET', f"/api/holdings/{wallet}")
+
+
+FLOWS: Dict[str, Callable[[Client, State], None]] = {
+    'onboarding': onboarding,
+    'dashboard': dashboard,
+}
+
+
+# --- run ---------------------------------------------------------------
+
+
+def run_load(client: Client, state: State, mix: Dict[str, float], rate: float, duration: float,
+             concurrency: int, rng: random.Random) -> float:
+    """Starts flows at Poisson arrival times for `duration` seconds; returns the elapsed time."""
+    names, weights = list(mix), list(mix.values())
+
+    def run(name: str, scheduled: float):
+        ok = True
+        try:
+            FLOWS[name](client, state)
+        except (FlowFailed, KeyError, TypeError):
+            ok = False
+        client.recorder.flow(name, time.perf_counter() - scheduled, ok)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for offset in arrival_times(rate, duration, rng):
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # Late arrivals (client behind schedule) still count from when they were due
+            executor.submit(run, rng.choices(names, weights)[0], start + offset)
+    return time.perf_counter() - start
+
+
+def summarize(samples: List[Tuple[float, bool]], elapsed: float) -> Dict:
+    latencies = [latency * 1000 for latency, _ in samples]
+    errors = sum(1 for _, ok in samples if not ok)
+    summary = {
+        'count': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'throughput_per_s': round((len(samples) - errors) / elapsed, 2) if elapsed else 0.0,
+    }
+    summary.update({f'p{p}_ms': round(percentile(latencies, p), 2) if latencies else None for p in PERCENTILES})
+    summary['max_ms'] = round(max(latencies), 2) if latencies else None
+    return summary
+
+
+def build_report(recorder: Recorder, config: Dict, elapsed: float) -> Dict:
+    return {
+        'generated_at': datetime.utcnow().isoformat(),
+        'config': config,
+        'elapsed_s': round(elapsed, 3),
+        'flows': {name: summarize(samples, elapsed) for name, samples in sorted(recorder.flows.items())},
+        'requests': {name: summarize(samples, elapsed) for name, samples in sorted(recorder.requests.items())},
+    }
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """
+    Regressions of `report` against `baseline`: p95/p99 more than `tolerance`
+    (and `min_delta_ms`) slower, throughput more than `tolerance` lower, or
+    error rate more than one point higher. A percentile is only compared
+    when both runs have at least TAIL_SAMPLES samples beyond it (p99 needs
+    500 requests), since fewer make it mostly noise. Entries missing on
+    either side are skipped.
+    """
+    regressions = []
+    for section in ('flows', 'requests'):
+        for name, before in baseline.get(section, {}).items():
+            after = report.get(section, {}).get(name)
+            if not after:
+                continue
+            samples = min(before.get('count', 0), after['count'])
+            for p in (95, 99):
+                key = f'p{p}_ms'
+                old, new = before.get(key), after.get(key)
+                if old is None or new is None or samples * (100 - p) / 100 < TAIL_SAMPLES:
+                    continue
+                if new > old * (1 + tolerance) and new - old >= min_delta_ms:
+                    regressions.append(f"{section} {name}: {key} {old} -> {new}")
+            old, new = before.get('throughput_per_s'), after.get('throughput_per_s')
+            if old and new is not None and new < old * (1 - tolerance):
+                regressions.append(f"{section} {name}: throughput_per_s {old} -> {new}")
+            if after.get('error_rate', 0) > before.get('error_rate', 0) + 0.01:
+                regressions.append(f"{section} {name}: error_rate {before.get('error_rate')} -> {after['error_rate']}")
+    return regressions
+
+
+def print_report(report: Dict):
+    print(f"{'':28} {'count':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for section in ('flows', 'requests'):
+        for name, row in report[section].items():
+            print(f"{section[:-1] + ' ' + name:28} {row['count']:>7} {row['errors']:>5} {row['throughput_per_s']:>8} "
+                  f"{row['p50_ms']!s:>8} {row['p95_ms']!s:>8} {row['p99_ms']!s:>8}")
+
+
+# --- server ------------------------------------------------------------
+
+
+def spawn_server(port: int, workers: int) -> subprocess.Popen:
+    """Starts the app on a throwaway database and ledger with the stub LLM backend."""
+    workdir = tempfile.mkdtemp(prefix='rwa-load-')
+    env = dict(os.environ, LLM_BACKEND='stub', DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+               OWNERSHIP_LEDGER_DIR=os.path.join(workdir, 'ledger'))
+    if workers:
+        command = ['gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--threads', '4',
+                   'app.main:app']
     else:
-        print("❌ All load test requests failed")
+        command = [sys.executable, '-m', 'flask', '--app', 'app.main', 'run', '--port', str(port), '--no-reload']
+    return subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-if __name__ == '__main__':
+
+def wait_healthy(base_url: str, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/api/health", timeout=3).ok:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default=BASE_URL)
+    parser.add_argument('--scenario', default='mixed', help=f"{', '.join(SCENARIOS)} or flow=weight,...")
+    parser.add_argument('--rate', type=float, default=20.0, help='flow arrivals per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of arrivals')
+    parser.add_argument('--concurrency', type=int, default=64, help='most flows in flight')
+    parser.add_argument('--warmup', type=int, default=20, help='onboarding flows run first, not measured')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--baseline', help='compare with this report; exit 2 on regression')
+    parser.add_argument('--save-baseline', help='also write the report here as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed relative regression')
+    parser.add_argument('--min-delta-ms', type=float, default=10.0, help='ignore latency changes smaller than this')
+    parser.add_argument('--spawn', action='store_true', help='start a stub-LLM server on a temporary database')
+    parser.add_argument('--port', type=int, default=5055, help='port for --spawn')
+    parser.add_argument('--workers', type=int, default=0, help='gunicorn workers for --spawn (0: flask dev server)')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.scenario)
+    server = None
+    base_url = args.url
+    if args.spawn:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = spawn_server(args.port, args.workers)
     try:
-        requests.get(f"{BASE_URL}/api/health", timeout=3)
-    except:
-        print("❌ Server is not running. Please start the application first.")
-        sys.exit(1)
+        if not wait_healthy(base_url, 30 if server else 3):
+            print(f"❌ Server at {base_url} is not responding. Start the application first (or use --spawn).")
+            return 1
+        rng = random.Random(args.seed)
+        state = State(random.Random(args.seed + 1))
+        warmup = Client(base_url, None)
+        for _ in range(args.warmup):
+            try:
+                onboarding(warmup, state)
+            except FlowFailed as e:
+                print(f"⚠ Warm-up request failed: {e}")
+        recorder = Recorder()
+        print(f"🚀 {args.scenario}: {args.rate}/s for {args.duration}s against {base_url}")
+        elapsed = run_load(Client(base_url, recorder), state, mix, args.rate, args.duration, args.concurrency, rng)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
 
-    run_performance_tests()
-    load_test(10)
+    config = {key: getattr(args, key) for key in ('scenario', 'rate', 'duration', 'concurrency', 'warmup', 'seed',
+                                                   'spawn', 'workers')}
+    config['mix'] = mix
+    report = build_report(recorder, config, elapsed)
+    print_report(report)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = [key for key in COMPARABLE if baseline.get('config', {}).get(key) != config.get(key)]
+        if changed:
+            print(f"⚠ Baseline was recorded with different {', '.join(changed)}; the comparison may not mean much")
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"❌ {len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 2
+        print(f"✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,31 +1,23 @@
 from app.main import app
 from app.models.database import db, User, Asset, Transaction
 
+def print_table(title, model):
+    print(f"=== {title} ===")
+    found = False
+    # Stream in batches instead of loading the whole table with .all()
+    for record in model.query.order_by(model.id).yield_per(500):
+        print(record.to_dict())
+        found = True
+    if not found:
+        print(f"No {title.lower()} found.")
+
 def print_records():
     with app.app_context():
-        print("=== USERS ===")
-        users = User.query.all()
-        if users:
-            for user in users:
-                print(user.to_dict())
-        else:
-            print("No users found.")
-
-        print("\n=== ASSETS ===")
-        assets = Asset.query.all()
-        if assets:
-            for asset in assets:
-                print(asset.to_dict())
-        else:
-            print("No assets found.")
-
-        print("\n=== TRANSACTIONS ===")
-        transactions = Transaction.query.all()
-        if transactions:
-            for tx in transactions:
-                print(tx.to_dict())
-        else:
-            print("No transactions found.")
+        print_table("USERS", User)
+        print()
+        print_table("ASSETS", Asset)
+        print()
+        print_table("TRANSACTIONS", Transaction)
 
 if __name__ == '__main__':
     print_records()
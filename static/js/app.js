@@ -6,12 +6,17 @@ class RWAApp {
         this.currentWallet = null;
         this.currentAssets = [];
         this.currentAsset = null;
+        // Normalised client state: assets by id, stats, and the ETag + body of each GET
+        this.cache = { assets: new Map(), stats: null, statsEventId: 0, responses: new Map() };
+        this.events = null;
+        this.pollTimer = null;
         this.init();
     }
 
-    init() {
+    async init() {
         this.setupEventListeners();
-        this.loadStats();
+        // Stats first: their event id is where the event stream resumes
+        await this.loadStats();
         this.loadSampleWallet();
     }
 
@@ -46,6 +51,110 @@ class RWAApp {
         this.currentWallet = sampleWallet;
         if (walletDisplay) walletDisplay.textContent = `${sampleWallet.slice(0, 6)}...${sampleWallet.slice(-4)}`;
         this.loadUserAssets();
+        this.connectEvents();
+    }
+
+    // GET with If-None-Match; a 304 returns the body cached with that ETag
+    async conditionalFetch(url) {
+        const cached = this.cache.responses.get(url);
+        const headers = cached ? { 'If-None-Match': cached.etag } : {};
+        const response = await fetch(url, { headers, cache: 'no-store' });
+        if (response.status === 304 && cached) {
+            return { body: cached.body, modified: false };
+        }
+        const body = await response.json();
+        const etag = response.headers.get('ETag');
+        if (etag && response.ok) this.cache.responses.set(url, { etag, body });
+        return { body, modified: true };
+    }
+
+    // Server push: small deltas over SSE instead of re-fetching after every change
+    connectEvents() {
+        if (this.events) this.events.close();
+        this.events = null;
+        if (!window.EventSource || !this.currentWallet) {
+            this.startPolling();
+            return;
+        }
+        const params = new URLSearchParams({ wallet: this.currentWallet, last_event_id: this.cache.statsEventId });
+        const events = new EventSource(`${this.baseURL}/api/events?${params}`);
+        events.onopen = () => this.stopPolling();
+        events.onmessage = (e) => this.applyEvent(Number(e.lastEventId), JSON.parse(e.data));
+        // The server could not replay everything we missed
+        events.addEventListener('reset', () => this.refresh());
+        events.onerror = () => {
+            // Reconnects on its own unless the stream is unavailable (e.g. disabled under sync workers)
+            if (events.readyState === EventSource.CLOSED) {
+                this.events = null;
+                this.startPolling();
+            }
+        };
+        this.events = events;
+    }
+
+    isLive() {
+        return this.events && this.events.readyState === EventSource.OPEN;
+    }
+
+    startPolling() {
+        if (this.pollTimer) return;
+        this.pollTimer = setInterval(() => {
+            if (!document.hidden) this.refresh();
+        }, 15000);
+    }
+
+    stopPolling() {
+        clearInterval(this.pollTimer);
+        this.pollTimer = null;
+    }
+
+    // Conditional refetch of everything on screen: 304s cost the server one indexed lookup
+    async refresh() {
+        await this.loadStats();
+        await this.loadUserAssets();
+    }
+
+    applyEvent(eventId, event) {
+        if (event.stats === null) {
+            this.loadStats();
+        } else if (this.cache.stats && eventId > this.cache.statsEventId) {
+            // Events up to statsEventId are already counted in the fetched stats
+            for (const [key, delta] of Object.entries(event.stats)) {
+                this.cache.stats[key] = (this.cache.stats[key] || 0) + delta;
+            }
+            this.cache.statsEventId = eventId;
+            this.renderStats();
+        }
+        if (event.asset) this.mergeAsset(event.asset_id, event.asset);
+        if (event.refetch) this.loadUserAssets();
+    }
+
+    mergeAsset(assetId, changes) {
+        const asset = this.cache.assets.get(assetId);
+        if (asset) {
+            Object.assign(asset, changes);
+        } else if (changes.asset_type) {
+            this.cache.assets.set(assetId, { ...changes });
+        } else {
+            // A change to an asset we never saw: fall back to the list
+            this.loadUserAssets();
+            return;
+        }
+        if (this.currentAsset && this.currentAsset.id === assetId) {
+            Object.assign(this.currentAsset, changes);
+        }
+        this.renderAssets(this.sortedAssets());
+    }
+
+    sortedAssets() {
+        return Array.from(this.cache.assets.values())
+            .sort((a, b) => b.created_at.localeCompare(a.created_at) || b.id - a.id);
+    }
+
+    // After our own write: show the returned asset now; without a live stream, revalidate
+    afterWrite(asset) {
+        if (asset) this.mergeAsset(asset.id, asset);
+        if (!this.isLive()) this.refresh();
     }
 
     async submitAsset() {
@@ -75,8 +184,11 @@ class RWAApp {
                 this.showAlert('success', '✅ Asset submitted!');
                 this.showFollowUpQuestions(result.follow_up_questions || []);
                 this.resetForm();
-                await this.loadUserAssets();
-                await this.loadStats();
+                if (walletAddress === this.currentWallet) {
+                    this.afterWrite(result.asset);
+                } else {
+                    this.loadUserAssets();
+                }
             } else {
                 this.showAlert('danger', `Error: ${result.error}`);
             }
@@ -92,11 +204,22 @@ class RWAApp {
         const walletAddress = document.getElementById('wallet-address').value;
         if (!walletAddress) return;
 
+        if (walletAddress !== this.currentWallet) {
+            this.currentWallet = walletAddress;
+            this.cache.assets.clear();
+            this.connectEvents();
+        }
         try {
-            const response = await fetch(`${this.baseURL}/api/assets/${walletAddress}`);
-            const result = await response.json();
-            this.currentAssets = result.assets || [];
-            this.renderAssets(this.currentAssets);
+            const { body, modified } = await this.conditionalFetch(`${this.baseURL}/api/assets/${walletAddress}`);
+            if (!modified && this.cache.assets.size) return;
+            // A pushed change newer than this response wins
+            const assets = new Map((body.assets || []).map(asset => [asset.id, asset]));
+            for (const [id, asset] of assets) {
+                const pushed = this.cache.assets.get(id);
+                if (pushed && pushed.updated_at > asset.updated_at) assets.set(id, pushed);
+            }
+            this.cache.assets = assets;
+            this.renderAssets(this.sortedAssets());
         } catch (error) {
             console.error('Error loading assets:', error);
         }
@@ -104,18 +227,26 @@ class RWAApp {
 
     async loadStats() {
         try {
-            const response = await fetch(`${this.baseURL}/api/stats`);
-            const stats = await response.json();
-            document.getElementById('total-assets').textContent = stats.total_assets || 0;
-            document.getElementById('verified-assets').textContent = stats.verified_assets || 0;
-            document.getElementById('tokenized-assets').textContent = stats.tokenized_assets || 0;
-            document.getElementById('total-users').textContent = stats.total_users || 0;
+            const { body, modified } = await this.conditionalFetch(`${this.baseURL}/api/stats`);
+            if (!modified && this.cache.stats) return;
+            this.cache.stats = { ...body };
+            this.cache.statsEventId = body.event_id || 0;
+            this.renderStats();
         } catch (error) {
             console.error('Error loading stats:', error);
         }
     }
 
+    renderStats() {
+        const stats = this.cache.stats;
+        document.getElementById('total-assets').textContent = stats.total_assets || 0;
+        document.getElementById('verified-assets').textContent = stats.verified_assets || 0;
+        document.getElementById('tokenized-assets').textContent = stats.tokenized_assets || 0;
+        document.getElementById('total-users').textContent = stats.total_users || 0;
+    }
+
     renderAssets(assets) {
+        this.currentAssets = assets;
         const assetsList = document.getElementById('assets-list');
         if (!assetsList) return;
         if (assets.length === 0) {
@@ -148,8 +279,7 @@ class RWAApp {
 
     async showAssetDetails(assetId) {
         try {
-            const response = await fetch(`${this.baseURL}/api/asset/${assetId}`);
-            const result = await response.json();
+            const { body: result } = await this.conditionalFetch(`${this.baseURL}/api/asset/${assetId}`);
             const asset = result.asset;
             const transactions = result.transactions || [];
             this.currentAsset = asset;
@@ -246,8 +376,7 @@ class RWAApp {
 
             if (result.success) {
                 this.showAlert('success', '✅ Asset verification completed!');
-                await this.loadUserAssets();
-                await this.loadStats();
+                this.afterWrite(result.asset);
                 bootstrap.Modal.getInstance(document.getElementById('asset-modal')).hide();
                 this.showVerificationResults(result.verification_result);
             } else {
@@ -271,8 +400,7 @@ class RWAApp {
 
             if (result.success) {
                 this.showAlert('success', '🎉 Asset tokenized successfully!');
-                await this.loadUserAssets();
-                await this.loadStats();
+                this.afterWrite(result.asset);
                 bootstrap.Modal.getInstance(document.getElementById('asset-modal')).hide();
                 this.showTokenizationResults(result.tokenization_result);
             } else {
@@ -34,6 +34,8 @@ if ($LASTEXITCODE -eq 0) {
 
 # 4. Application startup
 Write-Host "4. Application Startup..."
+# Offline by default: canned LLM answers (set LLM_BACKEND=gemini to use the real model)
+if (-not $env:LLM_BACKEND) { $env:LLM_BACKEND = "stub" }
 $process = Start-Process -FilePath "python" -ArgumentList "app\main.py" -PassThru
 Start-Sleep -Seconds 5
 
@@ -56,9 +58,18 @@ try {
 
 # 6. Performance check
 Write-Host "6. Performance Check..."
-python performance_test.py > $null 2>&1
+# Short mixed load; compared with perf_baseline.json when one has been saved
+$perfArgs = @("--scenario", "mixed", "--rate", "10", "--duration", "15", "--output", "perf_report.json")
+if (Test-Path "perf_baseline.json") {
+    $perfArgs += @("--baseline", "perf_baseline.json")
+}
+python performance_test.py @perfArgs > $null 2>&1
 if ($LASTEXITCODE -eq 0) {
-    Write-Host "✅ Performance OK"
+    Write-Host "✅ Performance OK (perf_report.json)"
+} elseif ($LASTEXITCODE -eq 2) {
+    Write-Host "❌ Performance regression against perf_baseline.json (see perf_report.json)"
+    Stop-Process -Id $process.Id -Force
+    exit 1
 } else {
     Write-Host "⚠ Performance issues detected"
 }
@@ -32,6 +32,8 @@ else
 fi
 
 echo "4. Application Startup..."
+# Offline by default: canned LLM answers (set LLM_BACKEND=gemini to use the real model)
+export LLM_BACKEND="${LLM_BACKEND:-stub}"
 python app/main.py &
 APP_PID=$!
 sleep 5
@@ -47,9 +49,19 @@ else
 fi
 
 echo "6. Performance Check..."
-python performance_test.py > /dev/null 2>&1
-if [ $? -eq 0 ]; then
-  echo "✅ Performance OK"
+# Short mixed load; compared with perf_baseline.json when one has been saved
+PERF_ARGS="--scenario mixed --rate 10 --duration 15 --output perf_report.json"
+if [ -f perf_baseline.json ]; then
+  PERF_ARGS="$PERF_ARGS --baseline perf_baseline.json"
+fi
+python performance_test.py $PERF_ARGS > /dev/null 2>&1
+PERF_STATUS=$?
+if [ $PERF_STATUS -eq 0 ]; then
+  echo "✅ Performance OK (perf_report.json)"
+elif [ $PERF_STATUS -eq 2 ]; then
+  echo "❌ Performance regression against perf_baseline.json (see perf_report.json)"
+  kill $APP_PID 2>/dev/null
+  exit 1
 else
   echo "⚠ Performance issues detected"
 fi
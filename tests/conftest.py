@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.database import db
+from app.models.user_cache import wallet_cache
+
+
+@pytest.fixture
+def app(tmp_path):
+    """A bare Flask app bound to a throwaway SQLite file (no LLM or agent setup)."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    wallet_cache.clear()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def main_app(tmp_path_factory):
+    """app.main on a throwaway database, ledger and log, with the stub model; imported once per run."""
+    from config import Config
+    from app.agents import agents_modular, llm_utils
+    from app.agents.llm_stub import StubModel
+
+    workdir = tmp_path_factory.mktemp('main')
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{workdir / 'main.db'}"
+    Config.OWNERSHIP_LEDGER_DIR = str(workdir / 'ledger')
+    Config.LOG_FILE = str(workdir / 'app.log')
+    Config.EVENTS_STREAM_SECONDS = 0.3
+    Config.EVENTS_HEARTBEAT_SECONDS = 0.1
+    agents_modular.llm_model = StubModel(lambda prompt: {'score': 0.85, 'notes': 'Stub LLM backend.'})
+    llm_utils.model = StubModel(
+        lambda prompt: llm_utils.extract_asset_info_local(llm_utils.USER_INPUT_PATTERN.search(prompt).group(1))
+    )
+    from app.main import app as main
+    return main
+
+
+@pytest.fixture
+def client(main_app):
+    wallet_cache.clear()
+    return main_app.test_client()
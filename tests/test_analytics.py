@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from app.models.analytics import AnalyticsStore, analytics_store, normalize_location
+from app.models.database import db, User, Asset, Transaction
+from app.models.operations import record_verification
+
+
+def seed():
+    user = User(wallet_address='0xabc')
+    for i, (asset_type, location, value) in enumerate([
+            ('real_estate', 'Etawah, Uttar Pradesh, India', 2500000.0),
+            ('real_estate', ' etawah ', 1500000.0),
+            ('vehicle', 'Pune', 100000.0),
+            ('vehicle', 'unknown', 50000.0)]):
+        asset = Asset(user=user, asset_type=asset_type, description='x', location=location, estimated_value=value)
+        db.session.add(asset)
+        db.session.add(Transaction(asset=asset, transaction_type='intake', created_at=datetime(2024, 1, 1 + i % 2)))
+    db.session.commit()
+
+
+def test_normalize_location():
+    assert normalize_location('  new   delhi, India') == 'New Delhi'
+    assert normalize_location(None) == normalize_location('UNKNOWN') == 'Unknown'
+
+
+def test_summary_is_cached_and_refreshed_incrementally(app):
+    seed()
+    store = AnalyticsStore(ttl=3600)
+    summary = store.summary(db.engine)
+    assert summary['value_by_type']['real_estate']['count'] == 2
+    assert summary['value_by_type']['real_estate']['percentiles']['p50'] == 2000000.0
+    assert summary['value_by_location']['Etawah']['total'] == 4000000.0
+    assert set(summary['value_by_location']) == {'Etawah', 'Pune', 'Unknown'}
+    assert summary['throughput']['series']['intake'] == [['2024-01-01T00:00:00', 2], ['2024-01-02T00:00:00', 2]]
+    assert summary['verification_scores']['overall'] == {'count': 0}
+    assert store.summary(db.engine) is summary  # cached
+
+    asset_id = Asset.query.filter_by(location='Pune').one().id
+    record_verification(db.session, asset_id, {
+        'status': 'verified', 'overall_score': 0.8,
+        'breakdown': {'jurisdiction': 0.9, 'basic_info': 0.7}})
+    analytics_store._stale = False
+    db.session.commit()
+    assert analytics_store._stale  # commits touching assets invalidate the shared store
+    store.invalidate()
+
+    summary = store.summary(db.engine)
+    assert store.asset_ids.size == 4
+    assert summary['verification_scores']['jurisdiction']['percentiles']['p50'] == 0.9
+    assert summary['verification_scores']['overall']['count'] == 1
+    assert sum(count for _, count in summary['throughput']['series']['verification']) == 1
@@ -0,0 +1,154 @@
+import json
+
+# app.main is imported by the main_app fixture, after it points Config at a temp dir
+INPUT = '3BHK apartment flat in Pune, 1450 sqft with registered deed, valued at ₹1.2 Cr'
+
+
+def verified_asset(client, wallet):
+    asset = client.post('/api/intake', json={'wallet_address': wallet, 'user_input': INPUT}).get_json()['asset']
+    assert client.post(f"/api/verify/{asset['id']}").get_json()['asset']['verification_status'] == 'verified'
+    return asset['id']
+
+
+def events(client, query):
+    """Data of every message of one /api/events stream (it ends after EVENTS_STREAM_SECONDS)."""
+    body = client.get(f'/api/events?{query}').get_data(as_text=True)
+    return [json.loads(line[len('data: '):]) for line in body.split('\n') if line.startswith('data: ')]
+
+
+def test_asset_is_tokenized_once(client):
+    from app.main import tokenization_agent
+    asset_id = verified_asset(client, '0xapi-once')
+    first = client.post(f'/api/tokenize/{asset_id}')
+    assert first.status_code == 200
+    token_id = first.get_json()['asset']['token_id']
+    assert tokenization_agent.ledger.owner_of(token_id) == '0xapi-once'
+
+    again = client.post(f'/api/tokenize/{asset_id}')
+    assert again.status_code == 400
+    assert again.get_json()['token_id'] == token_id
+    assert client.get(f'/api/asset/{asset_id}').get_json()['asset']['token_id'] == token_id
+    assert tokenization_agent.ledger.tokens_of('0xapi-once') == [token_id]
+
+
+def test_failed_ledger_mint_leaves_asset_untokenized(client, monkeypatch):
+    from app.main import tokenization_agent
+    asset_id = verified_asset(client, '0xapi-ledger')
+
+    def broken(tokens):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(tokenization_agent.ledger, 'mint_many', broken)
+    assert client.post(f'/api/tokenize/{asset_id}').status_code == 500
+    assert client.post('/api/tokenize/batch', json={'asset_ids': [asset_id]}).status_code == 500
+    assert client.get(f'/api/asset/{asset_id}').get_json()['asset']['token_id'] is None
+
+
+def test_failed_write_burns_the_minted_tokens(client, monkeypatch):
+    import app.main as main
+    single, batched = verified_asset(client, '0xapi-burn'), verified_asset(client, '0xapi-burn')
+
+    def broken(session, *args):
+        raise ValueError('database is locked')
+
+    monkeypatch.setattr(main, 'record_tokenization', broken)
+    monkeypatch.setattr(main, 'record_tokenization_batch', broken)
+    assert client.post(f'/api/tokenize/{single}').status_code == 500
+    assert client.post('/api/tokenize/batch', json={'asset_ids': [batched]}).status_code == 500
+    assert main.tokenization_agent.ledger.tokens_of('0xapi-burn') == []
+    assert client.get('/api/holdings/0xapi-burn').get_json()['tokens'] == []
+
+    monkeypatch.undo()
+    assert client.post('/api/tokenize/batch', json={'asset_ids': [single, batched]}).status_code == 200
+    token_ids = {client.get(f'/api/asset/{asset_id}').get_json()['asset']['token_id'] for asset_id in (single, batched)}
+    assert set(main.tokenization_agent.ledger.tokens_of('0xapi-burn')) == token_ids
+
+
+def test_fractionalization_failure_is_reported(client, monkeypatch):
+    from app.main import tokenization_agent
+    asset_id = verified_asset(client, '0xapi-shares')
+    split = client.post(f'/api/tokenize/{asset_id}', json={'shares': 4})
+    assert split.status_code == 200
+    token_id = split.get_json()['asset']['token_id']
+    assert client.get('/api/holdings/0xapi-shares').get_json()['positions'] == [
+        {'token_id': token_id, 'shares': 4, 'total_shares': 4, 'fraction': 1.0}]
+
+    asset_id = verified_asset(client, '0xapi-shares')
+    monkeypatch.setattr(tokenization_agent, 'fractionalize_token',
+                        lambda *args: {'success': False, 'error': 'share ledger unavailable', 'status': 'failed'})
+    failed = client.post(f'/api/tokenize/{asset_id}', json={'shares': 4})
+    assert failed.status_code == 500
+    body = failed.get_json()
+    assert body['success'] is False and body['details'] == 'share ledger unavailable'
+    assert body['asset']['token_id'] not in (None, token_id)
+
+
+def test_pushed_counters_match_stats(client):
+    asset_id = verified_asset(client, '0xapi-counters')
+    client.post(f'/api/tokenize/{asset_id}')
+    assert client.post(f'/api/tokenize/{asset_id}').status_code == 400
+    totals = {}
+    for event in events(client, 'wallet=0xapi-counters&last_event_id=0'):
+        for key, delta in event['stats'].items():
+            totals[key] = totals.get(key, 0) + delta
+    stats = client.get('/api/stats').get_json()
+    assert totals == {key: stats[key] for key in totals}
+    assert set(totals) == {'total_assets', 'total_users', 'verified_assets', 'tokenized_assets'}
+
+
+def test_stats_and_asset_list_answer_304_until_they_change(client):
+    verified_asset(client, '0xapi-etag')
+    stats = client.get('/api/stats')
+    assets = client.get('/api/assets/0xapi-etag')
+    assert stats.headers['ETag'] and assets.headers['ETag']
+    for response, path in ((stats, '/api/stats'), (assets, '/api/assets/0xapi-etag')):
+        again = client.get(path, headers={'If-None-Match': response.headers['ETag']})
+        assert again.status_code == 304 and again.get_data() == b''
+
+    # Someone else's asset changes the counters, not this wallet's list
+    verified_asset(client, '0xapi-etag-other')
+    assert client.get('/api/stats', headers={'If-None-Match': stats.headers['ETag']}).status_code == 200
+    assert client.get('/api/assets/0xapi-etag',
+                      headers={'If-None-Match': assets.headers['ETag']}).status_code == 304
+
+    client.post('/api/intake', json={'wallet_address': '0xapi-etag', 'user_input': INPUT})
+    changed = client.get('/api/assets/0xapi-etag', headers={'If-None-Match': assets.headers['ETag']})
+    assert changed.status_code == 200 and len(changed.get_json()['assets']) == 2
+
+
+def test_event_stream_replays_after_last_event_id(client, monkeypatch):
+    from config import Config
+    asset_id = verified_asset(client, '0xapi-events')
+    pushed = events(client, 'wallet=0xapi-events&last_event_id=0')
+    own = [event for event in pushed if event['asset_id'] == asset_id]
+    assert [event['kind'] for event in own] == ['asset.created', 'asset.verified']
+    assert own[1]['asset']['verification_status'] == 'verified'
+
+    response = client.get('/api/events?wallet=0xapi-events', headers={'Last-Event-ID': str(client.get(
+        '/api/stats').get_json()['event_id'])})
+    assert response.mimetype == 'text/event-stream'
+    assert 'data: ' not in response.get_data(as_text=True)
+
+    monkeypatch.setattr(Config, 'EVENTS_STREAM_ENABLED', False)
+    assert client.get('/api/events').status_code == 404
+
+
+def test_malformed_history_cursor_is_400(client):
+    asset_id = client.post('/api/intake', json={'wallet_address': '0xapi-cursor', 'user_input': INPUT}
+                           ).get_json()['asset']['id']
+    for cursor in ('garbage', 'not-a-date|1', '2024-01-01T00:00:00|x'):
+        response = client.get(f'/api/asset/{asset_id}?cursor={cursor}')
+        assert response.status_code == 400 and response.get_json() == {'error': 'invalid cursor'}
+    assert client.get(f'/api/asset/{asset_id}?limit=1').status_code == 200
+    assert client.get('/api/asset/999999?cursor=garbage').status_code == 404
+
+
+def test_malformed_search_cursor_is_400(client):
+    for _ in range(2):
+        client.post('/api/intake', json={'wallet_address': '0xapi-search', 'user_input': INPUT})
+    first = client.get('/api/search?q=apartment&limit=1').get_json()
+    assert first['next_cursor']
+    assert client.get(f"/api/search?q=apartment&limit=1&cursor={first['next_cursor']}").status_code == 200
+    for cursor in ('garbage', 'x|1|0', '1.5|2'):
+        response = client.get(f'/api/search?q=apartment&cursor={cursor}')
+        assert response.status_code == 400 and response.get_json() == {'error': 'invalid cursor'}
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from app.models.database import db, User, Asset, Transaction, TransactionArchive
+from app.models.archive import archive_transactions, purge_archive, transaction_history
+
+
+def seed_history():
+    user = User(wallet_address='0xabc')
+    asset = Asset(user=user, asset_type='vehicle', description='car', estimated_value=1.0, location='Pune')
+    db.session.add(asset)
+    db.session.flush()
+    start = datetime(2024, 1, 1)
+    for day in range(10):
+        db.session.add(Transaction(asset_id=asset.id, transaction_type='verification', status='verified',
+                                   details={'day': day}, created_at=start + timedelta(days=day)))
+    db.session.add(Transaction(asset_id=asset.id, transaction_type='tokenization', status='completed',
+                               details={'token_id': 'RWA_1'}, created_at=start))
+    db.session.commit()
+    return asset.id
+
+
+def test_archive_keeps_latest_per_type_hot(app):
+    asset_id = seed_history()
+    moved = archive_transactions(db.session, datetime(2030, 1, 1), batch_size=3)
+    assert moved == 9
+    hot = Transaction.query.filter_by(asset_id=asset_id).all()
+    assert sorted((tx.transaction_type, tx.details) for tx in hot) == [
+        ('tokenization', {'token_id': 'RWA_1'}), ('verification', {'day': 9})]
+    assert TransactionArchive.query.first().to_dict()['details'] == {'day': 0}
+
+
+def test_history_pages_across_hot_and_archive(app):
+    asset_id = seed_history()
+    archive_transactions(db.session, datetime(2024, 1, 6))
+    seen, cursor = [], None
+    while True:
+        page = transaction_history(db.session, asset_id, limit=4, cursor=cursor)
+        seen += [tx['details'] for tx in page['transactions']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert len(seen) == 11
+    assert seen[0] == {'day': 9}
+    assert [d['day'] for d in seen if 'day' in d] == list(range(9, -1, -1))
+    assert purge_archive(db.session, datetime(2030, 1, 1)) == 5
+    assert TransactionArchive.query.count() == 0
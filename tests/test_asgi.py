@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+
+INPUT = '2019 Honda City car in Pune, 30000 km mileage, valued at ₹8 lakh'
+
+
+async def call(method, path, body=None, query=b''):
+    """One request straight into app.asgi.app; returns (status, headers, body bytes)."""
+    from app.asgi import app
+    requests = [{'type': 'http.request', 'body': json.dumps(body).encode() if body is not None else b''}]
+    sent = []
+
+    async def receive():
+        if requests:
+            return requests.pop(0)
+        # The client stays connected until the response is done
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+             'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query, 'root_path': '',
+             'headers': [(b'host', b'test'), (b'content-type', b'application/json')],
+             'client': ('127.0.0.1', 5000), 'server': ('test', 80)}
+    await app(scope, receive, send)
+    start = next(message for message in sent if message['type'] == 'http.response.start')
+    content = b''.join(message.get('body', b'') for message in sent if message['type'] == 'http.response.body')
+    return start['status'], dict(start['headers']), content
+
+
+@pytest.fixture
+def run(main_app):
+    """Runs a coroutine on a fresh loop, then drops the async pool's connections (bound to that loop)."""
+    def run(coroutine):
+        from app.asgi import async_engine
+
+        async def scenario():
+            try:
+                return await coroutine
+            finally:
+                await async_engine.dispose()
+        return asyncio.run(scenario())
+    return run
+
+
+def test_native_intake_and_verify(run):
+    async def scenario():
+        status, headers, body = await call('POST', '/api/intake',
+                                           {'wallet_address': '0xasgi', 'user_input': INPUT})
+        assert status == 200 and headers[b'content-type'] == b'application/json'
+        asset = json.loads(body)['asset']
+        assert asset['asset_type'] == 'vehicle' and asset['verification_status'] == 'requires_review'
+
+        status, _, body = await call('POST', f"/api/verify/{asset['id']}")
+        assert status == 200
+        result = json.loads(body)
+        assert result['verification_result']['status'] == 'verified'
+        assert result['asset']['verification_status'] == 'verified'
+
+        status, _, body = await call('POST', '/api/intake', {'wallet_address': '0xasgi'})
+        assert status == 400
+    run(scenario())
+
+
+def test_native_verify_of_unknown_asset_is_404(run):
+    status, _, body = run(call('POST', '/api/verify/999999'))
+    assert status == 404 and json.loads(body) == {'error': 'Asset not found'}
+
+
+def test_other_routes_pass_through_to_flask(run):
+    async def scenario():
+        await call('POST', '/api/intake', {'wallet_address': '0xasgi-wsgi', 'user_input': INPUT})
+        status, headers, body = await call('GET', '/api/assets/0xasgi-wsgi')
+        assert status == 200 and b'etag' in headers
+        assert [asset['asset_type'] for asset in json.loads(body)['assets']] == ['vehicle']
+        status, _, _ = await call('GET', '/nowhere')
+        assert status == 404
+    run(scenario())
+
+
+def test_native_event_stream_replays_then_pushes(run):
+    async def scenario():
+        await call('POST', '/api/intake', {'wallet_address': '0xasgi-events', 'user_input': INPUT})
+        stream = asyncio.ensure_future(call('GET', '/api/events', query=b'wallet=0xasgi-events&last_event_id=0'))
+        await asyncio.sleep(0.1)
+        await call('POST', '/api/intake', {'wallet_address': '0xasgi-events', 'user_input': INPUT})
+        status, headers, body = await stream
+        assert status == 200 and headers[b'content-type'].startswith(b'text/event-stream')
+        pushed = [json.loads(line[len('data: '):]) for line in body.decode().split('\n') if line.startswith('data: ')]
+        own = [event for event in pushed if 'asset' in event]
+        assert [event['kind'] for event in own] == ['asset.created'] * 2
+        assert own[0]['asset_id'] < own[1]['asset_id']
+    run(scenario())
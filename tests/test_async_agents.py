@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+from app.agents import agents_modular, llm_utils
+from app.agents.llm_stub import StubModel
+from app.agents.verification_agent import VerificationAgent
+
+ASSET = {'id': 1, 'asset_type': 'real_estate', 'estimated_value': 2500000.0, 'location': 'Pune, India',
+         'description': '3BHK apartment flat in Pune with registered deed'}
+
+
+def test_async_verification_matches_sync_and_overlaps_calls(monkeypatch):
+    monkeypatch.setattr(agents_modular, 'llm_model',
+                        StubModel(lambda prompt: {'score': 0.9, 'notes': 'ok'}, latency_ms=50))
+    agent = VerificationAgent()
+    start = time.perf_counter()
+    result = asyncio.run(agent.verify_asset_async(ASSET))
+    elapsed = time.perf_counter() - start
+    assert result == agent.verify_asset(ASSET)
+    assert result['status'] == 'verified' and set(result['breakdown']) == {
+        'basic_info', 'value_assessment', 'jurisdiction', 'asset_specific'}
+    # Four 50 ms model calls in flight together, not one after another
+    assert elapsed < 0.15
+
+
+def test_async_extraction_falls_back_on_bad_output(monkeypatch):
+    monkeypatch.setattr(llm_utils, 'model', StubModel(lambda prompt: ['not', 'an', 'object']))
+    result = asyncio.run(llm_utils.extract_asset_info_with_llm_async('2019 Honda City car, 30000 km mileage'))
+    assert result == {'asset_type': 'vehicle', 'estimated_value': 0, 'location': 'unknown',
+                      'description': '2019 Honda City car, 30000 km mileage'}
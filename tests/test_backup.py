@@ -0,0 +1,45 @@
+import os
+
+from app.models.backup import apply_retention, create_backup, list_backups, restore_backup
+from app.models.database import db, User, Asset
+
+
+def add_assets(count, start=0):
+    user = User.query.first() or User(wallet_address='0xabc')
+    for i in range(start, start + count):
+        db.session.add(Asset(user=user, asset_type='vehicle', description=f'car {i}',
+                             location='Pune', estimated_value=float(i)))
+    db.session.commit()
+
+
+def test_incremental_backup_and_restore(app, tmp_path):
+    backups = str(tmp_path / 'backups')
+    add_assets(500)
+    full = create_backup(db.engine, backups)
+    add_assets(5, start=500)
+    incremental = create_backup(db.engine, backups)
+    assert (full['kind'], incremental['kind']) == ('full', 'incremental')
+    assert incremental['base'] == full['name']
+    assert incremental['pages_changed'] < incremental['page_count']
+    assert incremental['stored_bytes'] < full['stored_bytes']
+
+    add_assets(100, start=505)
+    assert Asset.query.count() == 605
+    db.session.remove()
+    restore_backup(db.engine, backups, incremental['name'])
+    assert Asset.query.count() == 505
+
+    restore_backup(db.engine, backups, full['name'])
+    assert Asset.query.count() == 500
+
+
+def test_retention_drops_whole_chains(app, tmp_path):
+    backups = str(tmp_path / 'backups')
+    add_assets(10)
+    for _ in range(2):
+        create_backup(db.engine, backups, full=True)
+        create_backup(db.engine, backups)
+    removed = apply_retention(backups, keep_full=1)
+    assert len(removed) == 2
+    assert [m['kind'] for m in list_backups(backups)] == ['full', 'incremental']
+    assert len(os.listdir(backups)) == 4  # two data files, two manifests
@@ -0,0 +1,53 @@
+import pytest
+
+from app.agents.merkle import MerkleTree, leaf_hash, verify_merkle_proof
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import db, User, Asset, Transaction
+from app.models.operations import record_tokenization_batch
+
+VERIFIED = {'status': 'verified', 'overall_score': 0.9}
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 8, 9])
+def test_every_leaf_proves_against_the_root(size):
+    leaves = [leaf_hash({'n': i}) for i in range(size)]
+    tree = MerkleTree(leaves)
+    for index, leaf in enumerate(leaves):
+        assert verify_merkle_proof(leaf.hex(), tree.proof(index), tree.root.hex())
+    assert not verify_merkle_proof(leaf_hash({'n': size}).hex(), tree.proof(0), tree.root.hex())
+
+
+def test_batch_tokens_verify_on_their_own():
+    agent = TokenizationAgent()
+    items = [({'id': i, 'user_id': 1, 'asset_type': 'vehicle', 'estimated_value': 1.0}, VERIFIED) for i in range(5)]
+    items.append(({'id': 99, 'asset_type': 'vehicle'}, {'status': 'requires_review'}))
+    batch = agent.tokenize_batch(items)
+    assert batch['success'] and len(batch['tokens']) == 5
+    assert batch['rejected'] == [{'asset_id': 99, 'error': 'Asset must be verified before tokenization'}]
+    assert {token['transaction_hash'] for token in batch['tokens']} == {batch['merkle_root']}
+    assert all(agent.verify_token_inclusion(token) for token in batch['tokens'])
+
+    forged = dict(batch['tokens'][2], owner=2)
+    assert not agent.verify_token_inclusion(forged)
+
+
+def test_batch_is_persisted_once(app):
+    user = User(wallet_address='0xabc')
+    assets = [Asset(user=user, asset_type='vehicle', description='car', location='Pune',
+                    estimated_value=1.0, verification_status='verified') for _ in range(3)]
+    db.session.add_all(assets)
+    db.session.commit()
+    batch = TokenizationAgent().tokenize_batch([(asset.to_dict(), VERIFIED) for asset in assets])
+
+    assert record_tokenization_batch(db.session, batch) == [asset.id for asset in assets]
+    db.session.commit()
+    db.session.expire_all()
+    assert [asset.token_id for asset in Asset.query.order_by(Asset.id)] == [t['token_id'] for t in batch['tokens']]
+    stored = Transaction.query.filter_by(transaction_type='tokenization').all()
+    assert {tx.transaction_hash for tx in stored} == {batch['merkle_root']}
+    assert TokenizationAgent().verify_token_inclusion(stored[0].details)
+
+    with pytest.raises(ValueError):
+        record_tokenization_batch(db.session, batch)
+    db.session.rollback()
+    assert Transaction.query.count() == 3
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from app.models.database import db, User, Asset
+from app.models.bulk_load import load_file
+
+
+def extract(user_input):
+    return {'asset_type': 'vehicle', 'estimated_value': 1.0, 'location': 'Pune', 'description': user_input}
+
+
+def write_portfolio(path, count):
+    with open(path, 'w') as f:
+        for i in range(count):
+            f.write(json.dumps({'wallet_address': f'0x{i % 7}', 'user_input': f'car {i}'}) + '\n')
+        f.write('not json\n')
+
+
+def test_interrupted_load_resumes_without_duplicates(app, tmp_path):
+    path = tmp_path / 'portfolio.jsonl'
+    checkpoint = str(tmp_path / 'portfolio.checkpoint')
+    write_portfolio(path, 250)
+
+    def flaky(user_input):
+        if user_input == 'car 120':
+            raise KeyboardInterrupt
+        return extract(user_input)
+
+    with pytest.raises(KeyboardInterrupt):
+        load_file(db.engine, str(path), flaky, batch_size=50, concurrency=4, checkpoint_path=checkpoint)
+    assert Asset.query.count() == 100
+
+    result = load_file(db.engine, str(path), extract, batch_size=50, concurrency=4, checkpoint_path=checkpoint)
+    assert (result['lines'], result['loaded'], result['errors']) == (251, 250, 1)
+    assert Asset.query.count() == 250
+    assert User.query.count() == 7
+    assert sorted(a.description for a in Asset.query.all()) == sorted(f'car {i}' for i in range(250))
+
+
+def test_empty_extraction_uses_defaults(app, tmp_path):
+    path = tmp_path / 'portfolio.jsonl'
+    write_portfolio(path, 3)
+    result = load_file(db.engine, str(path), lambda text: {'asset_type': None, 'estimated_value': None,
+                                                            'location': None, 'description': None})
+    assert (result['loaded'], result['errors']) == (3, 1)
+    asset = Asset.query.first()
+    assert (asset.asset_type, asset.estimated_value, asset.location) == ('unknown', 0, 'unknown')
+    assert asset.description.startswith('car ')
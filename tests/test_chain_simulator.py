@@ -0,0 +1,94 @@
+import threading
+
+from app.agents.chain_simulator import ChainSimulator
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import Transaction, db
+from app.models.operations import (confirm_chain_transactions, create_asset, record_tokenization,
+                                   record_tokenization_batch, record_transfer)
+from app.models.session import unit_of_work
+
+VERIFIED = {'status': 'verified', 'overall_score': 0.9}
+
+
+def test_blocks_take_the_mempool_in_order():
+    chain = ChainSimulator(block_time=0, block_size=2)
+    hashes = [chain.submit('mint', {'token_id': f'T{i}'}) for i in range(5)]
+    assert chain.receipt(hashes[0]) is None and chain.mine()['tx_count'] == 2
+    chain.mine()
+    chain.mine()
+    assert chain.mine() is None
+    receipts = [chain.receipt(tx_hash) for tx_hash in hashes]
+    assert [(r['block_number'], r['transaction_index']) for r in receipts] == [(1, 0), (1, 1), (2, 0), (2, 1), (3, 0)]
+    assert [r['confirmations'] for r in receipts] == [3, 3, 2, 2, 1]
+    stats = chain.stats()
+    assert stats['height'] == 3 and stats['confirmed'] == 5 and stats['pending'] == 0
+
+
+def test_agent_waits_for_receipt():
+    chain = ChainSimulator(block_time=0.01, block_size=10)
+    chain.start()
+    try:
+        agent = TokenizationAgent(chain=chain, confirm_timeout=5)
+        result = agent.tokenize_asset({'id': 1, 'user_id': 1, 'asset_type': 'vehicle', 'estimated_value': 1.0},
+                                      VERIFIED)
+        assert result['status'] == 'minted'
+        assert result['receipt']['transaction_hash'] == result['transaction_hash']
+    finally:
+        chain.stop()
+
+
+def test_without_confirm_timeout_transactions_stay_pending():
+    chain = ChainSimulator(block_time=0)
+    agent = TokenizationAgent(chain=chain)
+    agent.ledger.mint('T1', 'alice')
+    result = agent.transfer_token('T1', 'alice', 'bob')
+    assert result['status'] == 'pending' and result['receipt'] is None
+    waiter = threading.Thread(target=chain.mine)
+    waiter.start()
+    assert chain.wait_for_receipt(result['transaction_hash'], timeout=5)['block_number'] == 1
+    waiter.join()
+
+
+def test_only_recent_blocks_and_receipts_are_kept():
+    chain = ChainSimulator(block_time=0, block_size=1, block_history=2, receipt_history=3)
+    hashes = [chain.submit('mint', {'token_id': f'T{i}'}) for i in range(5)]
+    assert all(chain.is_pending(tx_hash) for tx_hash in hashes)
+    for _ in hashes:
+        chain.mine()
+    assert [block['number'] for block in chain.blocks] == [4, 5] and chain.blocks[-1]['parent_hash'] != '0x' + '0' * 64
+    assert list(chain.receipts) == hashes[2:]
+    assert chain.receipt(hashes[0]) is None and not chain.is_pending(hashes[0])
+    assert chain.receipt(hashes[2])['confirmations'] == 3
+    stats = chain.stats()
+    assert stats['height'] == 5 and stats['confirmed'] == 5 and stats['avg_block_fill'] == 1.0
+
+
+def test_pending_transactions_are_confirmed_once_mined(app):
+    def write(work):
+        with unit_of_work(db.session) as session:
+            return work(session)
+
+    parsed = {'asset_type': 'vehicle', 'estimated_value': 1.0}
+    single, batched = (write(lambda s: create_asset(s, '0xabc', None, parsed, 'car')) for _ in range(2))
+    chain = ChainSimulator(block_time=0)
+    agent = TokenizationAgent(chain=chain)
+    result = agent.tokenize_asset(single, VERIFIED)
+    batch = agent.tokenize_batch([(batched, VERIFIED)])
+    assert result['status'] == batch['status'] == batch['tokens'][0]['status'] == 'pending'
+    write(lambda s: record_tokenization(s, single['id'], result))
+    write(lambda s: record_tokenization_batch(s, batch))
+    agent.ledger.mint(result['token_id'], '0xabc')
+    write(lambda s: record_transfer(s, single['id'], agent.transfer_token(result['token_id'], '0xabc', '0xdef')))
+    rows = db.session.query(Transaction).order_by(Transaction.id)
+    assert [tx.status for tx in rows] == ['pending'] * 3
+    # Batch rows point at the chain transaction; the Merkle root stays in the details
+    assert rows[1].transaction_hash == batch['chain_tx_hash'] and rows[1].details['merkle']['root'] == batch['merkle_root']
+    assert write(lambda s: confirm_chain_transactions(s, chain.receipt)) == 0
+
+    mined = []
+    chain.on_block = mined.append
+    chain.mine()
+    assert len(mined) == 1
+    assert write(lambda s: confirm_chain_transactions(s, chain.receipt)) == 3
+    db.session.expire_all()
+    assert [tx.status for tx in db.session.query(Transaction).order_by(Transaction.id)] == ['completed'] * 3
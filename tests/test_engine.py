@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from app.models.database import db
+from app.models.engine import apply_sqlite_profile, create_read_engine, sqlite_pragmas
+
+
+def test_profile_applies_pragmas_on_connect(app):
+    apply_sqlite_profile(db.engine, sqlite_pragmas(Config))
+    with db.engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == Config.SQLITE_BUSY_TIMEOUT_MS
+
+
+def test_read_engine_is_read_only(app):
+    pragmas = sqlite_pragmas(Config)
+    apply_sqlite_profile(db.engine, pragmas)
+    read_engine = create_read_engine(db.engine, pragmas)
+    assert read_engine is not db.engine
+    with read_engine.connect() as conn:
+        assert conn.execute(text('SELECT count(*) FROM asset')).scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO user (wallet_address) VALUES ('0x1')"))
+    read_engine.dispose()
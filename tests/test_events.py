@@ -0,0 +1,115 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import db
+from app.models.events import EventHub, EventStream, latest_event_id, prune_events
+from app.models.operations import (create_asset, record_verification, record_tokenization,
+                                   record_tokenization_batch)
+from app.models.session import unit_of_work
+
+PARSED = {'asset_type': 'vehicle', 'estimated_value': 1.0, 'location': 'Pune', 'description': 'car'}
+VERIFIED = {'status': 'verified', 'overall_score': 0.9, 'breakdown': {'basic_info': 1.0}}
+
+
+def write(work):
+    with unit_of_work(db.session) as session:
+        return work(session)
+
+
+def wait_for(received, count):
+    # Delivered by the hub's thread, woken by the commits
+    deadline = time.monotonic() + 5
+    while len(received) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return received
+
+
+def messages(chunks):
+    """SSE chunks -> [(id, event, data)] for the chunks that carry data."""
+    parsed = []
+    for chunk in chunks:
+        fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n') if not line.startswith(':'))
+        if 'data' in fields:
+            parsed.append((int(fields['id']), fields.get('event', 'message'), json.loads(fields['data'])))
+    return parsed
+
+
+def test_hub_pushes_asset_changes_and_stats_deltas(app):
+    hub = EventHub(db.engine)
+    received = []
+    token, head = hub.subscribe(received.extend)
+    assert head == 0
+    own = EventStream(hub, '0xabc', None)
+    other = EventStream(hub, '0xother', None)
+    own.open(lambda rows: None)
+    other.open(lambda rows: None)
+    try:
+        first = write(lambda s: create_asset(s, '0xabc', None, PARSED, 'car'))
+        write(lambda s: create_asset(s, '0xabc', None, PARSED, 'car'))
+        write(lambda s: record_verification(s, first['id'], VERIFIED))
+        write(lambda s: record_verification(s, first['id'], VERIFIED))
+        pushed = messages(own.render(wait_for(received, 4)))
+        assert [data['kind'] for _, _, data in pushed] == ['asset.created'] * 2 + ['asset.verified'] * 2
+        assert [data['stats'] for _, _, data in pushed] == [
+            {'total_assets': 1, 'total_users': 1}, {'total_assets': 1, 'total_users': 0},
+            {'verified_assets': 1}, {},
+        ]
+        assert pushed[0][2]['asset']['description'] == 'car'
+        assert pushed[2][2]['asset']['verification_status'] == 'verified'
+        assert 'description' not in pushed[2][2]['asset']
+        # Someone else's dashboard gets the counters, not the assets, and nothing for no-op deltas
+        assert [('asset' in data, data['stats']) for _, _, data in messages(other.render(received))] == [
+            (False, {'total_assets': 1, 'total_users': 1}), (False, {'total_assets': 1, 'total_users': 0}),
+            (False, {'verified_assets': 1}),
+        ]
+        assert own.render(received) == []
+
+        batch = TokenizationAgent().tokenize_batch([(first, VERIFIED)])
+        write(lambda s: record_tokenization_batch(s, batch))
+        assert len(wait_for(received, 5)) == 5
+        assert latest_event_id(db.session, '0xabc') == latest_event_id(db.session) == 5
+        assert latest_event_id(db.session, '0xother') == 0
+    finally:
+        own.close()
+        other.close()
+        hub.unsubscribe(token)
+    assert len(hub) == 0 and hub.cursor is None
+
+
+def test_stream_resumes_after_last_event_id(app):
+    for _ in range(3):
+        write(lambda s: create_asset(s, '0xabc', None, PARSED, 'car'))
+    hub = EventHub(db.engine)
+
+    stream = EventStream(hub, '0xabc', 1, replay_max=10)
+    replayed = messages(stream.open(lambda rows: None))
+    assert [event_id for event_id, _, _ in replayed] == [2, 3]
+    stream.close()
+
+    # More than replay_max behind: the client is told to refetch instead
+    stream = EventStream(hub, '0xabc', 0, replay_max=2)
+    assert messages(stream.open(lambda rows: None)) == [(3, 'reset', {})]
+    stream.close()
+
+    # Pruned past the resume point: also a reset; the newest event is always kept
+    db.session.execute(db.text("UPDATE asset_event SET created_at = :old"),
+                       {'old': datetime.utcnow() - timedelta(days=30)})
+    db.session.commit()
+    assert prune_events(db.session, datetime.utcnow() - timedelta(days=7)) == 2
+    stream = EventStream(hub, '0xabc', 1, replay_max=10)
+    assert messages(stream.open(lambda rows: None)) == [(3, 'reset', {})]
+    stream.close()
+
+
+def test_single_tokenization_pushes_token_id(app):
+    asset = write(lambda s: create_asset(s, '0xabc', None, PARSED, 'car'))
+    write(lambda s: record_verification(s, asset['id'], VERIFIED))
+    result = TokenizationAgent().tokenize_asset(asset, VERIFIED)
+    write(lambda s: record_tokenization(s, asset['id'], result))
+    stream = EventStream(EventHub(db.engine), '0xabc', 2)
+    [(_, _, data)] = messages(stream.open(lambda rows: None))
+    stream.close()
+    assert data['asset'] == {'token_id': result['token_id'], 'updated_at': data['asset']['updated_at']}
+    assert data['stats'] == {'tokenized_assets': 1}
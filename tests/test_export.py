@@ -0,0 +1,40 @@
+import csv
+import json
+
+import pytest
+
+from app.models.database import db, User, Asset, Transaction
+from app.models.export import export_tables
+
+
+def seed():
+    user = User(wallet_address='0xabc')
+    for i in range(25):
+        asset = Asset(user=user, asset_type='vehicle', description=f'car {i}', estimated_value=float(i),
+                      location='Pune', requirements={}, verification_breakdown={'jurisdiction': 0.9})
+        db.session.add(asset)
+        db.session.add(Transaction(asset=asset, transaction_type='verification', details={'n': i}))
+    db.session.commit()
+
+
+def test_jsonl_and_csv_stream_in_batches(app, tmp_path):
+    seed()
+    results = export_tables(db.engine, ['users', 'assets', 'transactions'], str(tmp_path), 'jsonl',
+                            batch_size=7, workers=3)
+    assert [r['rows'] for r in results] == [1, 25, 25]
+    lines = (tmp_path / 'transactions.jsonl').read_text().splitlines()
+    assert json.loads(lines[3])['details'] == {'n': 3}
+
+    export_tables(db.engine, ['assets'], str(tmp_path), 'csv', batch_size=7)
+    rows = list(csv.DictReader(open(tmp_path / 'assets.csv')))
+    assert len(rows) == 25
+    assert json.loads(rows[0]['verification_breakdown']) == {'jurisdiction': 0.9}
+
+
+def test_parquet_export(app, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    seed()
+    export_tables(db.engine, ['assets'], str(tmp_path), 'parquet', batch_size=10)
+    table = pq.read_table(tmp_path / 'assets.parquet')
+    assert table.num_rows == 25
+    assert table.column('estimated_value').to_pylist()[:3] == [0.0, 1.0, 2.0]
@@ -0,0 +1,44 @@
+import threading
+
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import db, IdSequence
+from app.models.id_allocator import IdAllocator, WORKER_BITS
+
+
+def test_concurrent_allocators_never_collide(app):
+    # Two "workers" sharing one sequence, each minting from several threads
+    workers = [IdAllocator(db.engine, block_size=50), IdAllocator(db.engine, block_size=50)]
+    issued = []
+    lock = threading.Lock()
+
+    def mint(allocator):
+        ids = [allocator.next_id() for _ in range(500)]
+        with lock:
+            issued.extend(ids)
+
+    threads = [threading.Thread(target=mint, args=(workers[n % 2],)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sequences = [value >> WORKER_BITS for value in issued]
+    assert len(set(sequences)) == len(issued) == 4000
+    assert sum(allocator.leases for allocator in workers) == 4000 // 50
+    assert db.session.get(IdSequence, 'rwa').next_value == 4001
+
+
+def test_forked_worker_leases_its_own_block(app):
+    allocator = IdAllocator(db.engine, block_size=10)
+    first = allocator.next_id()
+    allocator._pid = -1  # as if this process were a fork of the one that leased
+    assert allocator.next_id() >> WORKER_BITS == 11
+    assert first >> WORKER_BITS == 1 and allocator.leases == 2
+
+
+def test_agent_uses_leased_ids(app):
+    agent = TokenizationAgent(ids=IdAllocator(db.engine, block_size=100))
+    asset = {'id': 1, 'user_id': 1, 'asset_type': 'vehicle', 'estimated_value': 1.0}
+    results = [agent.tokenize_asset(asset, {'status': 'verified'}) for _ in range(20)]
+    assert len({result['token_id'] for result in results}) == 20
+    assert len({result['transaction_hash'] for result in results}) == 20
+    assert agent.ids.leases == 1
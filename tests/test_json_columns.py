@@ -0,0 +1,47 @@
+from sqlalchemy import text
+
+from app.models.database import db, User, Asset, Transaction
+from app.models.types import RawJSON
+from app.models import migrations
+
+
+def add_asset(breakdown, wallet='0xabc'):
+    user = User.query.filter_by(wallet_address=wallet).first() or User(wallet_address=wallet)
+    asset = Asset(user=user, asset_type='vehicle', description='car', estimated_value=1.0,
+                  location='Pune', requirements={}, verification_breakdown=breakdown)
+    db.session.add(asset)
+    db.session.commit()
+    return asset.id
+
+
+def test_json_decoded_lazily_and_not_rewritten(app):
+    asset_id = add_asset({'jurisdiction': 0.9})
+    db.session.expire_all()
+    asset = db.session.get(Asset, asset_id)
+    assert isinstance(asset._verification_breakdown, RawJSON)
+    assert asset.verification_breakdown == {'jurisdiction': 0.9}
+    assert asset._verification_breakdown == {'jurisdiction': 0.9}
+    assert asset not in db.session.dirty
+    asset.location = 'Mumbai'
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(Asset, asset_id).to_dict()['verification_breakdown'] == {'jurisdiction': 0.9}
+
+
+def test_json_path_filter_runs_in_sql(app):
+    low = add_asset({'jurisdiction': 0.4})
+    add_asset({'jurisdiction': 0.9})
+    add_asset(None)
+    ids = [a.id for a in Asset.query.filter(Asset.breakdown_score('jurisdiction') < 0.5)]
+    assert ids == [low]
+
+
+def test_migration_keeps_legacy_non_json_text(app):
+    asset_id = add_asset({})
+    db.session.add(Transaction(asset_id=asset_id, transaction_type='note', details={'a': 1}))
+    db.session.commit()
+    with db.engine.begin() as conn:
+        conn.execute(text("UPDATE \"transaction\" SET details = 'plain text'"))
+    migrations.upgrade(db.engine)
+    db.session.expire_all()
+    assert Transaction.query.one().details == 'plain text'
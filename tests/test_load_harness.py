@@ -0,0 +1,49 @@
+import json
+import random
+
+import pytest
+
+from app.agents.llm_stub import StubModel
+from performance_test import arrival_times, compare, parse_mix, percentile, summarize
+
+
+def test_percentile_and_summary():
+    assert percentile([], 50) is None
+    assert percentile(list(range(1, 101)), 50) == 51
+    assert percentile(list(range(1, 101)), 99) == 99
+    summary = summarize([(0.010, True), (0.020, True), (0.030, False), (0.040, True)], elapsed=2.0)
+    assert summary['count'] == 4 and summary['errors'] == 1 and summary['error_rate'] == 0.25
+    assert summary['throughput_per_s'] == 1.5 and summary['max_ms'] == 40.0
+
+
+def test_poisson_arrivals_match_rate():
+    times = arrival_times(rate=200, duration=50, rng=random.Random(1))
+    assert times == sorted(times) and times[-1] < 50
+    assert abs(len(times) / 50 - 200) < 10
+
+
+def test_mix_parsing():
+    assert parse_mix('mixed') == {'dashboard': 0.8, 'onboarding': 0.2}
+    assert parse_mix('dashboard=3,onboarding=1') == {'dashboard': 0.75, 'onboarding': 0.25}
+    with pytest.raises(ValueError):
+        parse_mix('checkout=1')
+
+
+def _report(p95, p99, throughput=100.0, count=1000, error_rate=0.0):
+    row = {'count': count, 'p95_ms': p95, 'p99_ms': p99, 'throughput_per_s': throughput, 'error_rate': error_rate}
+    return {'flows': {}, 'requests': {'GET /api/stats': row}}
+
+
+def test_baseline_comparison():
+    baseline = _report(p95=20.0, p99=40.0)
+    assert compare(_report(p95=22.0, p99=45.0), baseline, tolerance=0.3, min_delta_ms=10) == []
+    assert compare(_report(p95=60.0, p99=40.0), baseline, tolerance=0.3, min_delta_ms=10) == \
+        ['requests GET /api/stats: p95_ms 20.0 -> 60.0']
+    assert len(compare(_report(p95=20.0, p99=40.0, throughput=50.0, error_rate=0.05), baseline, 0.3, 10)) == 2
+    # 200 samples are enough for p95 but not for p99
+    assert compare(_report(p95=20.0, p99=400.0, count=200), baseline, 0.3, 10) == []
+
+
+def test_stub_llm_answers_offline():
+    model = StubModel(lambda prompt: {'score': 0.85, 'echo': prompt}, latency_ms=0)
+    assert json.loads(model.generate_content('hi').text) == {'score': 0.85, 'echo': 'hi'}
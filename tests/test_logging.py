@@ -0,0 +1,80 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from app.logging_config import JsonFormatter, RequestContextFilter, _QueueHandler, init_request_logging
+from log_report import Report, read
+
+
+def _capture():
+    records = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(RequestContextFilter())
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    logger = logging.getLogger('test.structured')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger, handler, QueueListener(records, output), stream
+
+
+def test_request_records_carry_context(app):
+    init_request_logging(app)
+    logger, handler, listener, stream = _capture()
+
+    @app.route('/api/asset/<int:asset_id>')
+    def asset(asset_id):
+        try:
+            raise ValueError('bad asset')
+        except ValueError:
+            logger.exception('lookup failed for %s', asset_id)
+        return 'ok'
+
+    listener.start()
+    try:
+        response = app.test_client().get('/api/asset/7', headers={'X-Request-Id': 'req-1'})
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+    assert response.headers['X-Request-Id'] == 'req-1'
+    record = json.loads(stream.getvalue().splitlines()[0])
+    assert record['msg'] == 'lookup failed for 7' and record['level'] == 'ERROR'
+    assert record['request_id'] == 'req-1' and record['asset_id'] == 7
+    assert 'ValueError: bad asset' in record['exc']
+
+
+def test_report_aggregates_requests_and_errors(tmp_path):
+    lines = [json.dumps({'ts': f'2025-01-01T10:00:0{i}.000', 'level': 'INFO', 'msg': 'request',
+                         'method': 'GET', 'route': '/api/stats', 'status': 200 if i else 500,
+                         'duration_ms': float(i + 1)}) for i in range(5)]
+    lines += ['2025-01-01 10:00:06,123 - ERROR - [STATS ERROR] disk I/O error', 'not a log line']
+    # Two workers' files (LOG_FILE with {pid}) are read as one log
+    (tmp_path / 'app-1.log').write_text('\n'.join(lines[:3]) + '\n', encoding='utf-8')
+    (tmp_path / 'app-2.log').write_text('\n'.join(lines[3:]) + '\n', encoding='utf-8')
+    report = Report()
+    read([tmp_path / 'app-1.log', tmp_path / 'app-2.log'], report)
+    summary = report.summary()
+    stats = summary['endpoints']['GET /api/stats']
+    assert stats['count'] == 5 and stats['statuses'] == {'5xx': 1, '2xx': 4}
+    assert stats['p50_ms'] == 3.0 and stats['max_ms'] == 5.0
+    assert summary['lines'] == 7 and summary['unparsed'] == 1 and summary['levels'] == {'INFO': 5, 'ERROR': 1}
+    assert summary['top_errors'] == [('[STATS ERROR] disk I/O error', 1)]
+
+
+def test_report_spans_interleaved_worker_files(tmp_path):
+    def line(second, level='INFO', msg='request'):
+        return json.dumps({'ts': f'2025-01-01T10:00:{second:02d}.000', 'level': level, 'msg': msg,
+                           'method': 'GET', 'route': '/api/stats', 'status': 200, 'duration_ms': 1.0})
+
+    # Each worker's file is in order, but they overlap in time
+    (tmp_path / 'app-1.log').write_text('\n'.join([line(10), line(30, 'ERROR', 'late'), line(40)]) + '\n')
+    (tmp_path / 'app-2.log').write_text('\n'.join([line(0, 'ERROR', 'early'), line(20, 'ERROR', 'middle')]) + '\n')
+    report = Report(recent_errors=2)
+    read([tmp_path / 'app-1.log', tmp_path / 'app-2.log'], report)
+    summary = report.summary()
+    assert (summary['from'], summary['to']) == ('2025-01-01T10:00:00', '2025-01-01T10:00:40')
+    assert summary['requests'] == 5 and summary['requests_per_s'] == 0.12
+    assert [error.split()[-1] for error in summary['recent_errors']] == ['middle', 'late']
@@ -0,0 +1,47 @@
+import json
+
+from app.agents.tokenization_agent import TokenizationAgent
+from app.models.database import db, User, Asset, Transaction, TokenMetadata
+from app.models.metadata_store import (CODEC_DEFLATE_V1, canonical_json, content_hash, decompress_body,
+                                       load_metadata, metadata_cache, store_metadata)
+from app.models.operations import record_tokenization_batch
+
+
+def test_canonical_form_ignores_key_order():
+    assert canonical_json({'b': 1, 'a': [1, {'y': 2, 'x': 'é'}]}) == b'{"a":[1,{"x":"\\u00e9","y":2}],"b":1}'
+    assert content_hash({'a': 1, 'b': 2}) == content_hash({'b': 2, 'a': 1})
+
+
+def test_identical_metadata_is_stored_once(app):
+    metadata_cache.clear()
+    shared = {'name': 'RWA Token - Vehicle', 'attributes': []}
+    refs = store_metadata(db.session, [('T1', shared, None), ('T2', dict(shared), None),
+                                       ('T3', {'name': 'other'}, None)])
+    db.session.commit()
+    assert refs['T1'] == refs['T2'] == content_hash(shared)
+    assert db.session.query(TokenMetadata).count() == 2
+    stored = db.session.get(TokenMetadata, refs['T2'])
+    assert stored.body[:1] == CODEC_DEFLATE_V1 and decompress_body(stored.body) == canonical_json(shared)
+    assert load_metadata(db.session, 'missing') is None
+
+
+def test_batch_history_keeps_hash_not_metadata(app):
+    metadata_cache.clear()
+    user = User(wallet_address='0x1')
+    db.session.add_all(Asset(user=user, asset_type='vehicle', description=f'car {i}', location='Pune',
+                             estimated_value=1.0,
+                             verification_status='verified') for i in range(3))
+    db.session.commit()
+    agent = TokenizationAgent()
+    batch = agent.tokenize_batch([(asset.to_dict(), {'status': 'verified'}) for asset in Asset.query.all()])
+    record_tokenization_batch(db.session, batch)
+    db.session.commit()
+
+    token = batch['tokens'][0]
+    details = Transaction.query.first().details
+    assert 'metadata' not in details and details['metadata_hash'] == token['metadata_hash']
+    assert json.loads(load_metadata(db.session, token['token_id'])[1]) == token['metadata']
+    assert token['token_uri'] == f"/metadata/{token['token_id']}"
+    assert agent.verify_token_inclusion(token)
+    tampered = dict(token, metadata=dict(token['metadata'], description='something else'))
+    assert not agent.verify_token_inclusion(tampered)
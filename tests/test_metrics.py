@@ -0,0 +1,52 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from app.metrics import init_metrics
+from app.models.database import db, User
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_request_and_database_metrics(app):
+    init_metrics(app, {'write': db.engine})
+
+    @app.route('/api/assets/<string:wallet_address>')
+    def assets(wallet_address):
+        db.session.add(User(wallet_address=wallet_address))
+        db.session.commit()
+        return 'ok'
+
+    route = '/api/assets/<string:wallet_address>'
+    requests_before = _value('http_requests_total', method='GET', route=route, status='200')
+    commits_before = _value('db_commit_duration_seconds_count')
+    checkouts_before = _value('db_pool_checkout_seconds_count', engine='write')
+    client = app.test_client()
+    assert client.get('/api/assets/0x1').status_code == 200
+    assert client.get('/api/assets/0x2').status_code == 200
+    assert client.get('/nowhere').status_code == 404
+
+    assert _value('http_requests_total', method='GET', route=route, status='200') == requests_before + 2
+    assert _value('http_requests_total', method='GET', route='unmatched', status='404') >= 1
+    assert _value('http_request_duration_seconds_count', method='GET', route=route) >= 2
+    assert _value('http_requests_in_progress') == 0
+    assert _value('db_commit_duration_seconds_count') == commits_before + 2
+    assert _value('db_pool_checkout_seconds_count', engine='write') >= checkouts_before + 2
+    assert _value('db_pool_checked_out', engine='write') == 0
+
+
+def test_rolled_back_commit_is_not_timed(app):
+    before = _value('db_commit_duration_seconds_count')
+    init_metrics(app, {})
+    db.session.add(User(wallet_address='0xdup'))
+    db.session.commit()
+    db.session.add(User(wallet_address='0xdup'))
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+    assert _value('db_commit_duration_seconds_count') == before + 1
+    assert 'commit_start' not in db.session.info
+    with db.engine.connect() as conn:
+        assert conn.execute(text('SELECT count(*) FROM user')).scalar() == 1
@@ -0,0 +1,70 @@
+from sqlalchemy import inspect, text
+
+from app.models.database import db
+from app.models import migrations
+
+
+def index_names(engine, table):
+    return {index['name'] for index in inspect(engine).get_indexes(table)}
+
+
+def test_upgrade_replaces_legacy_indexes_and_verifies(app):
+    engine = db.engine
+    with engine.begin() as conn:
+        conn.execute(text('DROP INDEX ix_transaction_asset_type_created'))
+        conn.execute(text('CREATE INDEX idx_transactions_type ON "transaction"(transaction_type)'))
+    assert migrations.upgrade(engine) == list(range(1, migrations.HEAD + 1))
+    assert 'ix_transaction_asset_type_created' in index_names(engine, 'transaction')
+    assert 'idx_transactions_type' not in index_names(engine, 'transaction')
+    assert migrations.verify(engine) == []
+    assert migrations.upgrade(engine) == []
+
+
+def test_every_hot_query_uses_its_index(app):
+    migrations.upgrade(db.engine)
+    report = migrations.check_query_plans(db.engine)
+    assert all(result['ok'] for result in report.values()), report
+
+
+def test_downgrade_drops_indexes(app):
+    engine = db.engine
+    migrations.upgrade(engine)
+    assert migrations.downgrade(engine, 1) == list(range(migrations.HEAD, 1, -1))
+    assert migrations.current_version(engine) == 1
+    assert 'ix_asset_user_created' not in index_names(engine, 'asset')
+    assert any('missing index' in problem for problem in migrations.verify(engine))
+
+
+def test_snapshot_columns_roll_back_and_backfill(app):
+    engine = db.engine
+    migrations.upgrade(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO user (id, wallet_address) VALUES (1, '0x1')"))
+        conn.execute(text("INSERT INTO asset (id, user_id, asset_type, description, estimated_value, location)"
+                          " VALUES (1, 1, 'vehicle', 'car', 1.0, 'Pune')"))
+        for tx_id, created in ((1, '2024-01-01'), (2, '2024-02-01')):
+            conn.execute(text("INSERT INTO \"transaction\" (id, asset_id, transaction_type, status, created_at)"
+                              " VALUES (:id, 1, 'verification', 'verified', :created)"),
+                         {'id': tx_id, 'created': created})
+    migrations.downgrade(engine, 2)
+    assert 'verification_tx_id' not in {c['name'] for c in inspect(engine).get_columns('asset')}
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text('SELECT verification_tx_id FROM asset')).scalar() == 2
+
+
+def test_cli_leaves_the_schema_at_the_requested_version(tmp_path, monkeypatch, capsys):
+    import migrate
+    from config import Config
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'cli.db'}")
+
+    def run(*argv):
+        monkeypatch.setattr('sys.argv', ['migrate.py', *argv])
+        migrate.main()
+        return capsys.readouterr().out
+
+    assert 'Applied migrations: [1, 2, 3, 4, 5]' in run('upgrade', '--to', '5')
+    assert 'Schema version: 5 ' in run('status')
+    assert 'Rolled back migrations: [5, 4]' in run('downgrade', '--to', '3')
+    assert 'Schema version: 3 ' in run('status')
+    assert 'Applied migrations: [4]' in run('upgrade', '--to', '4')
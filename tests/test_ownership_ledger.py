@@ -0,0 +1,67 @@
+import pytest
+
+from app.agents.ownership_ledger import OwnershipLedger
+from app.agents.tokenization_agent import TokenizationAgent
+
+
+def test_transfers_update_both_indexes():
+    ledger = OwnershipLedger()
+    ledger.mint_many([('T1', 'alice'), ('T2', 'alice')])
+    ledger.transfer('T1', 'alice', 'bob')
+    assert ledger.owner_of('T1') == 'bob'
+    assert ledger.tokens_of('alice') == ['T2'] and ledger.tokens_of('bob') == ['T1']
+    with pytest.raises(ValueError):
+        ledger.transfer('T1', 'alice', 'carol')
+    with pytest.raises(ValueError):
+        ledger.mint('T2', 'carol')
+
+
+def test_replay_from_snapshot_and_log(tmp_path):
+    ledger = OwnershipLedger(str(tmp_path), snapshot_every=5)
+    ledger.mint_many([(f'T{i}', 'alice') for i in range(4)])
+    for i in range(4):
+        ledger.transfer(f'T{i}', 'alice', 'bob')  # crosses a snapshot
+    ledger.transfer('T0', 'bob', 'carol')
+    # A crash mid-append leaves a torn last line; replay ignores it
+    with open(tmp_path / 'ownership.log', 'ab') as f:
+        f.write(b'{"op":"transfer","tok')
+
+    reopened = OwnershipLedger(str(tmp_path), snapshot_every=5)
+    assert reopened.seq == ledger.seq == 9
+    assert reopened.owners == ledger.owners
+    assert reopened.tokens_of('bob') == ['T1', 'T2', 'T3']
+    reopened.transfer('T1', 'bob', 'alice')
+    assert OwnershipLedger(str(tmp_path)).owner_of('T1') == 'alice'
+
+
+def test_burn_removes_tokens_and_replays(tmp_path):
+    ledger = OwnershipLedger(str(tmp_path))
+    ledger.mint_many([('T1', 'alice'), ('T2', 'alice'), ('T3', 'bob')])
+    ledger.burn_many(['T1', 'T3'])
+    with pytest.raises(ValueError):
+        ledger.burn_many(['T2', 'T3'])
+    assert ledger.tokens_of('alice') == ['T2'] and 'bob' not in ledger.holdings
+    reopened = OwnershipLedger(str(tmp_path))
+    assert reopened.owners == {'T2': 'alice'}
+    # A burned token id can be minted again
+    reopened.mint('T1', 'carol')
+    assert ledger.owner_of('T1') == 'carol'
+
+
+def test_ledgers_sharing_a_directory_see_each_others_writes(tmp_path):
+    first, second = OwnershipLedger(str(tmp_path), snapshot_every=3), OwnershipLedger(str(tmp_path), snapshot_every=3)
+    first.mint('T1', 'alice')
+    second.transfer('T1', 'alice', 'bob')
+    first.mint_many([('T2', 'bob'), ('T3', 'bob')])  # compacts the log under `second`
+    assert second.tokens_of('bob') == ['T1', 'T2', 'T3']
+    assert first.owner_of('T1') == 'bob'
+
+
+def test_agent_checks_ownership_before_transfer():
+    agent = TokenizationAgent()
+    agent.ledger.mint('T1', 'alice')
+    assert agent.verify_token_ownership('T1', 'alice') and not agent.verify_token_ownership('T1', 'bob')
+    assert not agent.transfer_token('T1', 'bob', 'carol')['success']
+    result = agent.transfer_token('T1', 'alice', 'bob')
+    assert result['success'] and result['transaction_hash'].startswith('0x')
+    assert agent.verify_token_ownership('T1', 'bob')
@@ -0,0 +1,58 @@
+from app.models.database import db, User, Asset
+from app.models.migrations import upgrade
+from app.models.search import build_match, search_assets
+
+
+def seed():
+    user = User(wallet_address='0xabc')
+    rows = [('real_estate', 'Sea-facing apartment in Bandra', 'Mumbai', 'verified'),
+            ('real_estate', 'Farm land with apartment block', 'Nashik', 'pending'),
+            ('vehicle', 'Vintage car, restored', 'Bangalore', 'verified'),
+            ('commodity', 'Gold bars in a bank vault', 'Mumbai', 'verified')]
+    for asset_type, description, location, status in rows:
+        db.session.add(Asset(user=user, asset_type=asset_type, description=description,
+                             location=location, estimated_value=1.0, verification_status=status))
+    db.session.commit()
+
+
+def descriptions(page):
+    return [hit['description'] for hit in page['results']]
+
+
+def test_build_match_quotes_terms():
+    assert build_match('flat "OR" Ban*') == '"flat" "OR" "Ban"*'
+    assert build_match('  -- ') is None
+
+
+def test_ranked_prefix_filtered_and_paged(app):
+    upgrade(db.engine)
+    seed()  # inserted after the index exists: kept in sync by triggers
+    assert descriptions(search_assets(db.session, 'apartment'))[0] == 'Sea-facing apartment in Bandra'
+    assert len(search_assets(db.session, 'ban*')['results']) == 3  # Bandra, Bangalore, bank
+    assert descriptions(search_assets(db.session, 'mumbai', asset_type='commodity')) == ['Gold bars in a bank vault']
+    assert descriptions(search_assets(db.session, 'apartment', status='pending')) == ['Farm land with apartment block']
+
+    first = search_assets(db.session, 'ban*', limit=2)
+    second = search_assets(db.session, 'ban*', limit=2, cursor=first['next_cursor'])
+    assert second['next_cursor'] is None
+    assert len(set(descriptions(first) + descriptions(second))) == 3
+
+    asset = Asset.query.filter_by(location='Bangalore').one()
+    asset.location = 'Chennai'
+    db.session.commit()
+    assert descriptions(search_assets(db.session, 'chennai')) == ['Vintage car, restored']
+    assert search_assets(db.session, 'bangalore')['results'] == []
+
+
+def test_only_newest_candidates_are_ranked(app):
+    upgrade(db.engine)
+    user = User(wallet_address='0xabc')
+    for i in range(30):
+        db.session.add(Asset(user=user, asset_type='vehicle', description=f'car number {i}',
+                             location='Pune', estimated_value=1.0))
+    db.session.commit()
+    first = search_assets(db.session, 'car', limit=8, max_candidates=10)
+    second = search_assets(db.session, 'car', limit=8, cursor=first['next_cursor'], max_candidates=10)
+    ids = [hit['id'] for hit in first['results'] + second['results']]
+    assert sorted(ids) == list(range(21, 31))
+    assert second['next_cursor'] is None
@@ -0,0 +1,46 @@
+import pytest
+
+from app.agents.share_ledger import ShareLedger
+from app.agents.tokenization_agent import TokenizationAgent
+
+
+def test_batches_apply_entirely_or_not_at_all():
+    ledger = ShareLedger()
+    ledger.fractionalize('T1', 'alice', 100)
+    ledger.fractionalize('T2', 'bob', 10)
+    # bob may pass on shares he receives earlier in the same batch
+    ledger.transfer_batch([('T1', 'alice', 'bob', 40), ('T1', 'bob', 'carol', 30), ('T2', 'bob', 'alice', 10)])
+    assert ledger.holders('T1') == {'alice': 60, 'bob': 10, 'carol': 30}
+    assert [position['token_id'] for position in ledger.positions_of('alice')] == ['T1', 'T2']
+    assert ledger.positions_of('bob') == [{'token_id': 'T1', 'shares': 10, 'total_shares': 100, 'fraction': 0.1}]
+
+    seq = ledger.seq
+    with pytest.raises(ValueError):
+        ledger.transfer_batch([('T1', 'carol', 'dave', 30), ('T1', 'bob', 'dave', 11)])
+    assert ledger.seq == seq and ledger.balance_of('T1', 'carol') == 30 and not ledger.positions_of('dave')
+    with pytest.raises(ValueError):
+        ledger.transfer('T1', 'alice', 'bob', 0)
+
+
+def test_replay_restores_balances_and_positions(tmp_path):
+    ledger = ShareLedger(str(tmp_path), snapshot_every=3)
+    ledger.fractionalize('T1', 'alice', 1000)
+    for wallet in ('bob', 'carol', 'dave', 'erin'):
+        ledger.transfer('T1', 'alice', wallet, 100)
+    ledger.transfer('T1', 'erin', 'bob', 100)  # erin's position disappears
+    reopened = ShareLedger(str(tmp_path))
+    assert reopened.balances == ledger.balances == {'T1': {'alice': 600, 'bob': 200, 'carol': 100, 'dave': 100}}
+    assert reopened.positions_of('erin') == [] and reopened.balance_of('T1', 'bob') == 200
+
+
+def test_fractional_tokens_move_by_shares_only():
+    agent = TokenizationAgent()
+    metadata = agent._generate_token_metadata({'asset_type': 'real_estate', 'estimated_value': 1.0, 'shares': 50}, {})
+    assert metadata['properties']['fractional'] and metadata['properties']['total_shares'] == 50
+    agent.ledger.mint('T1', 'alice')
+    assert not agent.fractionalize_token('T1', 'bob', 50)['success']
+    assert agent.fractionalize_token('T1', 'alice', 50)['success']
+    assert not agent.transfer_token('T1', 'alice', 'bob')['success']
+    result = agent.transfer_shares([('T1', 'alice', 'bob', 20)])
+    assert result['success'] and result['transfers'][0]['shares'] == 20
+    assert agent.shares.balance_of('T1', 'bob') == 20
@@ -0,0 +1,74 @@
+import time
+from types import SimpleNamespace
+
+from flask import jsonify
+
+from app.models.database import db, User
+from app.tracing import SamplingProfiler, Tracer, init_tracing, span
+
+CONFIG = SimpleNamespace(TRACING_ENABLED=True, TRACE_HEADERS=True, TRACE_SAMPLE_RATE=0.0, TRACE_SLOW_MS=20,
+                         TRACE_BUFFER_SIZE=2, TRACE_PROFILE=False, TRACE_PROFILE_INTERVAL_MS=1)
+
+
+def test_server_timing_breaks_down_request(app):
+    tracer = init_tracing(app, CONFIG, [db.engine])
+
+    @app.route('/users')
+    def users():
+        with span('agent', 'basic_info'):
+            with span('llm'):
+                time.sleep(0.005)
+        return jsonify([user.to_dict() for user in User.query.all()])
+
+    response = app.test_client().get('/users')
+    timing = dict(entry.split(';', 1) for entry in response.headers['Server-Timing'].split(', '))
+    assert {'db', 'agent', 'llm', 'json', 'total'} <= set(timing)
+    assert float(timing['llm'].split('dur=')[1].split(';')[0]) >= 5
+    # Fast and not sampled: not kept
+    assert tracer.buffer.list() == []
+
+
+def test_timing_headers_are_opt_in(app):
+    tracer = init_tracing(app, SimpleNamespace(**dict(vars(CONFIG), TRACE_HEADERS=False, TRACE_SLOW_MS=0)), [db.engine])
+
+    @app.route('/users')
+    def users():
+        return jsonify([user.to_dict() for user in User.query.all()])
+
+    response = app.test_client().get('/users')
+    assert 'Server-Timing' not in response.headers and 'X-Trace-Id' not in response.headers
+    # Still traced for /debug/traces
+    assert [trace['path'] for trace in tracer.buffer.list()] == ['/users']
+
+
+def test_slow_traces_kept_in_ring_buffer(app):
+    tracer = Tracer(sample_rate=0.0, slow_ms=20, buffer_size=2)
+    for path in ('/a', '/b', '/c'):
+        trace = tracer.start('GET', path)
+        with span('db', 'SELECT 1'):
+            time.sleep(0.025)
+        assert tracer.finish(trace, 200)
+    fast = tracer.start('GET', '/fast')
+    assert not tracer.finish(fast, 200)
+    kept = tracer.buffer.list()
+    assert [t['path'] for t in kept] == ['/c', '/b']
+    detail = tracer.buffer.get(kept[0]['id']).to_dict(detail=True)
+    assert detail['spans'][0]['category'] == 'db' and detail['totals']['db']['count'] == 1
+    # Outside a trace spans are no-ops
+    with span('db'):
+        pass
+
+
+def test_profiler_samples_request_stack(app):
+    profiler = SamplingProfiler(interval_ms=1)
+    tracer = Tracer(slow_ms=0, profiler=profiler)
+    try:
+        trace = tracer.start('POST', '/api/verify/1')
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        tracer.finish(trace, 200)
+    finally:
+        profiler.stop()
+    profile = trace.to_dict(detail=True)['profile']
+    assert any('test_profiler_samples_request_stack' in entry['stack'] for entry in profile)
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.database import db, User, Asset, Transaction
+from app.models.session import unit_of_work, GroupCommitWriter
+from app.models.operations import create_asset, record_verification
+
+PARSED = {'asset_type': 'vehicle', 'estimated_value': 100000.0, 'location': 'Pune, India', 'description': 'car'}
+VERIFIED = {'status': 'verified', 'overall_score': 0.8, 'breakdown': {'basic_info': 0.8}}
+
+
+def count_commits(engine):
+    commits = []
+    event.listen(engine, 'commit', lambda conn: commits.append(1))
+    return commits
+
+
+def test_intake_and_verify_commit_once_each(app):
+    commits = count_commits(db.engine)
+    with unit_of_work(db.session) as session:
+        asset = create_asset(session, '0xabc', None, PARSED, 'car')
+    assert len(commits) == 1
+    with unit_of_work(db.session) as session:
+        record_verification(session, asset['id'], VERIFIED)
+    assert len(commits) == 2
+    assert db.session.get(Asset, asset['id']).verification_status == 'verified'
+    assert Transaction.query.filter_by(asset_id=asset['id']).count() == 1
+
+
+def test_unit_of_work_rolls_back_everything(app):
+    with pytest.raises(KeyError):
+        with unit_of_work(db.session) as session:
+            create_asset(session, '0xabc', None, PARSED, 'car')
+            raise KeyError('boom')
+    assert User.query.count() == 0
+    assert Asset.query.count() == 0
+
+
+def test_group_commit_merges_units_and_isolates_failures(app):
+    commits = count_commits(db.engine)
+    writer = GroupCommitWriter(db.engine, window_ms=200, max_batch=10)
+    try:
+        futures = [writer.submit(lambda s, i=i: create_asset(s, f'0x{i}', None, PARSED, 'car')) for i in range(3)]
+
+        def failing(session):
+            create_asset(session, '0xbad', None, PARSED, 'car')
+            raise ValueError('bad unit')
+        bad = writer.submit(failing)
+        assets = [f.result(timeout=5) for f in futures]
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+    finally:
+        writer.stop()
+    assert len(commits) == 1
+    assert len({a['id'] for a in assets}) == 3
+    assert User.query.filter_by(wallet_address='0xbad').first() is None
+
+
+def test_verification_snapshot_written_with_transaction(app):
+    with unit_of_work(db.session) as session:
+        asset = create_asset(session, '0xabc', None, PARSED, 'car')
+    with unit_of_work(db.session) as session:
+        record_verification(session, asset['id'], dict(VERIFIED, verifier_version='modular-1.0'))
+    snapshot = db.session.get(Asset, asset['id']).verification_snapshot()
+    tx = Transaction.query.filter_by(asset_id=asset['id']).one()
+    assert snapshot == {'status': 'verified', 'overall_score': 0.8, 'breakdown': {'basic_info': 0.8},
+                        'verifier_version': 'modular-1.0', 'transaction_id': tx.id}
@@ -0,0 +1,82 @@
+import threading
+
+from sqlalchemy import event
+
+from app.models.database import db, User
+from app.models.session import unit_of_work, GroupCommitWriter
+from app.models.operations import create_asset
+from app.models.user_cache import WalletCache, get_or_create_user, wallet_cache
+
+PARSED = {'asset_type': 'vehicle', 'estimated_value': 1.0, 'location': 'Pune', 'description': 'car'}
+
+
+def statements(engine):
+    seen = []
+    event.listen(engine, 'before_cursor_execute', lambda conn, cur, stmt, *a: seen.append(stmt.split()[0]))
+    return seen
+
+
+def test_lru_evicts_least_recently_used():
+    cache = WalletCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and len(cache) == 2
+
+
+def test_cached_intake_runs_no_select(app):
+    with unit_of_work(db.session) as session:
+        create_asset(session, '0xabc', None, PARSED, 'car')
+    seen = statements(db.engine)
+    with unit_of_work(db.session) as session:
+        create_asset(session, '0xabc', None, PARSED, 'car')
+    # The asset and its outbox event
+    assert seen == ['INSERT', 'INSERT']
+
+
+def test_rolled_back_insert_is_not_cached(app):
+    writer = GroupCommitWriter(db.engine, window_ms=100)
+
+    def failing(session):
+        get_or_create_user(session, '0xnew')
+        raise ValueError('unit fails after creating the user')
+    try:
+        bad = writer.submit(failing)
+        good = writer.submit(lambda s: get_or_create_user(s, '0xother'))
+        good.result(timeout=5)
+    finally:
+        writer.stop()
+    assert wallet_cache.get('0xnew') is None
+    assert good.result()[1] and wallet_cache.get('0xother') == good.result()[0]
+
+
+def test_concurrent_new_wallet_creates_one_user(app):
+    results, errors = [], []
+
+    def intake():
+        try:
+            with app.app_context():
+                with unit_of_work(db.session) as session:
+                    results.append(get_or_create_user(session, '0xrace', cache=None))
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=intake) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len({user_id for user_id, _ in results}) == 1
+    assert sorted(created for _, created in results) == [False] * 7 + [True]
+    assert User.query.filter_by(wallet_address='0xrace').count() == 1
+
+
+def test_user_update_invalidates(app):
+    with unit_of_work(db.session) as session:
+        get_or_create_user(session, '0xabc')
+    assert wallet_cache.get('0xabc') is not None
+    user = User.query.filter_by(wallet_address='0xabc').one()
+    user.wallet_address = '0xdef'
+    db.session.commit()
+    assert wallet_cache.get('0xabc') is None
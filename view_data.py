@@ -1,15 +1,16 @@
 from app.main import app
 from app.models.database import db, User, Asset, Transaction
 
+# Rows are streamed in batches; use export_data.py for full-size dumps to files.
 with app.app_context():
     print("=== USERS ===")
-    for user in User.query.all():
+    for user in User.query.order_by(User.id).yield_per(500):
         print(user.to_dict())
 
     print("\n=== ASSETS ===")
-    for asset in Asset.query.all():
+    for asset in Asset.query.order_by(Asset.id).yield_per(500):
         print(asset.to_dict())
 
     print("\n=== TRANSACTIONS ===")
-    for tx in Transaction.query.all():
+    for tx in Transaction.query.order_by(Transaction.id).yield_per(500):
         print(tx.to_dict())